@@ -1,13 +1,56 @@
 import asyncio
-from datetime import datetime
-from flask import Flask, jsonify, request
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime, timedelta
+from flask import Flask, Response, has_app_context, jsonify, request
 from flask_cors import CORS
-from typing import Coroutine
+import httpx
+from sqlalchemy import event, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only
+from typing import Callable
+from urllib.parse import urlsplit
 
+from app.backfill import BatchWriteWikiCache, MostReadBackfill
 from app.config import Config
 from app.extensions import db
-from app.models import CachedResponse
-from shared.wiki_api import WikiAPI, WikiCache, WikiAPIResponse
+from app.json_provider import CodecJSONProvider
+from app.models import (
+    FULL_RESPONSE_FORMAT,
+    MOSTREAD_PROJECTION_FORMAT,
+    ArticleViews,
+    CachedResponse,
+    CompressionDictionary,
+    FetchLease,
+    default_response_compressor,
+    load_compression_dictionary,
+)
+from app.most_read_articles import MostReadArticlesEndpoint
+from shared.asyncio_rate_limiter import (
+    AsyncIORateLimiter,
+    LowPriorityRateLimiter,
+    TOKEN_BUCKET_SCHEDULER,
+)
+from shared.compression import (
+    ZSTD_CODEC,
+    ResponseCompressor,
+    create_response_compressor,
+)
+from shared.event_loop_thread import EventLoopThread
+from shared.group_commit import GroupCommitter
+from shared.memory_cache import BoundedLRUCache, TieredWikiCache
+from shared.prefetcher import MostReadPrefetcher
+from shared.shared_rate_limiter import SharedAsyncIORateLimiter
+from shared.write_behind_cache import WriteBehindWikiCache
+from shared.wiki_api import (
+    WikiAPI,
+    WikiAPIError,
+    WikiAPIResponse,
+    WikiCache,
+    parse_featured_content_most_read_articles,
+    project_featured_content_most_read_articles,
+)
 
 
 class ResponseCache(WikiCache):
@@ -15,32 +58,485 @@ class ResponseCache(WikiCache):
 
     Note:
         `CachedResponse` model stores text responses as a zlib compressed BLOB value.
+        Featured Content responses are also ingested as `ArticleViews` rows to aggregate
+        fully cached date ranges in SQL.
+
+        In "mostread" projection mode, Featured Content responses are stored trimmed to their
+        "mostread" subset, and full responses cached before are rewritten lazily when read.
+
+        With a Zstandard `compressor`, new responses are compressed with the newest trained
+        `CompressionDictionary` (loaded once), while rows of any codec stay readable.
+
+        With `group_commit`, puts of concurrent threads are committed together (see `GroupCommitter`).
+
+        Responses are returned with their upstream validators (`etag`, `last_modified`) and `cached_at` time,
+        so that `WikiAPI` can revalidate them, `touch_many` bumps `created_at` without rewriting them.
     """
 
-    def __init__(self) -> None:
+    FEATURED_CONTENT_PATH = "/api/rest_v1/feed/featured/"
+
+    # Keeps `IN (...)` queries below SQLite's default max number of host parameters.
+    MAX_QUERY_PARAMS = 500
+
+    def __init__(
+        self,
+        app: Flask = None,
+        mostread_projection: bool = False,
+        compressor: ResponseCompressor = None,
+        group_commit: bool = False,
+        group_commit_delay_secs: float = 0,
+    ) -> None:
+        """
+        Args:
+            app: Optional Flask app to push an app context for db sessions when called
+                outside of one, e.g. from the background event loop thread.
+            mostread_projection: Store only the "mostread" projection of Featured Content responses.
+            compressor: Optional compressor of new responses, defaults to zlib.
+            group_commit: Commit the puts of concurrent threads in shared transactions.
+            group_commit_delay_secs: Seconds a group commit waits for other puts to join.
+        """
         super().__init__()
+        self.app = app
+        self.mostread_projection = mostread_projection
+        self.compressor = compressor or default_response_compressor
+        self._is_compression_dictionary_loaded = False
+        self.group_committer = None
+        if group_commit:
+            self.group_committer = GroupCommitter(
+                self._write_responses, max_delay_secs=group_commit_delay_secs
+            )
 
     def get(self, url: str) -> WikiAPIResponse:
-        cached_resp = db.session.get(CachedResponse, url)
-        if cached_resp:
-            return WikiAPIResponse(
-                cached_resp.url, True, cached_resp.text_response, None
-            )
-        return None
+        return self.multi_get([url]).get(url)
 
     def put(self, wiki_resp: WikiAPIResponse):
+        self.put_many([wiki_resp])
+
+    def multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        """Gets cached responses with a single `SELECT ... WHERE url IN (...)` query per chunk of URLs."""
+        cached_responses = {}
+        with self._app_context():
+            for offset in range(0, len(urls), self.MAX_QUERY_PARAMS):
+                urls_chunk = urls[offset : offset + self.MAX_QUERY_PARAMS]
+                query = db.select(CachedResponse).where(
+                    CachedResponse.url.in_(urls_chunk)
+                )
+                for cached_resp in db.session.scalars(query):
+                    text_response = cached_resp.text_response
+
+                    # Lazily rewrite full responses cached before enabling the projection mode.
+                    if (
+                        self.mostread_projection
+                        and cached_resp.format_version == FULL_RESPONSE_FORMAT
+                    ):
+                        projected_response = self._project_response(
+                            cached_resp.url, text_response
+                        )
+                        if projected_response:
+                            text_response = projected_response
+                            rewritten_resp = CachedResponse(
+                                url=cached_resp.url,
+                                text_response=projected_response,
+                                created_at=cached_resp.created_at,
+                                format_version=MOSTREAD_PROJECTION_FORMAT,
+                                compressor=self._active_compressor(),
+                                etag=cached_resp.etag,
+                                last_modified=cached_resp.last_modified,
+                            )
+                            db.session.merge(rewritten_resp)
+
+                    cached_responses[cached_resp.url] = WikiAPIResponse(
+                        cached_resp.url,
+                        True,
+                        text_response,
+                        None,
+                        etag=cached_resp.etag,
+                        last_modified=cached_resp.last_modified,
+                        cached_at=cached_resp.created_at,
+                    )
+
+            if db.session.dirty:
+                db.session.commit()
+        return cached_responses
+
+    def put_many(self, wiki_resps: list[WikiAPIResponse]):
+        """Inserts or replaces cached responses in a single transaction."""
         # No point in storing erroneous or empty responses.
-        if wiki_resp.exception or not wiki_resp.status_ok or not len(wiki_resp.text):
+        wiki_resps = [
+            wiki_resp
+            for wiki_resp in wiki_resps
+            if not wiki_resp.exception and wiki_resp.status_ok and wiki_resp.text
+        ]
+        if not wiki_resps:
             return
 
-        # Insert or replace cached_resp.
-        cached_resp = CachedResponse(
-            url=wiki_resp.url,
-            text_response=wiki_resp.text,
-            created_at=datetime.now(),
+        if self.group_committer:
+            self.group_committer.submit(wiki_resps)
+        else:
+            self._write_responses(wiki_resps)
+
+    def _write_responses(self, wiki_resps: list[WikiAPIResponse]):
+        """Inserts or replaces the valid `wiki_resps` in a single transaction."""
+        # Keep the last put of each URL, e.g. puts of the same URL in a group commit.
+        wiki_resps = list(
+            {wiki_resp.url: wiki_resp for wiki_resp in wiki_resps}.values()
+        )
+
+        with self._app_context():
+            # Load existing rows into the session in one query,
+            # so that `merge` doesn't need a SELECT per row.
+            urls = [wiki_resp.url for wiki_resp in wiki_resps]
+            for offset in range(0, len(urls), self.MAX_QUERY_PARAMS):
+                urls_chunk = urls[offset : offset + self.MAX_QUERY_PARAMS]
+                query = (
+                    db.select(CachedResponse)
+                    .options(load_only(CachedResponse.url))
+                    .where(CachedResponse.url.in_(urls_chunk))
+                )
+                db.session.scalars(query).all()
+
+            compressor = self._active_compressor()
+            created_at = datetime.now()
+            for index, wiki_resp in enumerate(wiki_resps):
+                format_version = FULL_RESPONSE_FORMAT
+                if self.mostread_projection:
+                    projected_response = self._project_response(
+                        wiki_resp.url, wiki_resp.text
+                    )
+                    if projected_response:
+                        format_version = MOSTREAD_PROJECTION_FORMAT
+                        wiki_resps[index] = wiki_resp._replace(text=projected_response)
+
+                cached_resp = CachedResponse(
+                    url=wiki_resp.url,
+                    text_response=wiki_resps[index].text,
+                    created_at=created_at,
+                    format_version=format_version,
+                    compressor=compressor,
+                    etag=wiki_resp.etag,
+                    last_modified=wiki_resp.last_modified,
+                )
+                db.session.merge(cached_resp)
+            self._ingest_article_views(wiki_resps)
+            db.session.commit()
+
+    def touch_many(self, urls: list[str]):
+        """Bumps `created_at` of cached responses with an `UPDATE` statement, keeping their compressed BLOB."""
+        created_at = datetime.now()
+        with self._app_context():
+            for offset in range(0, len(urls), self.MAX_QUERY_PARAMS):
+                urls_chunk = urls[offset : offset + self.MAX_QUERY_PARAMS]
+                db.session.execute(
+                    db.update(CachedResponse)
+                    .where(CachedResponse.url.in_(urls_chunk))
+                    .values(created_at=created_at)
+                )
+            db.session.commit()
+
+    def acquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        """Leases the URLs that are not leased yet, or whose leases expired, with `INSERT OR IGNORE`
+        statements, so that concurrent processes can't both acquire the same lease.
+        """
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=ttl)
+        leased_urls = set()
+        with self._app_context():
+            for offset in range(0, len(urls), self.MAX_QUERY_PARAMS):
+                urls_chunk = urls[offset : offset + self.MAX_QUERY_PARAMS]
+                db.session.execute(
+                    db.delete(FetchLease).where(
+                        FetchLease.url.in_(urls_chunk), FetchLease.expires_at <= now
+                    )
+                )
+                db.session.execute(
+                    sqlite_insert(FetchLease)
+                    .values(
+                        [
+                            {"url": url, "owner": owner, "expires_at": expires_at}
+                            for url in urls_chunk
+                        ]
+                    )
+                    .on_conflict_do_nothing(index_elements=["url"])
+                )
+                leased_urls.update(
+                    db.session.scalars(
+                        db.select(FetchLease.url).where(
+                            FetchLease.url.in_(urls_chunk), FetchLease.owner == owner
+                        )
+                    )
+                )
+            db.session.commit()
+        return [url for url in urls if url in leased_urls]
+
+    def leased_fetch_urls(self, urls: list[str]) -> list[str]:
+        """Selects the URLs with an unexpired `FetchLease` row."""
+        now = datetime.now()
+        leased_urls = set()
+        with self._app_context():
+            for offset in range(0, len(urls), self.MAX_QUERY_PARAMS):
+                urls_chunk = urls[offset : offset + self.MAX_QUERY_PARAMS]
+                leased_urls.update(
+                    db.session.scalars(
+                        db.select(FetchLease.url).where(
+                            FetchLease.url.in_(urls_chunk), FetchLease.expires_at > now
+                        )
+                    )
+                )
+        return [url for url in urls if url in leased_urls]
+
+    def release_fetch_leases(self, urls: list[str], owner: str):
+        with self._app_context():
+            for offset in range(0, len(urls), self.MAX_QUERY_PARAMS):
+                urls_chunk = urls[offset : offset + self.MAX_QUERY_PARAMS]
+                db.session.execute(
+                    db.delete(FetchLease).where(
+                        FetchLease.url.in_(urls_chunk), FetchLease.owner == owner
+                    )
+                )
+            db.session.commit()
+
+    def aggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        """Aggregates the most read articles with a `GROUP BY ... ORDER BY SUM(views) DESC LIMIT n` query,
+        if every day of the date range was ingested.
+        """
+        total_days = (end_date - start_date).days + 1
+        date_range_filter = (
+            ArticleViews.lang_code == lang_code,
+            ArticleViews.views_date.between(start_date.date(), end_date.date()),
+        )
+
+        with self._app_context():
+            total_ingested_days, total_articles = db.session.execute(
+                db.select(
+                    func.count(ArticleViews.views_date.distinct()),
+                    func.count(ArticleViews.pageid.distinct()),
+                ).where(*date_range_filter)
+            ).one()
+            if total_ingested_days < total_days:
+                return None
+
+            # Ties are ranked by first appearance, i.e. earliest date and then position in that day's list.
+            total_views = func.sum(ArticleViews.views).label("total_views")
+            first_appearance = func.min(
+                func.printf("%s-%04d", ArticleViews.views_date, ArticleViews.rank)
+            )
+            ranked_pageids = db.session.scalars(
+                db.select(ArticleViews.pageid)
+                .where(*date_range_filter)
+                .group_by(ArticleViews.pageid)
+                .order_by(total_views.desc(), first_appearance)
+                .limit(limit)
+            ).all()
+
+            # Structure: {pageid: {pageid, page, total_views, view_history: [date, views]}, ...}
+            articles_stats: dict[int, dict[str, any]] = {
+                pageid: None for pageid in ranked_pageids
+            }
+            for offset in range(0, len(ranked_pageids), self.MAX_QUERY_PARAMS):
+                pageids_chunk = ranked_pageids[offset : offset + self.MAX_QUERY_PARAMS]
+                query = (
+                    db.select(ArticleViews)
+                    .where(*date_range_filter, ArticleViews.pageid.in_(pageids_chunk))
+                    .order_by(ArticleViews.views_date, ArticleViews.rank)
+                )
+                for article_views in db.session.scalars(query):
+                    article_stats = articles_stats[article_views.pageid]
+                    if article_stats is None:
+                        article_stats = articles_stats[article_views.pageid] = {
+                            "pageid": article_views.pageid,
+                            "page": article_views.page,
+                            "total_views": 0,
+                            "view_history": [],
+                        }
+                    article_stats["total_views"] += article_views.views
+                    article_stats["view_history"].append(
+                        {
+                            "date": article_views.views_date.strftime("%Y-%m-%d"),
+                            "views": article_views.views,
+                        }
+                    )
+
+        return (list(articles_stats.values()), total_articles)
+
+    def ingest_cached_responses(self, batch_size: int = 100) -> int:
+        """Ingests the `ArticleViews` rows of every response cached before the ingestion stage existed.
+
+        Returns:
+            Total ingested responses.
+        """
+        total_ingested = 0
+        with self._app_context():
+            urls = db.session.scalars(
+                db.select(CachedResponse.url).where(
+                    CachedResponse.url.contains(self.FEATURED_CONTENT_PATH)
+                )
+            ).all()
+            for offset in range(0, len(urls), batch_size):
+                cached_responses = self.multi_get(urls[offset : offset + batch_size])
+                total_ingested += self._ingest_article_views(cached_responses.values())
+                db.session.commit()
+        return total_ingested
+
+    def _active_compressor(self) -> ResponseCompressor:
+        """Returns the compressor of new responses, after loading the newest trained Zstandard dictionary
+        on first use (requires an app context).
+        """
+        if (
+            self.compressor.codec == ZSTD_CODEC
+            and not self._is_compression_dictionary_loaded
+        ):
+            compression_dictionary = db.session.scalars(
+                db.select(CompressionDictionary)
+                .order_by(CompressionDictionary.created_at.desc())
+                .limit(1)
+            ).first()
+            if compression_dictionary:
+                self.compressor.add_dictionary(compression_dictionary.dictionary)
+            self._is_compression_dictionary_loaded = True
+        return self.compressor
+
+    def _project_response(self, url: str, text_response: str) -> str:
+        """Returns the "mostread" projection of a Featured Content response,
+        or None if `url` is not a Featured Content URL or the response has no "mostread" object.
+        """
+        if not urlsplit(url).path.startswith(self.FEATURED_CONTENT_PATH):
+            return None
+        try:
+            return project_featured_content_most_read_articles(text_response)
+        except WikiAPIError:
+            return None
+
+    def _ingest_article_views(self, wiki_resps: list[WikiAPIResponse]) -> int:
+        """Replaces the `ArticleViews` rows of the days in the Featured Content responses.
+
+        Note:
+            Rows are added to the current db session, the caller is responsible for committing.
+
+        Returns:
+            Total ingested responses.
+        """
+        total_ingested = 0
+        for wiki_resp in wiki_resps:
+            url_parts = urlsplit(wiki_resp.url)
+            if not url_parts.path.startswith(self.FEATURED_CONTENT_PATH):
+                continue
+
+            try:
+                parsed_content = parse_featured_content_most_read_articles(
+                    wiki_resp.text
+                )
+            except WikiAPIError:
+                continue
+            if not parsed_content:
+                continue
+
+            lang_code = url_parts.netloc.split(".")[0]
+            views_date, articles = parsed_content
+            db.session.execute(
+                db.delete(ArticleViews).where(
+                    ArticleViews.lang_code == lang_code,
+                    ArticleViews.views_date == views_date.date(),
+                )
+            )
+            # Skip duplicated pageids within the same day, keeping their first appearance.
+            ingested_pageids = set()
+            for rank, article in enumerate(articles):
+                if article.pageid in ingested_pageids:
+                    continue
+                ingested_pageids.add(article.pageid)
+                db.session.add(
+                    ArticleViews(
+                        lang_code=lang_code,
+                        views_date=views_date.date(),
+                        pageid=article.pageid,
+                        page=article.page,
+                        views=article.views,
+                        rank=rank,
+                    )
+                )
+            total_ingested += 1
+        return total_ingested
+
+    def _app_context(self) -> AbstractContextManager:
+        if self.app is None or has_app_context():
+            return nullcontext()
+        return self.app.app_context()
+
+
+class AsyncResponseCache(ResponseCache):
+    """This is a subclass of ResponseCache whose async variants run the SQLite work on a dedicated
+    thread pool, so that cache lookups and writes awaited by `WikiAPI` don't stall the event loop.
+
+    Note:
+        Synchronous calls still run on the calling thread, e.g. the write-behind writer thread.
+        `close` should be called on shutdown, later async calls raise a `RuntimeError`.
+    """
+
+    def __init__(
+        self,
+        app: Flask = None,
+        mostread_projection: bool = False,
+        compressor: ResponseCompressor = None,
+        group_commit: bool = False,
+        group_commit_delay_secs: float = 0,
+        max_workers: int = 4,
+    ) -> None:
+        """
+        Args:
+            max_workers: Threads running the SQLite work of the async variants.
+            Other arguments: Same as `ResponseCache`.
+        """
+        super().__init__(
+            app, mostread_projection, compressor, group_commit, group_commit_delay_secs
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ResponseCache"
         )
-        db.session.merge(cached_resp)
-        db.session.commit()
+
+    async def aget(self, url: str) -> WikiAPIResponse:
+        return (await self.amulti_get([url])).get(url)
+
+    async def aput(self, wiki_resp: WikiAPIResponse):
+        await self.aput_many([wiki_resp])
+
+    async def amulti_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        return await self._run_in_executor(self.multi_get, urls)
+
+    async def aput_many(self, wiki_resps: list[WikiAPIResponse]):
+        await self._run_in_executor(self.put_many, wiki_resps)
+
+    async def atouch_many(self, urls: list[str]):
+        await self._run_in_executor(self.touch_many, urls)
+
+    async def aleased_fetch_urls(self, urls: list[str]) -> list[str]:
+        return await self._run_in_executor(self.leased_fetch_urls, urls)
+
+    async def aacquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        return await self._run_in_executor(self.acquire_fetch_leases, urls, owner, ttl)
+
+    async def arelease_fetch_leases(self, urls: list[str], owner: str):
+        await self._run_in_executor(self.release_fetch_leases, urls, owner)
+
+    async def aaggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        return await self._run_in_executor(
+            self.aggregate_most_read_articles, lang_code, start_date, end_date, limit
+        )
+
+    def close(self):
+        """Waits for the pending SQLite work and stops the executor threads."""
+        self._executor.shutdown(wait=True)
+
+    async def _run_in_executor(self, func: Callable, *args) -> any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
 
 
 def create_app(config: Config) -> Flask:
@@ -48,55 +544,277 @@ def create_app(config: Config) -> Flask:
 
     app = Flask(__name__)
     app.config.from_object(config)
+    app.json = CodecJSONProvider(app)
 
     # Flask SQLAlchemy: https://flask-sqlalchemy.palletsprojects.com/en/3.1.x/quickstart/#initialize-the-extension
     db.init_app(app)
+    _configure_sqlite_pragmas(app)
 
     # Cross-origin resource sharing
     CORS(app)
 
-    # Wiki API client with caching and rate limiting.
-    wiki_api = WikiAPI(optional_cache=ResponseCache())
+    # Two-tier response cache: a bounded in-memory LRU in front of the SQLite db.
+    response_cache = create_response_cache(app)
+    memory_cache = BoundedLRUCache(
+        max_bytes=app.config["MEMORY_CACHE_MAX_BYTES"],
+        default_ttl=app.config["MEMORY_CACHE_TTL_SECS"],
+    )
+
+    # Optional write-behind queue, so that fetches on the event loop don't wait for SQLite writes.
+    backing_cache = response_cache
+    write_behind_cache = None
+    if app.config["RESPONSE_CACHE_WRITE_BEHIND"]:
+        backing_cache = write_behind_cache = WriteBehindWikiCache(
+            response_cache,
+            max_pending=app.config["RESPONSE_CACHE_WRITE_BEHIND_MAX_PENDING"],
+            flush_interval_secs=app.config[
+                "RESPONSE_CACHE_WRITE_BEHIND_FLUSH_INTERVAL_SECS"
+            ],
+        )
+
+    # Memoized endpoint responses: {(lang_code, start, end, results_limit, offset): JSON bytes}
+    # and date range rankings paginated by the responses: {(lang_code, start, end): MostReadArticlesRanking}
+    result_cache = BoundedLRUCache(max_bytes=app.config["RESULT_CACHE_MAX_BYTES"])
+
+    # Wiki API client with caching, rate limiting and pooled HTTP/2 connections per host.
+    wiki_api = WikiAPI(
+        optional_cache=TieredWikiCache(backing_cache, memory_cache),
+        http_limits=httpx.Limits(
+            max_connections=app.config["HTTP_MAX_CONNECTIONS"],
+            max_keepalive_connections=app.config["HTTP_MAX_KEEPALIVE_CONNECTIONS"],
+            keepalive_expiry=app.config["HTTP_KEEPALIVE_EXPIRY_SECS"],
+        ),
+        aio_rate_limiter=_create_rate_limiter(app.config),
+        max_retries=app.config["WIKI_API_MAX_RETRIES"],
+        aggregation_engine=app.config["AGGREGATION_ENGINE"],
+        revalidate_after_secs=app.config["WIKI_API_REVALIDATE_AFTER_SECS"],
+    )
+
+    # Long-lived event loop shared by all worker threads, which keeps the HTTP/2 connections alive
+    # between requests instead of running a new event loop per request.
+    event_loop_thread = EventLoopThread(name="WikiAPIEventLoop")
+    event_loop_thread.add_shutdown_callback(wiki_api.aclose)
+    if write_behind_cache:
+        # Flush the queued responses on shutdown.
+        event_loop_thread.add_shutdown_callback(
+            lambda: asyncio.to_thread(write_behind_cache.close)
+        )
+    if isinstance(response_cache, AsyncResponseCache):
+        event_loop_thread.add_shutdown_callback(
+            lambda: asyncio.to_thread(response_cache.close)
+        )
+    if isinstance(wiki_api.aio_rate_limiter, SharedAsyncIORateLimiter):
+        # Close the connection to the shared state file.
+        event_loop_thread.add_shutdown_callback(
+            lambda: asyncio.to_thread(wiki_api.aio_rate_limiter.close)
+        )
+    atexit.register(event_loop_thread.stop)
+    app.extensions["event_loop_thread"] = event_loop_thread
+    app.extensions["wiki_api"] = wiki_api
+    app.extensions["response_cache"] = response_cache
+    app.extensions["write_behind_cache"] = write_behind_cache
+    app.extensions["memory_cache"] = memory_cache
+    app.extensions["result_cache"] = result_cache
+
+    if app.config["PREFETCH_IN_APP"]:
+        start_prefetcher(app)
+
+    # `/most_read_articles` handler shared with the ASGI app, see `app.asgi`.
+    most_read_articles_endpoint = MostReadArticlesEndpoint(app, wiki_api, result_cache)
+    app.extensions["most_read_articles_endpoint"] = most_read_articles_endpoint
 
     @app.route("/")
     def home():
-        example_query = (
-            "/most_read_articles?lang_code=en&start=2024-02-28&end=2024-02-28"
-        )
-        return f"""
-            Example query:
-                <a href="{example_query}">{example_query}</a>
-        """
+        return home_page()
+
+    @app.route("/cache_stats")
+    def cache_stats():
+        return jsonify(collect_cache_stats(app))
 
     @app.route("/most_read_articles")
     def most_read_articles():
-        lang_code = request.args.get("lang_code", "")
-        start = request.args.get("start", "")
-        end = request.args.get("end", "")
-
-        result = asyncio.run(
-            run_timed_task(
-                coro=wiki_api.fetch_most_read_articles(lang_code, start, end),
-                timeout=app.config["SERVER_TIMEOUT_SECS"],
+        query, endpoint_response = most_read_articles_endpoint.prepare(
+            request.args, request.headers
+        )
+        if endpoint_response is None:
+            endpoint_response = event_loop_thread.run_coroutine(
+                most_read_articles_endpoint.respond(query)
             )
+        return Response(
+            endpoint_response.body,
+            endpoint_response.status_code,
+            headers=endpoint_response.headers,
         )
 
-        status_code = 200 if not "request_error" in result else 400
-        return jsonify(result), status_code
-
     return app
 
 
-async def run_timed_task(coro: Coroutine, timeout: int) -> dict[str, any]:
-    """This function stops running `coro` after `timeout` and reports any error message."""
-    try:
-        async with asyncio.timeout(timeout):
-            return await coro
-    except TimeoutError:
-        return _json_format_error("The server took too long to complete the task.")
-    except Exception as e:
-        return _json_format_error(str(e))
+def create_prefetcher(app: Flask) -> MostReadPrefetcher:
+    """Creates the prefetcher of the newest completed day, sharing the app's caching layer
+    and a low-priority share of its Wikipedia API rate limiter.
 
+    Raises:
+        ValueError: If the app's rate limiter isn't a token bucket.
+    """
+    wiki_api: WikiAPI = app.extensions["wiki_api"]
+    prefetch_wiki_api = WikiAPI(
+        optional_cache=wiki_api.optional_cache,
+        http_limits=wiki_api.http_limits,
+        aio_rate_limiter=LowPriorityRateLimiter(
+            wiki_api.aio_rate_limiter,
+            reserved_tokens=app.config["PREFETCH_RESERVED_TOKENS"],
+        ),
+        max_retries=wiki_api.max_retries,
+        aggregation_engine=wiki_api.aggregation_engine,
+    )
+    app.extensions["event_loop_thread"].add_shutdown_callback(prefetch_wiki_api.aclose)
+    return MostReadPrefetcher(
+        prefetch_wiki_api,
+        lang_codes=app.config["PREFETCH_LANG_CODES"],
+        delay_secs=app.config["PREFETCH_DELAY_SECS"],
+        retry_interval_secs=app.config["PREFETCH_RETRY_INTERVAL_SECS"],
+    )
 
-def _json_format_error(message: str) -> dict[str, str]:
-    return {"request_error": message}
+
+def create_response_cache(app: Flask) -> ResponseCache:
+    """Creates a SQLite response cache with the configured projection mode, compression codec and group commit,
+    an `AsyncResponseCache` if `RESPONSE_CACHE_EXECUTOR_WORKERS` is set.
+    """
+    compressor = create_response_compressor(
+        app.config["RESPONSE_CACHE_CODEC"],
+        dictionary_loader=load_compression_dictionary,
+    )
+    mostread_projection = app.config["RESPONSE_CACHE_MOSTREAD_PROJECTION"]
+    group_commit = app.config["RESPONSE_CACHE_GROUP_COMMIT"]
+    group_commit_delay_secs = app.config["RESPONSE_CACHE_GROUP_COMMIT_DELAY_SECS"]
+    if app.config["RESPONSE_CACHE_EXECUTOR_WORKERS"]:
+        return AsyncResponseCache(
+            app,
+            mostread_projection,
+            compressor,
+            group_commit,
+            group_commit_delay_secs,
+            max_workers=app.config["RESPONSE_CACHE_EXECUTOR_WORKERS"],
+        )
+    return ResponseCache(
+        app, mostread_projection, compressor, group_commit, group_commit_delay_secs
+    )
+
+
+def create_backfill(
+    app: Flask, batch_days: int = MostReadBackfill.DEFAULT_BATCH_DAYS
+) -> MostReadBackfill:
+    """Creates a bulk backfill of the app's SQLite response cache, sharing its Wikipedia API rate limiter.
+
+    Note:
+        The backfill bypasses the in-memory tier, so that years of history don't evict popular responses.
+        Each batch of days is written with a single `put_many`, i.e. one transaction.
+    """
+    wiki_api: WikiAPI = app.extensions["wiki_api"]
+    response_cache = create_response_cache(app)
+    batch_cache = BatchWriteWikiCache(response_cache)
+    backfill_wiki_api = WikiAPI(
+        optional_cache=batch_cache,
+        http_limits=wiki_api.http_limits,
+        aio_rate_limiter=wiki_api.aio_rate_limiter,
+        max_retries=wiki_api.max_retries,
+    )
+    event_loop_thread: EventLoopThread = app.extensions["event_loop_thread"]
+    event_loop_thread.add_shutdown_callback(backfill_wiki_api.aclose)
+    if isinstance(response_cache, AsyncResponseCache):
+        event_loop_thread.add_shutdown_callback(
+            lambda: asyncio.to_thread(response_cache.close)
+        )
+    return MostReadBackfill(
+        app, backfill_wiki_api, batch_days=batch_days, batch_cache=batch_cache
+    )
+
+
+def start_prefetcher(app: Flask) -> Future:
+    """Runs the prefetcher in the background on the app's event loop until it stops."""
+    event_loop_thread: EventLoopThread = app.extensions["event_loop_thread"]
+    prefetcher = create_prefetcher(app)
+    future = asyncio.run_coroutine_threadsafe(
+        prefetcher.run_forever(), event_loop_thread.loop
+    )
+
+    async def cancel_prefetcher():
+        future.cancel()
+
+    event_loop_thread.add_shutdown_callback(cancel_prefetcher)
+    return future
+
+
+def home_page() -> str:
+    """Returns the HTML of the `/` route, an example query."""
+    example_query = "/most_read_articles?lang_code=en&start=2024-02-28&end=2024-02-28"
+    return f"""
+            Example query:
+                <a href="{example_query}">{example_query}</a>
+        """
+
+
+def collect_cache_stats(app: Flask) -> dict[str, any]:
+    """Returns the counters of the app's caching layers and Wiki API client served by `/cache_stats`."""
+    write_behind_cache = app.extensions["write_behind_cache"]
+    response_cache = app.extensions["response_cache"]
+    wiki_api = app.extensions["wiki_api"]
+    return {
+        "memory_cache": app.extensions["memory_cache"].stats(),
+        "result_cache": app.extensions["result_cache"].stats(),
+        "response_cache_write_behind": (
+            write_behind_cache.stats() if write_behind_cache else None
+        ),
+        "response_cache_group_commit": (
+            response_cache.group_committer.stats()
+            if response_cache.group_committer
+            else None
+        ),
+        "wiki_api_retries": wiki_api.retry_stats(),
+        "wiki_api_revalidations": wiki_api.revalidation_stats(),
+    }
+
+
+def _configure_sqlite_pragmas(app: Flask):
+    """Sets the configured `SQLITE_PRAGMAS` on every new SQLite connection of the app's engine,
+    e.g. `journal_mode=WAL` so that readers don't block the writer and vice versa.
+    """
+    pragmas = app.config["SQLITE_PRAGMAS"]
+    if not pragmas:
+        return
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def _create_rate_limiter(config: dict[str, any]) -> AsyncIORateLimiter:
+    """Creates the Wikipedia API rate limiter of the configured scheduler."""
+    scheduler = config["RATE_LIMIT_SCHEDULER"]
+    if config["RATE_LIMIT_SHARED_STATE_FILE"]:
+        # Token bucket shared by every worker process using the same state file.
+        burst_size = config["RATE_LIMIT_BURST_SIZE"]
+        return SharedAsyncIORateLimiter(
+            state_file=config["RATE_LIMIT_SHARED_STATE_FILE"],
+            max_tasks_per_second=WikiAPI.MAX_REQUESTS_PER_SEC - burst_size,
+            burst_size=burst_size,
+        )
+    if scheduler == TOKEN_BUCKET_SCHEDULER:
+        # A token bucket can start `burst_size` requests on top of its refill rate within a second,
+        # so the burst is taken from the refill rate to stay within Wikipedia's rate limit.
+        burst_size = config["RATE_LIMIT_BURST_SIZE"]
+        return AsyncIORateLimiter(
+            max_tasks_per_second=WikiAPI.MAX_REQUESTS_PER_SEC - burst_size,
+            scheduler=scheduler,
+            burst_size=burst_size,
+        )
+    return AsyncIORateLimiter(
+        max_tasks_per_second=WikiAPI.MAX_REQUESTS_PER_SEC, scheduler=scheduler
+    )
@@ -0,0 +1,223 @@
+import asyncio
+from flask import Flask
+import logging
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl
+from werkzeug.datastructures import Headers, MultiDict
+
+from app import collect_cache_stats, create_app, create_prefetcher, home_page
+from app.config import Config, config_from_env
+from app.most_read_articles import EndpointResponse, MostReadArticlesEndpoint
+from shared.event_loop_thread import EventLoopThread
+
+# Methods of the routes, "HEAD" responses have the headers of "GET" ones without their body.
+ALLOWED_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ASGIApp:
+    """
+    This is an ASGI application serving the routes of `create_app` with async handlers, which await `WikiAPI`
+    on the ASGI server's event loop instead of holding a worker thread per request. A few processes
+    can then hold thousands of slow requests, e.g. waiting for rate limited Wikipedia API fetches.
+
+    Note:
+        Responses are built by the same handlers as the Flask app (e.g. `MostReadArticlesEndpoint`),
+        so both serve the same JSON contract, including the cross-origin headers of `flask_cors`.
+        The `WikiAPI` client and its pooled HTTP/2 connections are bound to the server's event loop,
+        the Flask app's `EventLoopThread` is never started: its shutdown callbacks (e.g. closing the connections
+        and flushing the write-behind cache) run on the lifespan shutdown event instead.
+        💡 With `prefetch`, the prefetcher runs on the server's event loop from the lifespan startup event.
+        🚨 Only run it with a single event loop per process, e.g. one uvicorn worker per process.
+    """
+
+    def __init__(self, flask_app: Flask, prefetch: bool = False) -> None:
+        """
+        Args:
+            flask_app: App created by `create_app`, providing the config, caching layer and Wiki API client.
+            prefetch: Run the prefetcher of the newest completed day on the server's event loop.
+        """
+        self.flask_app = flask_app
+        self.prefetch = prefetch
+        self.event_loop_thread: EventLoopThread = flask_app.extensions[
+            "event_loop_thread"
+        ]
+        self.most_read_articles_endpoint: MostReadArticlesEndpoint = (
+            flask_app.extensions["most_read_articles_endpoint"]
+        )
+        # Structure: {path: async handler(args, headers) -> EndpointResponse}
+        self._routes: dict[
+            str,
+            Callable[[MultiDict, Headers], Awaitable[EndpointResponse]],
+        ] = {
+            "/": self._home,
+            "/cache_stats": self._cache_stats,
+            "/most_read_articles": self._most_read_articles,
+        }
+        self._prefetcher_task: asyncio.Task = None
+
+    async def __call__(
+        self,
+        scope: dict[str, any],
+        receive: Callable[[], Awaitable[dict[str, any]]],
+        send: Callable[[dict[str, any]], Awaitable[None]],
+    ):
+        if scope["type"] == "lifespan":
+            await self._run_lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._handle_http(scope, send)
+        else:
+            # Unsupported protocol, e.g. WebSocket.
+            raise NotImplementedError(f"Unsupported ASGI scope type: {scope['type']}.")
+
+    async def startup(self):
+        """Starts the prefetcher on the running event loop if enabled."""
+        if self.prefetch and self._prefetcher_task is None:
+            self._prefetcher_task = asyncio.create_task(
+                create_prefetcher(self.flask_app).run_forever()
+            )
+
+    async def shutdown(self):
+        """Stops the prefetcher, then runs the Flask app's shutdown callbacks on the running event loop."""
+        if self._prefetcher_task:
+            self._prefetcher_task.cancel()
+            try:
+                await self._prefetcher_task
+            except asyncio.CancelledError:
+                pass
+            self._prefetcher_task = None
+        await self.event_loop_thread.run_shutdown_callbacks()
+
+    async def _run_lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    logging.error("ASGI startup error: %s", e)
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle_http(self, scope: dict[str, any], send):
+        method = scope["method"]
+        headers = Headers(
+            [
+                (name.decode("latin-1"), value.decode("latin-1"))
+                for name, value in scope["headers"]
+            ]
+        )
+        handler = self._routes.get(scope["path"])
+        if handler is None:
+            response = _text_response(404, "Not Found")
+        elif method == "OPTIONS":
+            response = _preflight_response(headers)
+        elif method not in ALLOWED_METHODS:
+            response = _text_response(405, "Method Not Allowed")
+            response.headers.append(("Allow", ", ".join(ALLOWED_METHODS)))
+        else:
+            args = MultiDict(
+                parse_qsl(
+                    scope["query_string"].decode("latin-1"), keep_blank_values=True
+                )
+            )
+            response = await handler(args, headers)
+        await _send_response(send, response, include_body=method != "HEAD")
+
+    async def _home(self, args: MultiDict, headers: Headers) -> EndpointResponse:
+        return EndpointResponse(
+            200,
+            [("Content-Type", "text/html; charset=utf-8")],
+            home_page().encode(),
+        )
+
+    async def _cache_stats(self, args: MultiDict, headers: Headers) -> EndpointResponse:
+        return EndpointResponse(
+            200,
+            [("Content-Type", self.flask_app.json.mimetype)],
+            self.flask_app.json.dumps_bytes(collect_cache_stats(self.flask_app)),
+        )
+
+    async def _most_read_articles(
+        self, args: MultiDict, headers: Headers
+    ) -> EndpointResponse:
+        # Memoized rankings are serialized (and compressed) by `prepare`, on a worker thread.
+        query, response = await asyncio.to_thread(
+            self.most_read_articles_endpoint.prepare, args, headers
+        )
+        if response is None:
+            response = await self.most_read_articles_endpoint.respond(query)
+        return response
+
+
+def create_asgi_app(config: Config) -> ASGIApp:
+    """Creates the Flask app of `config` and returns its ASGI app.
+
+    Note:
+        With `PREFETCH_IN_APP`, the prefetcher runs on the ASGI server's event loop
+        instead of the Flask app's event loop thread.
+    """
+    prefetch = config.PREFETCH_IN_APP
+    config.PREFETCH_IN_APP = False
+    return ASGIApp(create_app(config), prefetch=prefetch)
+
+
+def asgi_app_from_env() -> ASGIApp:
+    """ASGI app factory of the environment's config, e.g. `uvicorn --factory app.asgi:asgi_app_from_env`."""
+    return create_asgi_app(config_from_env())
+
+
+def _preflight_response(headers: Headers) -> EndpointResponse:
+    """Returns the CORS preflight response of any origin, as `flask_cors` does by default."""
+    response_headers = [("Access-Control-Allow-Methods", ", ".join(ALLOWED_METHODS))]
+    requested_headers = headers.get("Access-Control-Request-Headers")
+    if requested_headers:
+        response_headers.append(("Access-Control-Allow-Headers", requested_headers))
+    return EndpointResponse(200, response_headers, b"")
+
+
+def _text_response(status_code: int, text: str) -> EndpointResponse:
+    return EndpointResponse(
+        status_code, [("Content-Type", "text/plain; charset=utf-8")], text.encode()
+    )
+
+
+async def _send_response(send, response: EndpointResponse, include_body: bool):
+    """Sends an `EndpointResponse`, streaming iterated bodies (e.g. NDJSON) chunk by chunk."""
+    headers = [
+        (name.lower().encode("latin-1"), str(value).encode("latin-1"))
+        for name, value in response.headers
+    ]
+    # Cross-origin resource sharing, as `flask_cors` does by default.
+    headers.append((b"access-control-allow-origin", b"*"))
+
+    body = response.body
+    if isinstance(body, bytes):
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": headers,
+            }
+        )
+        await send(
+            {"type": "http.response.body", "body": body if include_body else b""}
+        )
+        return
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": headers,
+        }
+    )
+    if include_body:
+        for chunk in body:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,323 @@
+from datetime import date, datetime, timedelta
+import logging
+import time
+from typing import Callable
+
+from flask import Flask
+
+from app.extensions import db
+from app.models import BackfillCheckpoint
+from shared.wiki_api import (
+    WikiAPI,
+    WikiAPIError,
+    WikiAPIResponse,
+    WikiCache,
+    parse_featured_content_most_read_articles,
+)
+
+
+class BatchWriteWikiCache(WikiCache):
+    """
+    This is a subclass of WikiCache that holds puts in memory until `aflush` writes them
+    to a backing WikiCache with a single `put_many`, i.e. in one transaction of a SQLite db.
+
+    Note:
+        Held responses are readable until they're written. Fetch leases are delegated to the backing cache.
+        🚨 Held responses are lost if they're not flushed, e.g. an interrupted backfill batch is fetched again.
+    """
+
+    def __init__(self, backing_cache: WikiCache) -> None:
+        """
+        Args:
+            backing_cache: Cache the held responses are written to.
+        """
+        super().__init__()
+        self.backing_cache = backing_cache
+        # Structure: {url: WikiAPIResponse}, in order of put.
+        self._held: dict[str, WikiAPIResponse] = {}
+
+    def get(self, url: str) -> WikiAPIResponse:
+        return self.multi_get([url]).get(url)
+
+    def put(self, wiki_resp: WikiAPIResponse):
+        self.put_many([wiki_resp])
+
+    def multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        cached_responses = self._held_multi_get(urls)
+        missed_urls = [url for url in urls if url not in cached_responses]
+        if missed_urls:
+            cached_responses.update(self.backing_cache.multi_get(missed_urls))
+        return cached_responses
+
+    def put_many(self, wiki_resps: list[WikiAPIResponse]):
+        for wiki_resp in wiki_resps:
+            self._held[wiki_resp.url] = wiki_resp
+
+    async def aget(self, url: str) -> WikiAPIResponse:
+        return (await self.amulti_get([url])).get(url)
+
+    async def aput(self, wiki_resp: WikiAPIResponse):
+        self.put_many([wiki_resp])
+
+    async def amulti_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        cached_responses = self._held_multi_get(urls)
+        missed_urls = [url for url in urls if url not in cached_responses]
+        if missed_urls:
+            cached_responses.update(await self.backing_cache.amulti_get(missed_urls))
+        return cached_responses
+
+    async def aput_many(self, wiki_resps: list[WikiAPIResponse]):
+        self.put_many(wiki_resps)
+
+    def touch_many(self, urls: list[str]):
+        self.backing_cache.touch_many(urls)
+
+    async def atouch_many(self, urls: list[str]):
+        await self.backing_cache.atouch_many(urls)
+
+    def acquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        return self.backing_cache.acquire_fetch_leases(urls, owner, ttl)
+
+    def release_fetch_leases(self, urls: list[str], owner: str):
+        self.backing_cache.release_fetch_leases(urls, owner)
+
+    def leased_fetch_urls(self, urls: list[str]) -> list[str]:
+        return self.backing_cache.leased_fetch_urls(urls)
+
+    async def aleased_fetch_urls(self, urls: list[str]) -> list[str]:
+        return await self.backing_cache.aleased_fetch_urls(urls)
+
+    async def aacquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        return await self.backing_cache.aacquire_fetch_leases(urls, owner, ttl)
+
+    async def arelease_fetch_leases(self, urls: list[str], owner: str):
+        await self.backing_cache.arelease_fetch_leases(urls, owner)
+
+    async def aflush(self):
+        """Writes the held responses to the backing cache with a single `put_many`."""
+        if not self._held:
+            return
+        wiki_resps = list(self._held.values())
+        await self.backing_cache.aput_many(wiki_resps)
+        # Puts of the same URLs made during the write are held for the next flush.
+        for wiki_resp in wiki_resps:
+            if self._held.get(wiki_resp.url) is wiki_resp:
+                del self._held[wiki_resp.url]
+
+    def _held_multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        return {url: self._held[url] for url in urls if url in self._held}
+
+
+class MostReadBackfill:
+    """
+    A resumable bulk loader of the Featured Content responses of date ranges into the caching layer,
+    e.g. to bring up a new node with years of history for many languages.
+
+    Note:
+        Days are fetched through `wiki_api` (rate limited, skipping cached days) in batches of
+        `batch_days`. With a `batch_cache`, the days of each batch are stored in a single transaction
+        before its `BackfillCheckpoint` is committed, so an interrupted backfill resumes from the next batch.
+        💡 Failed days are reported and skipped, running again with `restart` retries them
+        while cached days are still skipped.
+    """
+
+    DEFAULT_BATCH_DAYS = 100
+
+    def __init__(
+        self,
+        app: Flask,
+        wiki_api: WikiAPI,
+        batch_days: int = DEFAULT_BATCH_DAYS,
+        batch_cache: BatchWriteWikiCache = None,
+        report: Callable[[str], None] = print,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            app: Flask app of the db storing the checkpoints.
+            wiki_api: Wiki API client whose caching layer is backfilled.
+            batch_days: Days fetched per batch, between checkpoints.
+            batch_cache: Optional caching layer of `wiki_api` flushed after each batch.
+            report: Progress report function, called after each batch.
+            monotonic: Clock function used to measure the throughput.
+
+        Raises:
+            ValueError: If `batch_days` is less than 1.
+        """
+        if batch_days < 1:
+            raise ValueError("batch_days should be at least 1.")
+
+        self.app = app
+        self.wiki_api = wiki_api
+        self.batch_days = batch_days
+        self.batch_cache = batch_cache
+        self._report = report
+        self._monotonic = monotonic
+
+    async def run(
+        self,
+        lang_codes: list[str],
+        start_date: date,
+        end_date: date,
+        restart: bool = False,
+    ) -> dict[str, int]:
+        """Backfills the date range of each language, resuming from their checkpoints.
+
+        Args:
+            lang_codes: Wikipedia language codes.
+            start_date: Start day of views to backfill.
+            end_date: Last day of views (inclusive).
+            restart: Ignore the checkpoints and start over from `start_date`.
+
+        Returns:
+            Dictionary of the `days` processed by this run and their `failed_days`.
+
+        Raises:
+            ValueError: If `end_date` is before `start_date`.
+        """
+        if start_date > end_date:
+            raise ValueError("end_date should not be before start_date.")
+
+        total_days = (end_date - start_date).days + 1
+        # Structure: {lang_code: (next_date, failed_days)}
+        resume_points = {}
+        for lang_code in lang_codes:
+            checkpoint = None
+            if not restart:
+                checkpoint = self._load_checkpoint(lang_code, start_date, end_date)
+            if checkpoint:
+                resume_points[lang_code] = (
+                    checkpoint.next_date,
+                    checkpoint.failed_days,
+                )
+            else:
+                resume_points[lang_code] = (start_date, 0)
+
+        pending_days = sum(
+            max((end_date - next_date).days + 1, 0)
+            for next_date, _ in resume_points.values()
+        )
+        self._report(
+            f"==> Backfilling {len(lang_codes)} languages from {start_date} to {end_date}:"
+            f" {pending_days} of {total_days * len(lang_codes)} days pending"
+        )
+
+        started_at = self._monotonic()
+        processed_days = 0
+        run_failed_days = 0
+        for lang_code in lang_codes:
+            next_date, failed_days = resume_points[lang_code]
+            while next_date <= end_date:
+                batch_end_date = min(
+                    next_date + timedelta(days=self.batch_days - 1), end_date
+                )
+                batch_failed_days = await self._backfill_batch(
+                    lang_code, next_date, batch_end_date
+                )
+                batch_days = (batch_end_date - next_date).days + 1
+                next_date = batch_end_date + timedelta(days=1)
+                failed_days += batch_failed_days
+                self._save_checkpoint(
+                    lang_code, start_date, end_date, next_date, failed_days
+                )
+
+                processed_days += batch_days
+                run_failed_days += batch_failed_days
+                self._report_progress(
+                    lang_code,
+                    batch_end_date,
+                    processed_days,
+                    pending_days,
+                    run_failed_days,
+                    self._monotonic() - started_at,
+                )
+
+        return {"days": processed_days, "failed_days": run_failed_days}
+
+    async def _backfill_batch(
+        self, lang_code: str, start_date: date, end_date: date
+    ) -> int:
+        """Fetches a batch of days into the caching layer.
+
+        Returns:
+            Total failed days.
+        """
+        wiki_resps = await self.wiki_api.fetch_featured_content_responses(
+            lang_code,
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date, datetime.min.time()),
+        )
+        if self.batch_cache:
+            await self.batch_cache.aflush()
+        failed_days = 0
+        for wiki_resp in wiki_resps:
+            if not self._is_backfilled(wiki_resp):
+                failed_days += 1
+                logging.warning("BACKFILL FAILED: %s", wiki_resp.url)
+        return failed_days
+
+    def _is_backfilled(self, wiki_resp: WikiAPIResponse) -> bool:
+        """Whether the response contains the "mostread" object stored by the caching layer."""
+        if wiki_resp.exception or not wiki_resp.status_ok or not wiki_resp.text:
+            return False
+        try:
+            return parse_featured_content_most_read_articles(wiki_resp.text) is not None
+        except WikiAPIError:
+            return False
+
+    def _report_progress(
+        self,
+        lang_code: str,
+        last_date: date,
+        processed_days: int,
+        pending_days: int,
+        failed_days: int,
+        elapsed_secs: float,
+    ):
+        throughput = processed_days / elapsed_secs if elapsed_secs > 0 else 0
+        eta = "?"
+        if throughput > 0:
+            eta = str(
+                timedelta(seconds=round((pending_days - processed_days) / throughput))
+            )
+        self._report(
+            f"==> {lang_code} {last_date}: {processed_days}/{pending_days} days"
+            f" ({processed_days / pending_days:.1%}), {throughput:.1f} days/s,"
+            f" ETA {eta}, {failed_days} failed"
+        )
+
+    def _load_checkpoint(
+        self, lang_code: str, start_date: date, end_date: date
+    ) -> BackfillCheckpoint:
+        with self.app.app_context():
+            checkpoint = db.session.get(
+                BackfillCheckpoint, (lang_code, start_date, end_date)
+            )
+            if checkpoint:
+                db.session.expunge(checkpoint)
+            return checkpoint
+
+    def _save_checkpoint(
+        self,
+        lang_code: str,
+        start_date: date,
+        end_date: date,
+        next_date: date,
+        failed_days: int,
+    ):
+        with self.app.app_context():
+            db.session.merge(
+                BackfillCheckpoint(
+                    lang_code=lang_code,
+                    start_date=start_date,
+                    end_date=end_date,
+                    next_date=next_date,
+                    failed_days=failed_days,
+                    updated_at=datetime.now(),
+                )
+            )
+            db.session.commit()
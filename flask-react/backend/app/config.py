@@ -12,3 +12,99 @@ class Config:
     # Safeguard timeout to return a meaningful error message if an async function
     # is taking longer to complete before the server closes the connection.
     SERVER_TIMEOUT_SECS = 60
+    # Maximum languages of a multi-language `/most_read_articles` request, longer lists get a 400 response.
+    MAX_LANG_CODES = 20
+    # Pooled HTTP/2 connections per Wikipedia host, shared by all requests.
+    HTTP_MAX_CONNECTIONS = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+    HTTP_KEEPALIVE_EXPIRY_SECS = 30
+    # Store only the "mostread" subset of Featured Content responses in the response cache.
+    RESPONSE_CACHE_MOSTREAD_PROJECTION = True
+    # Compression codec of new cached responses: "zstd" (with the newest dictionary trained by
+    # migrate_compression.py) or "zlib", defaults to "zstd" if zstandard is installed.
+    RESPONSE_CACHE_CODEC = os.environ.get("RESPONSE_CACHE_CODEC")
+    # Threads running the SQLite work of response cache lookups and writes awaited on the event loop,
+    # 0 runs it on the event loop.
+    RESPONSE_CACHE_EXECUTOR_WORKERS = 4
+    # Queue response cache puts in memory and write them in batches on a background thread,
+    # puts wait while the queue is full.
+    RESPONSE_CACHE_WRITE_BEHIND = True
+    RESPONSE_CACHE_WRITE_BEHIND_MAX_PENDING = 1000
+    RESPONSE_CACHE_WRITE_BEHIND_FLUSH_INTERVAL_SECS = 0.05
+    # Commit the response cache puts of concurrent threads together, waiting up to the delay for other puts.
+    RESPONSE_CACHE_GROUP_COMMIT = False
+    RESPONSE_CACHE_GROUP_COMMIT_DELAY_SECS = 0
+    # Pragmas set on every new SQLite connection, see ProductionConfig.
+    SQLITE_PRAGMAS = {}
+    # In-memory LRU tier in front of the SQLite response cache.
+    MEMORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    MEMORY_CACHE_TTL_SECS = 60 * 60
+    # Memoized endpoint responses, date ranges including recent days expire after a short TTL.
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    RESULT_CACHE_RECENT_TTL_SECS = 5 * 60
+    # Cache-Control max-age of `/most_read_articles` responses for browsers and CDNs, date ranges
+    # ending before yesterday never change while ranges including recent days can still be updated.
+    HTTP_CACHE_FINAL_MAX_AGE_SECS = 7 * 24 * 60 * 60
+    HTTP_CACHE_RECENT_MAX_AGE_SECS = 60
+    # JSON responses of at least this size are compressed with the preferred content coding accepted
+    # by the client ("br" if brotli is installed, otherwise "gzip"), None disables compression.
+    HTTP_COMPRESSION_MIN_BYTES = 1024
+    # Wikipedia API rate limiter scheduler: "token_bucket" or "cycle" (1-second batch cycles).
+    RATE_LIMIT_SCHEDULER = "token_bucket"
+    # Token bucket burst size, taken from the per-second refill rate.
+    RATE_LIMIT_BURST_SIZE = 10
+    # Optional SQLite state file of a token bucket shared by multiple worker processes on the same host,
+    # otherwise each process assumes it owns the whole Wikipedia API rate limit.
+    RATE_LIMIT_SHARED_STATE_FILE = os.environ.get("RATE_LIMIT_SHARED_STATE_FILE")
+    # Retries of transient Wikipedia API failures (429 and 5xx status codes, timeouts).
+    WIKI_API_MAX_RETRIES = 3
+    # No retries start after this deadline, so failed days are reported before SERVER_TIMEOUT_SECS.
+    WIKI_API_RETRY_DEADLINE_SECS = 45
+    # Cached responses of days that can still change (yesterday and today, UTC) are revalidated upstream
+    # with a conditional request (ETag / Last-Modified) once older than this, None never revalidates them.
+    WIKI_API_REVALIDATE_AFTER_SECS = 30 * 60
+    # Aggregation engine of uncached date ranges: "dict" or "columnar" (typed arrays, vectorized with NumPy if installed).
+    AGGREGATION_ENGINE = "dict"
+    # Languages whose newest completed day is prefetched after UTC midnight, see start_prefetcher.py.
+    PREFETCH_LANG_CODES = ["en"]
+    PREFETCH_DELAY_SECS = 5 * 60
+    # Retry interval until the "mostread" section of the day is published.
+    PREFETCH_RETRY_INTERVAL_SECS = 10 * 60
+    # Rate limiter tokens reserved for user requests, prefetches only use the spare budget.
+    PREFETCH_RESERVED_TOKENS = 5
+    # Run the prefetcher in the app's background event loop instead of a start_prefetcher.py process.
+    PREFETCH_IN_APP = False
+
+
+class ProductionConfig(Config):
+    """Storage profile for many concurrent readers and writers sharing the SQLite db."""
+
+    SQLALCHEMY_ECHO = False
+    # Worker threads hold a pooled connection while handling a request.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 16,
+        "max_overflow": 16,
+        "pool_timeout": 30,
+        # Seconds a connection waits for the write lock (busy timeout) before "database is locked".
+        "connect_args": {"timeout": 30},
+    }
+    SQLITE_PRAGMAS = {
+        # Readers don't block the writer and vice versa.
+        "journal_mode": "WAL",
+        # Durable across app crashes, only a power loss may roll back the last commits in WAL mode.
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        # Negative values are in KiB, i.e. 64 MiB of page cache per connection.
+        "cache_size": -64 * 1024,
+    }
+    RESPONSE_CACHE_GROUP_COMMIT = True
+    RESPONSE_CACHE_GROUP_COMMIT_DELAY_SECS = 0.002
+
+
+def config_from_env() -> Config:
+    """Returns the `ProductionConfig` if the `APP_PROFILE` environment variable is "production",
+    otherwise the development `Config`.
+    """
+    if os.environ.get("APP_PROFILE") == "production":
+        return ProductionConfig()
+    return Config()
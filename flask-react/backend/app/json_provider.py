@@ -0,0 +1,34 @@
+from flask.json.provider import DefaultJSONProvider
+
+from shared.json_codec import JSONCodec, default_json_codec
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """This is a subclass of Flask's DefaultJSONProvider serializing and parsing JSON with a `JSONCodec`,
+    e.g. `orjson` when it's installed.
+
+    Note:
+        Calls with `json.dumps`/`json.loads` specific arguments (e.g. indented debug responses)
+        fall back to the standard library `json` module.
+    """
+
+    # The codec serializes non-ASCII characters as UTF-8.
+    ensure_ascii = False
+
+    def __init__(self, app, codec: JSONCodec = None) -> None:
+        super().__init__(app)
+        self.codec = codec or default_json_codec
+
+    def dumps(self, obj: any, **kwargs: any) -> str:
+        if kwargs and kwargs != {"separators": (",", ":")}:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj: any) -> bytes:
+        """Serializes `obj` as compact UTF-8 JSON bytes, e.g. for response bodies."""
+        return self.codec.dumps(obj, sort_keys=self.sort_keys, default=self.default)
+
+    def loads(self, s: str | bytes, **kwargs: any) -> any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return self.codec.loads(s)
@@ -1,8 +1,24 @@
 from sqlalchemy.orm import Mapped, mapped_column
-import zlib
 
 from app.extensions import db
-from datetime import datetime
+from datetime import date, datetime
+from shared.compression import ZLIB_CODEC, ResponseCompressor
+
+# CachedResponse.format_version values
+FULL_RESPONSE_FORMAT = 0
+MOSTREAD_PROJECTION_FORMAT = 1
+
+
+def load_compression_dictionary(dict_id: int) -> bytes:
+    """Loads a `CompressionDictionary` by ID, requires an app context."""
+    compression_dictionary = db.session.get(CompressionDictionary, dict_id)
+    return compression_dictionary.dictionary if compression_dictionary else None
+
+
+# Decompresses responses of any codec, and compresses them with zlib unless another compressor is given.
+default_response_compressor = ResponseCompressor(
+    dictionary_loader=load_compression_dictionary
+)
 
 
 class CachedResponse(db.Model):
@@ -12,26 +28,119 @@ class CachedResponse(db.Model):
     Note:
         💡 By using zlib to compress the response text and store a BLOB
         instead of VARCHAR noticed a 10x reduction on the SQLite db file.
+        Zstandard with a dictionary trained from cached responses shrinks it further
+        (see `migrate_compression.py`), `codec` marks how each response is compressed.
+
+        `format_version` marks whether the text is the full API response
+        or only its "mostread" projection.
+
+        `etag` and `last_modified` are the upstream validators of the response, so that it can be
+        revalidated with a conditional request, a 304 response only bumps `created_at`.
     """
 
     url: Mapped[str] = mapped_column(primary_key=True)
     compressed_response: Mapped[bytes]
     created_at: Mapped[datetime] = mapped_column(index=True)
+    format_version: Mapped[int] = mapped_column(
+        default=FULL_RESPONSE_FORMAT, server_default=str(FULL_RESPONSE_FORMAT)
+    )
+    codec: Mapped[str] = mapped_column(default=ZLIB_CODEC, server_default=ZLIB_CODEC)
+    etag: Mapped[str | None]
+    last_modified: Mapped[str | None]
 
-    def __init__(self, url: str, text_response: str, created_at: datetime):
+    def __init__(
+        self,
+        url: str,
+        text_response: str,
+        created_at: datetime,
+        format_version: int = FULL_RESPONSE_FORMAT,
+        compressor: ResponseCompressor = None,
+        etag: str = None,
+        last_modified: str = None,
+    ):
         """Convenience initializer to handle compression during model initialization."""
-        compressed_response = zlib.compress(text_response.encode())
+        compressor = compressor or default_response_compressor
+        codec, compressed_response = compressor.compress(text_response)
         super().__init__(
-            url=url, compressed_response=compressed_response, created_at=created_at
+            url=url,
+            compressed_response=compressed_response,
+            created_at=created_at,
+            format_version=format_version,
+            codec=codec,
+            etag=etag,
+            last_modified=last_modified,
         )
 
     @property
     def text_response(self) -> str:
-        return zlib.decompress(self.compressed_response).decode()
+        return default_response_compressor.decompress(
+            self.codec, self.compressed_response
+        )
 
     def to_dict(self) -> dict[str, any]:
         return {
             "url": self.url,
             "text_response": self.text_response,
             "created_at": self.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "format_version": self.format_version,
+            "codec": self.codec,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
         }
+
+
+class ArticleViews(db.Model):
+    """
+    This is a normalized model of the daily views of the most read articles,
+    ingested from cached Featured Content responses.
+
+    Note:
+        💡 Storing one row per article and day allows aggregating date ranges with a single
+        `GROUP BY` query, instead of decompressing and parsing every cached response.
+        The composite primary key also indexes (lang_code, views_date) range lookups.
+    """
+
+    lang_code: Mapped[str] = mapped_column(primary_key=True)
+    views_date: Mapped[date] = mapped_column(primary_key=True)
+    pageid: Mapped[int] = mapped_column(primary_key=True)
+    page: Mapped[str]
+    views: Mapped[int]
+    # Position of the article in the day's "mostread.articles" list, used as a tie-breaker.
+    rank: Mapped[int]
+
+
+class FetchLease(db.Model):
+    """
+    This is a lease on the fetch of a URL by a WikiAPI client (`owner`),
+    so that processes sharing the db wait for its response to be cached instead of fetching it again.
+    """
+
+    url: Mapped[str] = mapped_column(primary_key=True)
+    owner: Mapped[str]
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+
+class BackfillCheckpoint(db.Model):
+    """
+    This is the progress of a bulk backfill of a language's date range (see `seed_db.py`),
+    so that an interrupted backfill resumes from `next_date` instead of the range start.
+    """
+
+    lang_code: Mapped[str] = mapped_column(primary_key=True)
+    start_date: Mapped[date] = mapped_column(primary_key=True)
+    end_date: Mapped[date] = mapped_column(primary_key=True)
+    # First day not backfilled yet, after `end_date` once completed.
+    next_date: Mapped[date]
+    failed_days: Mapped[int] = mapped_column(default=0, server_default="0")
+    updated_at: Mapped[datetime]
+
+
+class CompressionDictionary(db.Model):
+    """
+    This is a Zstandard dictionary trained from cached responses, identified by the dictionary ID
+    recorded in the frames compressed with it.
+    """
+
+    dict_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    dictionary: Mapped[bytes]
+    created_at: Mapped[datetime] = mapped_column(index=True)
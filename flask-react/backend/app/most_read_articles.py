@@ -0,0 +1,539 @@
+import asyncio
+from collections import namedtuple
+from datetime import datetime
+from flask import Flask
+import hashlib
+import math
+from typing import Coroutine, Iterator
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+
+from shared.content_encoding import (
+    IDENTITY_ENCODING,
+    available_content_encodings,
+    encode_content,
+)
+from shared.memory_cache import BoundedLRUCache
+from shared.wiki_api import (
+    InvalidPaginationError,
+    MostReadArticlesRanking,
+    WikiAPI,
+    WikiAPIError,
+    is_final_views_date,
+    iter_most_read_articles_records,
+)
+
+# `/most_read_articles` response formats
+JSON_FORMAT = "json"
+NDJSON_FORMAT = "ndjson"
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Estimated JSON bytes of a ranked article without its view history, and of each view history entry,
+# accounting memoized rankings against the result cache budget without serializing them.
+ESTIMATED_ARTICLE_BYTES = 120
+ESTIMATED_VIEW_HISTORY_ENTRY_BYTES = 40
+
+# HTTP response independent of the web framework, `body` is either bytes or an iterator of bytes chunks (streamed).
+EndpointResponse = namedtuple("EndpointResponse", ["status_code", "headers", "body"])
+
+# Parsed `/most_read_articles` request awaiting the rankings of its languages missing from `rankings`,
+# the memoized ones, and the cached response validators of its languages (`validators`), see `MostReadArticlesEndpoint.prepare`.
+MostReadArticlesQuery = namedtuple(
+    "MostReadArticlesQuery",
+    [
+        "lang_codes",
+        "multi_language",
+        "start",
+        "end",
+        "response_format",
+        "results_limit",
+        "offset",
+        "headers",
+        "rankings",
+        "validators",
+    ],
+)
+
+
+class MostReadArticlesEndpoint:
+    """
+    This is the `/most_read_articles` route handler, independent of the web framework, shared by the Flask app
+    (see `create_app`) and the ASGI app (see `app.asgi`) so that both serve the same responses.
+
+    Note:
+        `prepare` answers request errors and memoized results right away, without awaiting anything.
+        Other requests await their rankings in `respond`, on the event loop of the `WikiAPI` client:
+        the Flask app's event loop thread, or the ASGI server's event loop, then serialize their response
+        on a worker thread. `prepare` runs on the calling thread: a Flask worker thread, or a worker thread
+        of the ASGI app.
+        A list of languages (e.g. `lang_code=en,es` or `lang_code=en&lang_code=es`) returns
+        a `fetch_most_read_articles_multi` result, and each language's ranking is memoized separately,
+        so that only the languages missing from the result cache are fetched.
+        The ETag of a JSON response is derived from the query and the validators of its cached days
+        (see `WikiAPI.get_cached_response_validators`), so that `If-None-Match` requests are answered
+        with a single cache lookup, without aggregating the result again (e.g. after a restart).
+        Rankings are fetched `offset + limit` deep, so a first page only ranks its top articles (partial sort),
+        and a memoized ranking serves any page within its depth.
+    """
+
+    def __init__(
+        self, app: Flask, wiki_api: WikiAPI, result_cache: BoundedLRUCache
+    ) -> None:
+        """
+        Args:
+            app: Flask app providing the config and the JSON provider.
+            wiki_api: Wiki API client fetching the rankings.
+            result_cache: Memoized endpoint responses: {(lang_codes, start, end, results_limit, offset): (JSON bytes, ETag, TTL)},
+                their compressed bytes: {(ETag, content coding): bytes}
+                and date range rankings paginated by the responses with their validators:
+                {(lang_code, start, end): (MostReadArticlesRanking, validators)},
+                replaced by deeper rankings of later pages.
+        """
+        self.app = app
+        self.wiki_api = wiki_api
+        self.result_cache = result_cache
+
+    def prepare(
+        self, args: MultiDict, headers: Headers
+    ) -> tuple[MostReadArticlesQuery, EndpointResponse]:
+        """Parses a request's query parameters and headers.
+
+        Returns:
+            Tuple (`query`, `response`), either the `response` is ready or the `query` should be passed to `respond`.
+        """
+        response_format = args.get("format", JSON_FORMAT)
+        if response_format not in (JSON_FORMAT, NDJSON_FORMAT):
+            return (
+                None,
+                self._request_error_response(
+                    f"Unsupported format, expected '{JSON_FORMAT}' or '{NDJSON_FORMAT}'."
+                ),
+            )
+        try:
+            results_limit, offset = _parse_pagination_args(args)
+        except WikiAPIError as e:
+            return (None, self._request_error_response(str(e)))
+
+        lang_codes = _parse_lang_codes(args)
+        max_lang_codes = self.app.config["MAX_LANG_CODES"]
+        if len(lang_codes) > max_lang_codes:
+            return (
+                None,
+                self._request_error_response(
+                    f"Too many languages, expected at most {max_lang_codes}."
+                ),
+            )
+        query = MostReadArticlesQuery(
+            lang_codes=lang_codes,
+            # Repeated languages keep the single language response.
+            multi_language=len(set(lang_codes)) > 1,
+            start=args.get("start", ""),
+            end=args.get("end", ""),
+            response_format=response_format,
+            results_limit=results_limit,
+            offset=offset,
+            headers=headers,
+            rankings={},
+            validators={},
+        )
+
+        # NDJSON responses are streamed, so only JSON responses are memoized along with their ETag,
+        # which answers `If-None-Match` requests without serializing the result again.
+        if response_format == JSON_FORMAT:
+            memoized_response = self.result_cache.get(self._result_cache_key(query))
+            if memoized_response is not None:
+                json_response, etag, ttl = memoized_response
+                return (
+                    None,
+                    self._conditional_json_response(
+                        query, json_response, 200, etag, ttl
+                    ),
+                )
+
+        # Pages of a date range within the depth of the memoized rankings of its languages are served from them.
+        for lang_code in dict.fromkeys(lang_codes):
+            memoized_ranking = self.result_cache.get(
+                self._ranking_cache_key(query, lang_code)
+            )
+            if memoized_ranking is None:
+                continue
+            ranking, validators = memoized_ranking
+            if _ranking_covers_page(ranking, results_limit, offset):
+                query.rankings[lang_code] = ranking
+                if validators is not None:
+                    query.validators[lang_code] = validators
+        if len(query.rankings) == len(set(lang_codes)):
+            return (None, self._rankings_response(query, query.rankings, []))
+        return (query, None)
+
+    async def respond(self, query: MostReadArticlesQuery) -> EndpointResponse:
+        """Awaits the rankings missing from a prepared query and returns its response."""
+        missing_lang_codes = [
+            lang_code
+            for lang_code in dict.fromkeys(query.lang_codes)
+            if lang_code not in query.rankings
+        ]
+        if query.response_format == JSON_FORMAT and "If-None-Match" in query.headers:
+            not_modified_response = await self._not_modified_response(
+                query, missing_lang_codes
+            )
+            if not_modified_response:
+                return not_modified_response
+
+        rankings = await run_timed_task(
+            coro=self.wiki_api.fetch_most_read_articles_rankings(
+                missing_lang_codes,
+                query.start,
+                query.end,
+                ranking_depth=query.offset + query.results_limit,
+                deadline_secs=self.app.config["WIKI_API_RETRY_DEADLINE_SECS"],
+            ),
+            timeout=self.app.config["SERVER_TIMEOUT_SECS"],
+        )
+        # Language codes can't contain "_", so this is a `run_timed_task` request error.
+        if "request_error" in rankings:
+            return self._rankings_response(query, rankings, [])
+        await self._get_validators(query, missing_lang_codes)
+        # Serialization and compression of large results run on a worker thread, not on the event loop.
+        return await asyncio.to_thread(
+            self._rankings_response,
+            query,
+            {**query.rankings, **rankings},
+            missing_lang_codes,
+        )
+
+    def _rankings_response(
+        self,
+        query: MostReadArticlesQuery,
+        rankings: dict[str, MostReadArticlesRanking] | dict[str, str],
+        new_lang_codes: list[str],
+    ) -> EndpointResponse:
+        recent_ttl = self.app.config["RESULT_CACHE_RECENT_TTL_SECS"]
+        if "request_error" in rankings:
+            # `run_timed_task` request error
+            result = rankings
+        elif query.multi_language:
+            result = self.wiki_api.paginate_most_read_articles_multi(
+                {lang_code: rankings[lang_code] for lang_code in query.lang_codes},
+                query.results_limit,
+                query.offset,
+            )
+        else:
+            result = self.wiki_api.paginate_most_read_articles(
+                rankings[query.lang_codes[0]], query.results_limit, query.offset
+            )
+
+        # Rankings without errors are memoized even if other languages of the result have errors.
+        for lang_code in new_lang_codes:
+            ranking = rankings[lang_code]
+            ranking_ttl = _ranking_cache_ttl(ranking, query.end, recent_ttl)
+            if ranking_ttl is not None:
+                # Structure: (MostReadArticlesRanking, validators)
+                self.result_cache.put(
+                    self._ranking_cache_key(query, lang_code),
+                    (ranking, query.validators.get(lang_code)),
+                    _estimated_ranking_size(ranking),
+                    ranking_ttl,
+                )
+
+        status_code = 200 if not "request_error" in result else 400
+        ttl = _result_cache_ttl(result, query.end, recent_ttl)
+
+        if query.response_format == NDJSON_FORMAT:
+            return EndpointResponse(
+                status_code,
+                [
+                    ("Content-Type", NDJSON_MIMETYPE),
+                    ("Cache-Control", _cache_control(self.app.config, ttl)),
+                ],
+                _iter_ndjson_lines(self.app, result),
+            )
+
+        json_response = self.app.json.dumps_bytes(result)
+        etag = None
+        if ttl is not None:
+            etag = self._query_etag(query) or _json_etag(json_response)
+            # Structure: (JSON bytes, ETag, TTL)
+            self.result_cache.put(
+                self._result_cache_key(query),
+                (json_response, etag, ttl),
+                len(json_response),
+                ttl,
+            )
+
+        return self._conditional_json_response(
+            query, json_response, status_code, etag, ttl
+        )
+
+    def _conditional_json_response(
+        self,
+        query: MostReadArticlesQuery,
+        json_response: bytes,
+        status_code: int,
+        etag: str,
+        ttl: float,
+    ) -> EndpointResponse:
+        """Returns a JSON response with its HTTP caching headers, compressed with the preferred content coding
+        accepted by the client (`Accept-Encoding`), or an empty 304 response if the request's `If-None-Match`
+        header matches its ETag.
+
+        Note:
+            Each content coding is a different representation, with its own strong ETag (e.g. "<hash>-gzip").
+            Compressed bodies of memoized results (with an `etag`) are memoized in `result_cache` as well,
+            so that hot queries are only compressed once per content coding.
+        """
+        encoding = IDENTITY_ENCODING
+        min_bytes = self.app.config["HTTP_COMPRESSION_MIN_BYTES"]
+        if min_bytes is not None and len(json_response) >= min_bytes:
+            encoding = parse_accept_header(
+                query.headers.get("Accept-Encoding")
+            ).best_match(available_content_encodings(), default=IDENTITY_ENCODING)
+        if etag and encoding != IDENTITY_ENCODING:
+            etag = f"{etag}-{encoding}"
+
+        headers = []
+        if etag and parse_etags(query.headers.get("If-None-Match")).contains_weak(etag):
+            status_code, body = 304, b""
+        elif encoding != IDENTITY_ENCODING:
+            body = self._encode_json_response(json_response, encoding, etag, ttl)
+            headers += [
+                ("Content-Type", self.app.json.mimetype),
+                ("Content-Encoding", encoding),
+            ]
+        else:
+            body = json_response
+            headers.append(("Content-Type", self.app.json.mimetype))
+
+        if etag:
+            headers.append(("ETag", quote_etag(etag)))
+        headers += [
+            ("Cache-Control", _cache_control(self.app.config, ttl)),
+            ("Vary", "Accept-Encoding"),
+        ]
+        return EndpointResponse(status_code, headers, body)
+
+    async def _get_validators(
+        self, query: MostReadArticlesQuery, lang_codes: list[str]
+    ):
+        """Looks up the cached response validators of `lang_codes` into `query.validators`."""
+        if not lang_codes:
+            return
+        validators = await run_timed_task(
+            coro=self.wiki_api.get_cached_response_validators(
+                lang_codes, query.start, query.end
+            ),
+            timeout=self.app.config["SERVER_TIMEOUT_SECS"],
+        )
+        # Request errors are left to the rankings fetch.
+        if "request_error" not in validators:
+            query.validators.update(validators)
+
+    async def _not_modified_response(
+        self, query: MostReadArticlesQuery, missing_lang_codes: list[str]
+    ) -> EndpointResponse:
+        """Returns a 304 response if the query's ETag, derived from the validators of its cached days,
+        matches `If-None-Match`, otherwise None.
+        """
+        await self._get_validators(query, missing_lang_codes)
+        etag = self._query_etag(query)
+        if etag is None:
+            return None
+
+        # The content coding of the response isn't known without its length, so both ETags match.
+        encoding = parse_accept_header(query.headers.get("Accept-Encoding")).best_match(
+            available_content_encodings(), default=IDENTITY_ENCODING
+        )
+        if_none_match = parse_etags(query.headers.get("If-None-Match"))
+        for candidate_etag in (f"{etag}-{encoding}", etag):
+            if if_none_match.contains_weak(candidate_etag):
+                # Fully cached days have no URL errors.
+                ttl = _result_cache_ttl(
+                    {"errors": []},
+                    query.end,
+                    self.app.config["RESULT_CACHE_RECENT_TTL_SECS"],
+                )
+                return EndpointResponse(
+                    304,
+                    [
+                        ("ETag", quote_etag(candidate_etag)),
+                        ("Cache-Control", _cache_control(self.app.config, ttl)),
+                        ("Vary", "Accept-Encoding"),
+                    ],
+                    b"",
+                )
+        return None
+
+    def _query_etag(self, query: MostReadArticlesQuery) -> str:
+        """Returns a strong ETag of a query's JSON response, i.e. a hash of the query and the validators
+        of its cached days, or None if some of its days aren't cached.
+        """
+        lang_codes = list(dict.fromkeys(query.lang_codes))
+        if not all(lang_code in query.validators for lang_code in lang_codes):
+            return None
+        validated_query = (
+            self._result_cache_key(query),
+            [query.validators[lang_code] for lang_code in lang_codes],
+        )
+        return hashlib.blake2b(
+            repr(validated_query).encode(), digest_size=16
+        ).hexdigest()
+
+    def _encode_json_response(
+        self, json_response: bytes, encoding: str, etag: str, ttl: float
+    ) -> bytes:
+        """Compresses a JSON response, memoizing the compressed bytes of memoized results by ETag
+        for as long as the result.
+        """
+        if etag is None:
+            return encode_content(json_response, encoding)
+
+        # Structure: {(ETag, content coding): compressed bytes}, the ETag identifies the uncompressed bytes.
+        encoded_cache_key = (etag, encoding)
+        encoded_response = self.result_cache.get(encoded_cache_key)
+        if encoded_response is None:
+            encoded_response = encode_content(json_response, encoding)
+            self.result_cache.put(
+                encoded_cache_key, encoded_response, len(encoded_response), ttl
+            )
+        return encoded_response
+
+    def _request_error_response(self, message: str) -> EndpointResponse:
+        return EndpointResponse(
+            400,
+            [("Content-Type", self.app.json.mimetype)],
+            self.app.json.dumps_bytes(_json_format_error(message)),
+        )
+
+    def _result_cache_key(
+        self, query: MostReadArticlesQuery
+    ) -> tuple[tuple[str, ...], str, str, int, int]:
+        return (
+            query.lang_codes,
+            query.start,
+            query.end,
+            query.results_limit,
+            query.offset,
+        )
+
+    def _ranking_cache_key(
+        self, query: MostReadArticlesQuery, lang_code: str
+    ) -> tuple[str, str, str]:
+        return (lang_code, query.start, query.end)
+
+
+async def run_timed_task(coro: Coroutine, timeout: int) -> dict[str, any]:
+    """This function stops running `coro` after `timeout` and reports any error message."""
+    try:
+        async with asyncio.timeout(timeout):
+            return await coro
+    except TimeoutError:
+        return _json_format_error("The server took too long to complete the task.")
+    except Exception as e:
+        return _json_format_error(str(e))
+
+
+def _result_cache_ttl(result: dict[str, any], end: str, recent_ttl: float) -> float:
+    """Returns the seconds to memoize a `fetch_most_read_articles` result, or None if it shouldn't be.
+
+    Note:
+        Results with request or URL errors are not memoized as these could be transient,
+        while results of date ranges ending before yesterday never change.
+    """
+    if "request_error" in result or any(error["url"] for error in result["errors"]):
+        return None
+    if is_final_views_date(datetime.strptime(end, "%Y-%m-%d")):
+        return math.inf
+    return recent_ttl
+
+
+def _ranking_cache_ttl(
+    ranking: MostReadArticlesRanking, end: str, recent_ttl: float
+) -> float:
+    """Returns the seconds to memoize a date range ranking, or None if it has URL errors, see `_result_cache_ttl`."""
+    return _result_cache_ttl({"errors": ranking.errors}, end, recent_ttl)
+
+
+def _ranking_covers_page(
+    ranking: MostReadArticlesRanking, results_limit: int, offset: int
+) -> bool:
+    """Checks whether a ranking is deep enough to paginate a page, i.e. it has the page's articles or all articles."""
+    return (
+        len(ranking.articles) >= offset + results_limit
+        or len(ranking.articles) == ranking.total_articles
+    )
+
+
+def _estimated_ranking_size(ranking: MostReadArticlesRanking) -> int:
+    """Estimates the JSON bytes of a ranking's articles from their count and their view history entries."""
+    view_history_entries = sum(
+        len(article["view_history"]) for article in ranking.articles
+    )
+    return (
+        len(ranking.articles) * ESTIMATED_ARTICLE_BYTES
+        + view_history_entries * ESTIMATED_VIEW_HISTORY_ENTRY_BYTES
+    )
+
+
+def _json_etag(json_response: bytes) -> str:
+    """Returns a strong ETag of a JSON response, i.e. a hash of its bytes, for results whose days
+    aren't all cached (see `MostReadArticlesEndpoint._query_etag`).
+    """
+    return hashlib.blake2b(json_response, digest_size=16).hexdigest()
+
+
+def _cache_control(config: dict[str, any], ttl: float) -> str:
+    """Returns the `Cache-Control` header of a `/most_read_articles` result memoized for `ttl` seconds.
+
+    Note:
+        Date ranges ending before yesterday never change and get a long `max-age`, ranges including
+        recent days get a short one, and results that aren't memoized (e.g. with errors) aren't cached.
+    """
+    if ttl is None:
+        return "no-store"
+    if ttl == math.inf:
+        return f"public, max-age={config['HTTP_CACHE_FINAL_MAX_AGE_SECS']}"
+    return f"public, max-age={config['HTTP_CACHE_RECENT_MAX_AGE_SECS']}"
+
+
+def _parse_lang_codes(args: MultiDict) -> tuple[str, ...]:
+    """Parses the `lang_code` query parameters, either repeated or comma separated (e.g. "en,es,de")."""
+    return tuple(
+        lang_code
+        for value in args.getlist("lang_code") or [""]
+        for lang_code in value.split(",")
+    )
+
+
+def _parse_pagination_args(args: MultiDict) -> tuple[int, int]:
+    """Parses the `limit` and `offset` query parameters, defaulting to the articles from `offset`
+    up to the `MAX_RESPONSE_RESULTS` top ranked ones.
+
+    Raises:
+        InvalidPaginationError: If the parameters are not integers or out of range.
+    """
+    try:
+        offset = int(args.get("offset", 0))
+        results_limit = int(
+            args.get("limit", WikiAPI.MAX_RESPONSE_RESULTS - max(offset, 0))
+        )
+    except ValueError:
+        raise InvalidPaginationError
+    WikiAPI.validate_pagination(results_limit, offset)
+    return (results_limit, offset)
+
+
+def _iter_ndjson_lines(app: Flask, result: dict[str, any]) -> Iterator[bytes]:
+    """Serializes a `fetch_most_read_articles` result as newline delimited JSON, one record per line.
+
+    Note:
+        Request errors are sent as a single record: `{request_error: ...}`
+    """
+    if "request_error" in result:
+        yield app.json.dumps_bytes(result) + b"\n"
+        return
+    for record in iter_most_read_articles_records(result):
+        yield app.json.dumps_bytes(record) + b"\n"
+
+
+def _json_format_error(message: str) -> dict[str, str]:
+    return {"request_error": message}
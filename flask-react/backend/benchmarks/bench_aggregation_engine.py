@@ -0,0 +1,119 @@
+"""Benchmarks the most read articles aggregation engines on multi-year date ranges.
+
+Usage:
+    python benchmarks/bench_aggregation_engine.py [--days 1095] [--pages 20000] [--limit 5000] [--repeat 3]
+
+Note:
+    Both engines reduce the same synthetic "mostread" projections (as stored by the response cache),
+    and their results are checked to be identical. Peak memory is measured with `tracemalloc`.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import shared.columnar_aggregation as columnar_aggregation
+import shared.json_codec as json_codec
+import shared.wiki_api as wiki_api
+
+
+def synthetic_projected_featured_content(
+    rnd: random.Random, views_date: datetime, total_pages: int
+) -> str:
+    """Builds a "mostread" projection of a Featured Content response."""
+    return json_codec.default_json_codec.dumps(
+        {
+            "mostread": {
+                "date": views_date.strftime("%Y-%m-%dZ"),
+                "articles": [
+                    {
+                        "pageid": pageid,
+                        "views": rnd.randint(10_000, 500_000),
+                        "content_urls": {
+                            "desktop": {
+                                "page": f"https://en.wikipedia.org/wiki/Article_{pageid}"
+                            }
+                        },
+                    }
+                    for pageid in rnd.sample(range(1, total_pages), k=50)
+                ],
+            }
+        }
+    ).decode()
+
+
+def bench_engine(
+    engine: str, responses: list[str], results_limit: int, repeat: int
+) -> tuple[dict[str, float], list]:
+    api = wiki_api.WikiAPI(aggregation_engine=engine)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = api._reduce_and_sort_featured_content_most_read_articles(
+            responses, results_limit
+        )
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    api._reduce_and_sort_featured_content_most_read_articles(responses, results_limit)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ({"time": min(timings), "peak_memory": peak_memory}, result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=3 * 365)
+    parser.add_argument("--pages", type=int, default=20_000)
+    parser.add_argument(
+        "--limit", type=int, default=wiki_api.WikiAPI.MAX_RESPONSE_RESULTS
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    start_date = datetime(2021, 1, 1)
+    responses = [
+        synthetic_projected_featured_content(
+            rnd, start_date + timedelta(days=day), args.pages
+        )
+        for day in range(args.days)
+    ]
+
+    print(
+        f"==> {args.days} days, up to {args.pages} distinct pages, top {args.limit},"
+        f" best of {args.repeat} (NumPy {'installed' if columnar_aggregation.np else 'not installed'})"
+    )
+
+    results = {}
+    for engine in (
+        wiki_api.DICT_AGGREGATION_ENGINE,
+        wiki_api.COLUMNAR_AGGREGATION_ENGINE,
+    ):
+        stats, results[engine] = bench_engine(
+            engine, responses, args.limit, args.repeat
+        )
+        print(
+            f"{engine:>9}: time={stats['time'] * 1000:.1f}ms"
+            f" peak_memory={stats['peak_memory'] / 1024 / 1024:.1f}MB"
+        )
+
+    identical = (
+        results[wiki_api.DICT_AGGREGATION_ENGINE]
+        == results[wiki_api.COLUMNAR_AGGREGATION_ENGINE]
+    )
+    print(f"Identical results: {identical}")
+
+
+if __name__ == "__main__":
+    main()
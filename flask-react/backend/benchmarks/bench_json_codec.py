@@ -0,0 +1,149 @@
+"""Benchmarks the JSON codecs on the hot JSON path of a year-long `/most_read_articles` range.
+
+Usage:
+    python benchmarks/bench_json_codec.py [--days 365] [--repeat 5] [--projected]
+
+Note:
+    Each run validates and reduces synthetic Feed API Featured Content responses (parsing each
+    response twice, as `WikiAPI` does) and serializes the result as the endpoint does.
+    `--projected` benchmarks the smaller "mostread" projections stored by the response cache.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import shared.json_codec as json_codec
+import shared.wiki_api as wiki_api
+
+
+def synthetic_featured_content(rnd: random.Random, views_date: datetime) -> dict:
+    """Builds a Featured Content response similar in shape and size to the Feed API ones."""
+
+    def page_summary(pageid: int) -> dict:
+        title = f"Article_{pageid}"
+        return {
+            "pageid": pageid,
+            "title": title,
+            "views": rnd.randint(10_000, 500_000),
+            "rank": rnd.randint(1, 50),
+            "description": "Synthetic article description",
+            "extract": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+            "thumbnail": {
+                "source": f"https://upload.wikimedia.org/{title}.jpg",
+                "width": 320,
+                "height": 213,
+            },
+            "content_urls": {
+                "desktop": {"page": f"https://en.wikipedia.org/wiki/{title}"},
+                "mobile": {"page": f"https://en.m.wikipedia.org/wiki/{title}"},
+            },
+        }
+
+    return {
+        "tfa": page_summary(rnd.randint(1, 10_000_000)),
+        "mostread": {
+            "date": views_date.strftime("%Y-%m-%dZ"),
+            "articles": [
+                page_summary(pageid)
+                for pageid in rnd.sample(range(1, 2_000), k=rnd.randint(45, 50))
+            ],
+        },
+        "news": [
+            {"story": "Synthetic news story. " * 10, "links": [page_summary(1)]}
+            for _ in range(5)
+        ],
+        "onthisday": [
+            {"text": "Synthetic event.", "year": 1900 + i, "pages": [page_summary(i)]}
+            for i in range(10)
+        ],
+    }
+
+
+def bench_codec(
+    codec: json_codec.JSONCodec, responses: list[wiki_api.WikiAPIResponse], repeat: int
+) -> dict[str, float]:
+    # `shared.wiki_api` module functions use the default codec.
+    wiki_api.default_json_codec = codec
+    api = wiki_api.WikiAPI()
+
+    timings = {"reduce": [], "serialize": []}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        valid_responses = [
+            wiki_resp.text
+            for wiki_resp in responses
+            if api._validate_featured_content_mostread_response(wiki_resp)
+        ]
+        result = api.paginate_most_read_articles(
+            wiki_api.MostReadArticlesRanking(
+                *api._reduce_and_sort_featured_content_most_read_articles(
+                    valid_responses, wiki_api.WikiAPI.MAX_RESPONSE_RESULTS
+                ),
+                [],
+            ),
+            wiki_api.WikiAPI.MAX_RESPONSE_RESULTS,
+        )
+        timings["reduce"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        codec.dumps(result, sort_keys=True)
+        timings["serialize"].append(time.perf_counter() - start)
+
+    return {key: min(values) for key, values in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--projected", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    stdlib_codec = json_codec.JSONCodec()
+    start_date = datetime(2023, 1, 1)
+    responses = []
+    for day in range(args.days):
+        views_date = start_date + timedelta(days=day)
+        text = stdlib_codec.dumps(synthetic_featured_content(rnd, views_date)).decode()
+        if args.projected:
+            text = wiki_api.project_featured_content_most_read_articles(text)
+        url = (
+            f"https://en.wikipedia.org/api/rest_v1/feed/featured/{views_date:%Y/%m/%d}"
+        )
+        responses.append(wiki_api.WikiAPIResponse(url, True, text, None))
+
+    total_mb = sum(len(wiki_resp.text) for wiki_resp in responses) / 1024 / 1024
+    print(
+        f"==> {args.days} days, {total_mb:.1f} MB of"
+        f" {'projected' if args.projected else 'full'} responses, best of {args.repeat}"
+    )
+
+    codec_names = [json_codec.JSONCodec.name]
+    if json_codec.orjson:
+        codec_names.append(json_codec.OrjsonCodec.name)
+    else:
+        print("orjson is not installed, only benchmarking the standard library json.")
+
+    baseline = None
+    for name in codec_names:
+        result = bench_codec(json_codec.create_json_codec(name), responses, args.repeat)
+        total = result["reduce"] + result["serialize"]
+        baseline = baseline or total
+        print(
+            f"{name:>8}: reduce={result['reduce'] * 1000:.1f}ms"
+            f" serialize={result['serialize'] * 1000:.1f}ms"
+            f" total={total * 1000:.1f}ms speedup={baseline / total:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
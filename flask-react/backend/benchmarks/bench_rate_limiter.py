@@ -0,0 +1,104 @@
+"""Benchmarks the `AsyncIORateLimiter` schedulers with simulated API requests.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py [--tasks 300] [--max-per-sec 100] [--burst-size 10]
+        [--min-latency 0.05] [--max-latency 0.3]
+
+Note:
+    A token bucket may start up to `max_per_sec + burst_size` tasks within a 1-second window,
+    the app takes the burst size from the refill rate to stay within the Wikipedia API rate limit.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from shared.asyncio_rate_limiter import (
+    AsyncIORateLimiter,
+    CYCLE_SCHEDULER,
+    TOKEN_BUCKET_SCHEDULER,
+)
+
+
+async def simulated_request(latency: float) -> float:
+    """Simulates an API request and returns its start time."""
+    start_time = asyncio.get_running_loop().time()
+    await asyncio.sleep(latency)
+    return start_time
+
+
+async def bench_scheduler(
+    scheduler: str,
+    total_tasks: int,
+    max_per_sec: int,
+    burst_size: int,
+    latency_range: tuple[float, float],
+    seed: int,
+) -> dict[str, float]:
+    rnd = random.Random(seed)
+    rate_limiter = AsyncIORateLimiter(
+        max_tasks_per_second=max_per_sec, scheduler=scheduler, burst_size=burst_size
+    )
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    start_times = await rate_limiter.run_rate_limited_tasks(
+        coros=[
+            simulated_request(rnd.uniform(*latency_range)) for _ in range(total_tasks)
+        ]
+    )
+    total_time = loop.time() - start
+
+    # Max tasks started in any sliding 1-second window, to check the rate limit is respected.
+    start_times.sort()
+    max_per_window = max(
+        sum(1 for t in start_times if s <= t < s + 1) for s in start_times
+    )
+    start_gaps = [b - a for a, b in zip(start_times, start_times[1:])] or [0]
+    return {
+        "total_time": total_time,
+        "achieved_rate": total_tasks / total_time,
+        "max_per_1s_window": max_per_window,
+        "start_gap_stdev": statistics.pstdev(start_gaps),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=300)
+    parser.add_argument("--max-per-sec", type=int, default=100)
+    parser.add_argument("--burst-size", type=int, default=10)
+    parser.add_argument("--min-latency", type=float, default=0.05)
+    parser.add_argument("--max-latency", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"==> {args.tasks} tasks ({args.min_latency}-{args.max_latency}s latency),"
+        f" max {args.max_per_sec} tasks/sec, burst size {args.burst_size}"
+    )
+    for scheduler in (CYCLE_SCHEDULER, TOKEN_BUCKET_SCHEDULER):
+        result = await bench_scheduler(
+            scheduler,
+            args.tasks,
+            args.max_per_sec,
+            args.burst_size,
+            (args.min_latency, args.max_latency),
+            args.seed,
+        )
+        print(
+            f"{scheduler:>12}: total_time={result['total_time']:.2f}s"
+            f" achieved_rate={result['achieved_rate']:.1f}/s"
+            f" max_per_1s_window={result['max_per_1s_window']}"
+            f" start_gap_stdev={result['start_gap_stdev'] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
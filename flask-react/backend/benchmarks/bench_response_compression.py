@@ -0,0 +1,105 @@
+"""Benchmarks the bytes on the wire and CPU per request of each content coding of a year-long `/most_read_articles` response.
+
+Usage:
+    python benchmarks/bench_response_compression.py [--days 365] [--requests 20]
+
+Note:
+    The response is serialized from synthetic Feed API Featured Content responses as the endpoint does.
+    "on the fly" compresses the response on every request, while "memoized" amortizes a single
+    compression over all requests, as the endpoint serves the memoized bytes of memoized results.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_json_codec import synthetic_featured_content
+import shared.content_encoding as content_encoding
+from shared.json_codec import default_json_codec
+import shared.wiki_api as wiki_api
+
+
+def year_long_json_response(days: int, seed: int) -> bytes:
+    rnd = random.Random(seed)
+    start_date = datetime(2023, 1, 1)
+    featured_content_responses = [
+        default_json_codec.dumps(
+            synthetic_featured_content(rnd, start_date + timedelta(days=day))
+        )
+        for day in range(days)
+    ]
+    api = wiki_api.WikiAPI()
+    ranking = wiki_api.MostReadArticlesRanking(
+        *api._reduce_and_sort_featured_content_most_read_articles(
+            featured_content_responses, wiki_api.WikiAPI.MAX_RESPONSE_RESULTS
+        ),
+        [],
+    )
+    result = api.paginate_most_read_articles(
+        ranking, wiki_api.WikiAPI.MAX_RESPONSE_RESULTS
+    )
+    return default_json_codec.dumps(result)
+
+
+def bench_encoding(
+    json_response: bytes, encoding: str, requests: int
+) -> dict[str, float]:
+    # CPU time of the server per request, compressing on every request.
+    start = time.process_time()
+    for _ in range(requests):
+        encoded_response = content_encoding.encode_content(json_response, encoding)
+    on_the_fly_secs = (time.process_time() - start) / requests
+
+    # Memoized bytes are compressed once, whatever the number of requests.
+    memoized_secs = on_the_fly_secs / requests
+
+    # CPU time of the client per request.
+    start = time.process_time()
+    for _ in range(requests):
+        content_encoding.decode_content(encoded_response, encoding)
+    decode_secs = (time.process_time() - start) / requests
+
+    return {
+        "wire_bytes": len(encoded_response),
+        "on_the_fly_ms": on_the_fly_secs * 1000,
+        "memoized_ms": memoized_secs * 1000,
+        "decode_ms": decode_secs * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    json_response = year_long_json_response(args.days, args.seed)
+    print(
+        f"==> {args.days} days, {len(json_response) / 1024 / 1024:.2f} MB JSON response,"
+        f" {args.requests} requests"
+    )
+    if not content_encoding.brotli:
+        print("brotli is not installed, only benchmarking gzip.")
+
+    encodings = [content_encoding.IDENTITY_ENCODING] + list(
+        reversed(content_encoding.available_content_encodings())
+    )
+    for encoding in encodings:
+        stats = bench_encoding(json_response, encoding, args.requests)
+        print(
+            f"{encoding:>8}: wire={stats['wire_bytes'] / 1024:.0f}KB"
+            f" ratio={len(json_response) / stats['wire_bytes']:.1f}x"
+            f" cpu_per_request: on_the_fly={stats['on_the_fly_ms']:.2f}ms"
+            f" memoized={stats['memoized_ms']:.2f}ms decode={stats['decode_ms']:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
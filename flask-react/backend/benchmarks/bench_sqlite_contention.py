@@ -0,0 +1,140 @@
+"""Benchmarks reader and writer contention on the SQLite response cache with each storage profile.
+
+Usage:
+    python benchmarks/bench_sqlite_contention.py [--readers 8] [--writers 4] [--duration 5] [--rows 2000]
+
+Note:
+    Reader threads get random batches of cached responses while writer threads put one response at a time,
+    as `ResponseCache.put` does, on a temporary db with the default `Config` and the `ProductionConfig`
+    (WAL, pragmas, pool sizing and group commit).
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app, create_response_cache, ResponseCache
+from app.config import Config, ProductionConfig
+from app.extensions import db
+from shared.wiki_api import WikiAPIResponse
+
+
+def synthetic_response(url: str) -> WikiAPIResponse:
+    text = json.dumps(
+        {"url": url, "articles": [{"pageid": i, "views": i * 31} for i in range(200)]}
+    )
+    return WikiAPIResponse(url, True, text, None)
+
+
+def run_threads(
+    cache, urls: list[str], readers: int, writers: int, duration: float
+) -> dict[str, list]:
+    stop = Event()
+    # Structure: {"read": [latency, ...], "write": [latency, ...], "errors": [message, ...]}
+    results = {"read": [], "write": [], "errors": []}
+
+    def reader(rnd: random.Random):
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                cache.multi_get(rnd.sample(urls, 10))
+                results["read"].append(time.perf_counter() - start)
+            except Exception as e:
+                results["errors"].append(str(e))
+
+    def writer(writer_index: int):
+        write_index = 0
+        while not stop.is_set():
+            url = f"https://en.wikipedia.org/new/{writer_index}/{write_index}"
+            write_index += 1
+            start = time.perf_counter()
+            try:
+                cache.put(synthetic_response(url))
+                results["write"].append(time.perf_counter() - start)
+            except Exception as e:
+                results["errors"].append(str(e))
+
+    threads = [Thread(target=reader, args=(random.Random(i),)) for i in range(readers)]
+    threads += [Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile_ms(latencies: list[float], percentile: int) -> float:
+    if len(latencies) < 2:
+        return latencies[0] * 1000 if latencies else 0
+    return statistics.quantiles(latencies, n=100)[percentile - 1] * 1000
+
+
+def bench_profile(config: Config, args: argparse.Namespace) -> dict[str, any]:
+    with TemporaryDirectory() as temp_dir:
+        config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(temp_dir, "app.db")
+        config.SQLALCHEMY_ECHO = False
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+
+        urls = [f"https://en.wikipedia.org/seed/{i}" for i in range(args.rows)]
+        ResponseCache(app).put_many([synthetic_response(url) for url in urls])
+
+        cache = create_response_cache(app)
+
+        results = run_threads(cache, urls, args.readers, args.writers, args.duration)
+
+        app.extensions["event_loop_thread"].stop()
+        with app.app_context():
+            db.engine.dispose()
+
+    return {
+        "reads_per_sec": len(results["read"]) / args.duration,
+        "writes_per_sec": len(results["write"]) / args.duration,
+        "read_p99_ms": percentile_ms(results["read"], 99),
+        "write_p99_ms": percentile_ms(results["write"], 99),
+        "errors": len(results["errors"]),
+        "group_commit": (
+            cache.group_committer.stats() if cache.group_committer else None
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"==> {args.readers} readers, {args.writers} writers, {args.duration}s, {args.rows} cached rows"
+    )
+    for name, config in (("default", Config()), ("production", ProductionConfig())):
+        stats = bench_profile(config, args)
+        group_commit = ""
+        if stats["group_commit"]:
+            group_commit = (
+                f" average_group_size={stats['group_commit']['average_group_size']:.1f}"
+            )
+        print(
+            f"{name:>10}: reads={stats['reads_per_sec']:.0f}/s writes={stats['writes_per_sec']:.0f}/s"
+            f" read_p99={stats['read_p99_ms']:.1f}ms write_p99={stats['write_p99_ms']:.1f}ms"
+            f" errors={stats['errors']}{group_commit}"
+        )
+
+
+if __name__ == "__main__":
+    main()
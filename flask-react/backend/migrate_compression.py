@@ -0,0 +1,178 @@
+import argparse
+from datetime import datetime
+import sys
+
+from app import create_app, ResponseCache
+from app.config import config_from_env
+from app.extensions import db
+from app.models import (
+    CachedResponse,
+    CompressionDictionary,
+    load_compression_dictionary,
+)
+from seed_db import upgrade_schema
+from shared.compression import (
+    ZSTD_CODEC,
+    compare_compression,
+    create_response_compressor,
+    train_zstd_dictionary,
+    zstandard,
+)
+
+# Zstandard's recommended dictionary size, about 100 times smaller than the training samples.
+DEFAULT_DICTIONARY_SIZE = 110 * 1024
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Recompresses the cached responses with Zstandard and a dictionary trained"
+        " from cached Featured Content responses, and reports the size and speed of each codec."
+    )
+    parser.add_argument(
+        "--train",
+        action="store_true",
+        help="Train a new dictionary, even if one was trained before.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=2000,
+        help="Random cached responses sampled to train the dictionary and compare the codecs.",
+    )
+    parser.add_argument("--dictionary-size", type=int, default=DEFAULT_DICTIONARY_SIZE)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Responses recompressed per transaction.",
+    )
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="Only report the size and speed of each codec, without recompressing.",
+    )
+    return parser.parse_args()
+
+
+def sample_featured_content_responses(total_samples: int) -> list[str]:
+    """Returns the texts of random cached Featured Content responses."""
+    cached_responses = db.session.scalars(
+        db.select(CachedResponse)
+        .where(CachedResponse.url.contains(ResponseCache.FEATURED_CONTENT_PATH))
+        .order_by(db.func.random())
+        .limit(total_samples)
+    )
+    return [cached_resp.text_response for cached_resp in cached_responses]
+
+
+def newest_compression_dictionary() -> CompressionDictionary:
+    return db.session.scalars(
+        db.select(CompressionDictionary)
+        .order_by(CompressionDictionary.created_at.desc())
+        .limit(1)
+    ).first()
+
+
+def print_compression_report(samples: list[str], dictionary: bytes):
+    total_kb = sum(len(sample.encode()) for sample in samples) / 1024
+    print(f"==> Compression of {len(samples)} sample responses ({total_kb:.0f} KB):")
+    for stats in compare_compression(samples, dictionary):
+        print(
+            f"{stats['codec']:>16}: size={stats['size'] / 1024:.0f}KB"
+            f" ratio={stats['ratio']:.1f}x compress={stats['compress_mbps']:.0f}MB/s"
+            f" decompress={stats['decompress_mbps']:.0f}MB/s"
+        )
+
+
+def recompress_cached_responses(dictionary: bytes, batch_size: int):
+    """Recompresses the responses that are not compressed with Zstandard and `dictionary` yet,
+    in a transaction per batch, so that an interrupted migration can simply run again.
+    """
+    compressor = create_response_compressor(
+        ZSTD_CODEC, dictionary_loader=load_compression_dictionary
+    )
+    dict_id = compressor.add_dictionary(dictionary)
+
+    total_recompressed = 0
+    size_before = 0
+    size_after = 0
+    last_url = ""
+    while True:
+        cached_responses = db.session.scalars(
+            db.select(CachedResponse)
+            .where(CachedResponse.url > last_url)
+            .order_by(CachedResponse.url)
+            .limit(batch_size)
+        ).all()
+        if not cached_responses:
+            break
+        last_url = cached_responses[-1].url
+
+        for cached_resp in cached_responses:
+            if (
+                compressor.dictionary_id_of(
+                    cached_resp.codec, cached_resp.compressed_response
+                )
+                == dict_id
+            ):
+                continue
+            size_before += len(cached_resp.compressed_response)
+            cached_resp.codec, cached_resp.compressed_response = compressor.compress(
+                cached_resp.text_response
+            )
+            size_after += len(cached_resp.compressed_response)
+            total_recompressed += 1
+        db.session.commit()
+        print(f"==> Recompressed {total_recompressed} responses")
+
+    saved = 1 - size_after / size_before if size_before else 0
+    print(
+        f"==> Total recompressed: {total_recompressed} responses,"
+        f" {size_before / 1024 / 1024:.1f} MB -> {size_after / 1024 / 1024:.1f} MB ({saved:.0%} smaller)"
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if zstandard is None:
+        sys.exit("zstandard is not installed: pip install zstandard")
+
+    config = config_from_env()
+    config.SQLALCHEMY_ECHO = False
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        upgrade_schema()
+
+        # Most samples train the dictionary, the rest are held out to compare the codecs.
+        samples = sample_featured_content_responses(args.samples)
+        report_samples = samples[: max(len(samples) // 5, 1)]
+        training_samples = samples[len(report_samples) :]
+
+        compression_dictionary = None if args.train else newest_compression_dictionary()
+        if compression_dictionary is None:
+            if args.report_only:
+                sys.exit("No dictionary was trained yet, run without --report-only.")
+            try:
+                dictionary = train_zstd_dictionary(
+                    training_samples, args.dictionary_size
+                )
+            except zstandard.ZstdError as e:
+                sys.exit(f"Not enough cached responses to train a dictionary: {e}")
+            compression_dictionary = CompressionDictionary(
+                dict_id=zstandard.ZstdCompressionDict(dictionary).dict_id(),
+                dictionary=dictionary,
+                created_at=datetime.now(),
+            )
+            db.session.merge(compression_dictionary)
+            db.session.commit()
+            print(
+                f"==> Trained dictionary {compression_dictionary.dict_id}"
+                f" ({len(dictionary) / 1024:.0f} KB) from {len(training_samples)} responses"
+            )
+
+        print_compression_report(report_samples, compression_dictionary.dictionary)
+        if not args.report_only:
+            recompress_cached_responses(
+                compression_dictionary.dictionary, args.batch_size
+            )
@@ -1,11 +1,14 @@
+import argparse
 from datetime import datetime
+import logging
+from sqlalchemy import inspect, text
 
-from app import create_app
-from app.config import Config
+from app import create_app, create_backfill, ResponseCache
+from app.backfill import MostReadBackfill
+from app.config import config_from_env
 from app.extensions import db
 from app.models import CachedResponse
 
-
 SEED_DATA = [
     {
         "url": "http://localhost/test",
@@ -15,6 +18,37 @@ SEED_DATA = [
 ]
 
 
+def upgrade_schema():
+    """Adds the model columns missing from tables created by previous versions of the app.
+
+    Note:
+        `db.create_all` only creates missing tables, new columns require a `server_default`
+        to be added to existing rows.
+    """
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            # Quoted literal, e.g. `DEFAULT 'zlib'` (SQLite applies the column type affinity to it).
+            default = (
+                f" DEFAULT '{column.server_default.arg}'"
+                if column.server_default
+                else ""
+            )
+            print(f"==> Adding column {table.name}.{column.name}")
+            db.session.execute(
+                text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}"
+                )
+            )
+    db.session.commit()
+
+
 def seed_data():
     for item in SEED_DATA:
         resp = CachedResponse(
@@ -23,15 +57,77 @@ def seed_data():
             created_at=item["created_at"],
         )
         print("==> Adding", resp.to_dict())
-        db.session.add(resp)
+        db.session.merge(resp)
         db.session.commit()
 
     records = db.session.execute(db.select(CachedResponse)).all()
     print("==> Total added:", len(records))
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Prepares the SQLite database, optionally backfilling the most read articles"
+        " of a date range (resuming from the last checkpoint of the same languages and range)."
+    )
+    parser.add_argument(
+        "--lang-codes",
+        type=lambda value: value.split(","),
+        help="Comma separated Wikipedia language codes to backfill, e.g. en,es,de",
+    )
+    parser.add_argument("--start", help="Start day to backfill. Format: YYYY-MM-DD")
+    parser.add_argument("--end", help="Last day to backfill. Format: YYYY-MM-DD")
+    parser.add_argument(
+        "--batch-days",
+        type=int,
+        default=MostReadBackfill.DEFAULT_BATCH_DAYS,
+        help="Days fetched per batch, each batch stored in one transaction and checkpointed.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoints, e.g. to retry failed days (cached days are still skipped).",
+    )
+    args = parser.parse_args()
+
+    if args.lang_codes:
+        if not args.start or not args.end:
+            parser.error("--start and --end are required to backfill.")
+        try:
+            args.start = datetime.strptime(args.start, "%Y-%m-%d").date()
+            args.end = datetime.strptime(args.end, "%Y-%m-%d").date()
+        except ValueError:
+            parser.error("--start and --end should be formatted as YYYY-MM-DD.")
+        if args.start > args.end:
+            parser.error("--end should not be before --start.")
+    return args
+
+
 if __name__ == "__main__":
-    app = create_app(Config())
+    args = parse_args()
+    config = config_from_env()
+    if args.lang_codes:
+        logging.basicConfig(
+            format="%(levelname)s [%(asctime)s] %(name)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+            level=logging.WARNING,
+        )
+        # Thousands of batched statements would drown the progress reports.
+        config.SQLALCHEMY_ECHO = False
+
+    app = create_app(config)
     with app.app_context():
         db.create_all()
-        seed_data()
+        upgrade_schema()
+        if not args.lang_codes:
+            seed_data()
+            total_ingested = ResponseCache().ingest_cached_responses()
+            print("==> Total ingested Featured Content responses:", total_ingested)
+
+    if args.lang_codes:
+        backfill = create_backfill(app, batch_days=args.batch_days)
+        stats = app.extensions["event_loop_thread"].run_coroutine(
+            backfill.run(args.lang_codes, args.start, args.end, restart=args.restart)
+        )
+        print(f"==> Backfilled {stats['days']} days, {stats['failed_days']} failed")
+        if stats["failed_days"]:
+            print("==> Run again with --restart to retry the failed days.")
@@ -1,24 +1,69 @@
 import asyncio
 import logging
 from threading import Lock
+import time
 from typing import Coroutine
 
 DEFAULT_MAX_TASKS_PER_SECOND = 2
 
+# Schedulers
+CYCLE_SCHEDULER = "cycle"
+TOKEN_BUCKET_SCHEDULER = "token_bucket"
+
 
 class AsyncIORateLimiter:
     """
     A thread-safe class that keeps track of a set of max running asyncio tasks
     for rate limiting purposes.
+
+    Note:
+        Two schedulers are available behind `run_rate_limited_tasks`:
+        - `CYCLE_SCHEDULER`: Starts up to `max_tasks_per_second` tasks (minus the running ones),
+          then sleeps a whole `RATE_LIMIT_WINDOW` before the next cycle.
+        - `TOKEN_BUCKET_SCHEDULER`: Starts each task as soon as a token is available, tokens are
+          refilled continuously at `max_tasks_per_second`, up to `burst_size` tokens.
+          Note that up to `max_tasks_per_second + burst_size` tasks can start within a 1-second window.
+
+        `acquire_token` rate limits requests started within running tasks (e.g. retries) with the same
+        scheduler: a token of the bucket, or a cycle slot held for a whole `RATE_LIMIT_WINDOW`.
     """
 
     RATE_LIMIT_WINDOW = 1  # seconds
 
     _lock = Lock()
 
-    def __init__(self, max_tasks_per_second: int = DEFAULT_MAX_TASKS_PER_SECOND):
+    def __init__(
+        self,
+        max_tasks_per_second: int = DEFAULT_MAX_TASKS_PER_SECOND,
+        scheduler: str = CYCLE_SCHEDULER,
+        burst_size: int = None,
+    ):
+        """
+        Args:
+            max_tasks_per_second: Maximum tasks started per second.
+            scheduler: `CYCLE_SCHEDULER` or `TOKEN_BUCKET_SCHEDULER`.
+            burst_size: Token bucket capacity, defaults to `max_tasks_per_second`.
+
+        Raises:
+            ValueError: If `scheduler` is unknown or `burst_size` is less than 1.
+        """
+        if scheduler not in (CYCLE_SCHEDULER, TOKEN_BUCKET_SCHEDULER):
+            raise ValueError(f"Unknown rate limiter scheduler: {scheduler}.")
+        if burst_size is not None and burst_size < 1:
+            raise ValueError(
+                f"burst_size requires a value of at least 1, {burst_size} was provided."
+            )
         self._max_tasks_per_second = max_tasks_per_second
-        self._running_tasks: set[asyncio.Task] = set()
+        # Running tasks, and the cycle slots held by `acquire_token` for a `RATE_LIMIT_WINDOW`.
+        self._running_tasks: set[asyncio.Task | object] = set()
+        self.scheduler = scheduler
+        self._burst_size = burst_size
+        self._tokens = float(self.burst_size)
+        self._tokens_refilled_at = time.monotonic()
+
+    @property
+    def burst_size(self) -> int:
+        return self._burst_size or self._max_tasks_per_second
 
     def overwrite_max_tasks_per_second(self, max_tasks_per_sec: int):
         """Overwrite max tasks per second window allowance.
@@ -43,8 +88,98 @@ class AsyncIORateLimiter:
         with self._lock:
             self._running_tasks.discard(task)
 
+    async def acquire_token(self, reserved_tokens: int = 0):
+        """Waits until a token bucket token (or a cycle slot) is available and takes it.
+
+        Args:
+            reserved_tokens: Tokens left available to other callers, i.e. a low-priority caller
+                only takes a token if more than `reserved_tokens` are available.
+
+        Note:
+            No lock is needed, as checking and taking a token doesn't await in between,
+            so it can't be interleaved with other coroutines.
+        """
+        if self.scheduler == CYCLE_SCHEDULER:
+            await self._acquire_cycle_slot(reserved_tokens)
+            return
+
+        while True:
+            self._refill_tokens()
+            if self._tokens >= 1 + reserved_tokens:
+                self._tokens -= 1
+                return
+            # Sleep until the next token is refilled.
+            await asyncio.sleep(
+                (1 + reserved_tokens - self._tokens) / self._max_tasks_per_second
+            )
+
+    async def _acquire_cycle_slot(self, reserved_tokens: int = 0):
+        """Waits until fewer than `max_tasks_per_second - reserved_tokens` other tasks are running
+        or holding slots, then holds a slot for a whole `RATE_LIMIT_WINDOW`, so that the cycles
+        of `_run_cycle_tasks` start fewer tasks.
+
+        Note:
+            The calling task isn't counted, so that running tasks retrying together can't wait for each other.
+        """
+        loop = asyncio.get_running_loop()
+        current_task = asyncio.current_task()
+        while True:
+            with self._lock:
+                other_slots = len(self._running_tasks) - (
+                    current_task in self._running_tasks
+                )
+                if other_slots < self._max_tasks_per_second - reserved_tokens:
+                    slot = object()
+                    self._running_tasks.add(slot)
+                    loop.call_later(
+                        self.RATE_LIMIT_WINDOW, self.discard_running_task, slot
+                    )
+                    return
+            await asyncio.sleep(self.RATE_LIMIT_WINDOW / self._max_tasks_per_second)
+
+    def _refill_tokens(self):
+        now = time.monotonic()
+        elapsed = now - self._tokens_refilled_at
+        self._tokens = min(
+            float(self.burst_size), self._tokens + elapsed * self._max_tasks_per_second
+        )
+        self._tokens_refilled_at = now
+
     async def run_rate_limited_tasks(self, coros: list[Coroutine]) -> list[any]:
-        """Rate limit a number of concurrent tasks per second.
+        """Rate limit a number of concurrent tasks per second with the configured scheduler.
+
+        Args:
+            coros: List of coroutines to run concurrently as tasks.
+
+        Returns:
+            List of tasks results.
+
+        Raises:
+            ExceptionGroup: If a task fails, it bubbles up the exception, and cancels all running tasks.
+        """
+        if self.scheduler == TOKEN_BUCKET_SCHEDULER:
+            return await self._run_token_bucket_tasks(coros)
+        return await self._run_cycle_tasks(coros)
+
+    async def _run_token_bucket_tasks(self, coros: list[Coroutine]) -> list[any]:
+        """Starts each task as soon as a token bucket token is available."""
+        scheduled_tasks: list[asyncio.Task] = []
+
+        async with asyncio.TaskGroup() as tg:
+            for coro in coros:
+                await self.acquire_token()
+                scheduled_tasks.append(tg.create_task(coro))
+
+            logging.debug(
+                "Token Bucket: Scheduled %d tasks, awaiting for task group to complete.",
+                len(scheduled_tasks),
+            )
+
+        logging.debug("All tasks successfully completed.")
+        return [task.result() for task in scheduled_tasks]
+
+    async def _run_cycle_tasks(self, coros: list[Coroutine]) -> list[any]:
+        """Rate limit a number of concurrent tasks per second in 1-second cycles.
 
         Note:
             The default 1-second rate limit window (delay per cycle) could be abstracted as an argument for greater extensibility.
@@ -112,3 +247,43 @@ class AsyncIORateLimiter:
 
         logging.debug("All tasks successfully completed.")
         return [task.result() for task in scheduled_tasks]
+
+
+class LowPriorityRateLimiter(AsyncIORateLimiter):
+    """
+    A token bucket rate limiter taking its tokens from a parent token bucket rate limiter,
+    only when more than `reserved_tokens` are available, so that low-priority tasks (e.g. background
+    prefetches) use a share of the parent's budget without delaying its other tasks.
+    """
+
+    def __init__(self, parent: AsyncIORateLimiter, reserved_tokens: int):
+        """
+        Args:
+            parent: Token bucket rate limiter whose budget is shared.
+            reserved_tokens: Parent tokens left available to higher priority tasks.
+
+        Raises:
+            ValueError: If `parent` isn't a token bucket rate limiter, or `reserved_tokens`
+                is negative or not less than the parent's `burst_size`.
+        """
+        if parent.scheduler != TOKEN_BUCKET_SCHEDULER:
+            raise ValueError(
+                "The parent rate limiter requires a token bucket scheduler."
+            )
+        if not 0 <= reserved_tokens < parent.burst_size:
+            raise ValueError(
+                f"reserved_tokens requires a value between 0 and {parent.burst_size - 1}, {reserved_tokens} was provided."
+            )
+        super().__init__(
+            max_tasks_per_second=parent._max_tasks_per_second,
+            scheduler=TOKEN_BUCKET_SCHEDULER,
+            burst_size=parent.burst_size,
+        )
+        self.parent = parent
+        self.reserved_tokens = reserved_tokens
+
+    async def acquire_token(self, reserved_tokens: int = 0):
+        """Waits until the parent has more than `self.reserved_tokens + reserved_tokens` tokens available
+        and takes one.
+        """
+        await self.parent.acquire_token(self.reserved_tokens + reserved_tokens)
@@ -0,0 +1,148 @@
+from array import array
+from datetime import datetime
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+
+class ColumnarMostReadArticlesAggregator:
+    """
+    Aggregates daily most read articles column-wise, as an alternative to one dict per article
+    holding a list of `{date, views}` dicts.
+
+    Page IDs are interned to dense page indices, and each article's daily views are appended as an
+    entry (day, page index, views) to flat typed arrays, i.e. a sparse day × page views matrix in
+    coordinate format. Dates are formatted once per day, and dicts are only built for the top
+    ranked articles.
+
+    Note:
+        💡 Totals and rankings are computed with NumPy vectorized operations when it's installed,
+        otherwise with plain loops over the arrays.
+        Page indices follow the order of first appearance, so ties are ranked exactly as the dict engine.
+    """
+
+    def __init__(self) -> None:
+        # Structure: {pageid: page_index}
+        self._page_indices: dict[int, int] = {}
+        self._pageids = array("q")
+        # Page URL of the first appearance by page index.
+        self._pages: list[str] = []
+        # ISO 8601 formatted date by day index.
+        self._formatted_dates: list[str] = []
+        # Sparse matrix entries, in order of aggregation.
+        self._entry_days = array("i")
+        self._entry_page_indices = array("i")
+        self._entry_views = array("q")
+
+    @property
+    def total_articles(self) -> int:
+        return len(self._pages)
+
+    def add_day(self, views_date: datetime, articles: list[tuple[int, str, int]]):
+        """Aggregates a day of (pageid, page, views) most read articles,
+        e.g. parsed with `parse_featured_content_most_read_articles`.
+        """
+        day = len(self._formatted_dates)
+        self._formatted_dates.append(views_date.strftime("%Y-%m-%d"))
+        for pageid, page, views in articles:
+            page_index = self._page_indices.get(pageid)
+            if page_index is None:
+                page_index = len(self._pages)
+                self._page_indices[pageid] = page_index
+                self._pageids.append(pageid)
+                self._pages.append(page)
+            self._entry_days.append(day)
+            self._entry_page_indices.append(page_index)
+            self._entry_views.append(views)
+
+    def top_articles(self, results_limit: int = None) -> list[dict[str, any]]:
+        """Returns the top `results_limit` (all if None) articles sorted (DESC) by total views,
+        in the same format as the dict aggregation engine.
+            e.g. `[{pageid: 123, page: 'https://en.wikipedia...', total_views: 9000, view_history: [{date: '2020-12-30', views: 4500}]}, ...]`
+        """
+        if results_limit is None:
+            results_limit = self.total_articles
+        results_limit = min(results_limit, self.total_articles)
+        if results_limit <= 0:
+            return []
+
+        if np is not None:
+            ranked_page_indices, totals = self._rank_page_indices_vectorized(
+                results_limit
+            )
+        else:
+            ranked_page_indices, totals = self._rank_page_indices(results_limit)
+
+        # Structure: {page_index: [{date, views}, ...]}
+        view_histories = {page_index: [] for page_index in ranked_page_indices}
+        for entry in self._entry_indices_of(ranked_page_indices):
+            view_histories[self._entry_page_indices[entry]].append(
+                {
+                    "date": self._formatted_dates[self._entry_days[entry]],
+                    "views": self._entry_views[entry],
+                }
+            )
+
+        return [
+            {
+                "pageid": self._pageids[page_index],
+                "page": self._pages[page_index],
+                "total_views": int(totals[page_index]),
+                "view_history": view_histories[page_index],
+            }
+            for page_index in ranked_page_indices
+        ]
+
+    def _rank_page_indices(self, results_limit: int) -> tuple[list[int], array]:
+        """Returns the top page indices and the total views by page index."""
+        totals = array("q", bytes(8 * self.total_articles))
+        for page_index, views in zip(self._entry_page_indices, self._entry_views):
+            totals[page_index] += views
+
+        # `heapq.nlargest` is stable, keeping ties in order of first appearance.
+        ranked_page_indices = heapq.nlargest(
+            results_limit, range(self.total_articles), key=totals.__getitem__
+        )
+        return (ranked_page_indices, totals)
+
+    def _rank_page_indices_vectorized(
+        self, results_limit: int
+    ) -> tuple[list[int], "np.ndarray"]:
+        """Returns the top page indices and the total views by page index, using NumPy."""
+        entry_page_indices = np.frombuffer(self._entry_page_indices, dtype=np.intc)
+        entry_views = np.frombuffer(self._entry_views, dtype=np.longlong)
+        # 💡 Float64 sums of integer views are exact below 2^53.
+        totals = np.bincount(
+            entry_page_indices, weights=entry_views, minlength=self.total_articles
+        ).astype(np.int64)
+
+        # Partial selection of the top candidates in O(n): all pages above the k-th largest total,
+        # and the first pages (in order of appearance) tied with it.
+        candidates = np.arange(self.total_articles)
+        if results_limit < self.total_articles:
+            kth_total = np.partition(totals, self.total_articles - results_limit)[
+                self.total_articles - results_limit
+            ]
+            above = np.flatnonzero(totals > kth_total)
+            tied = np.flatnonzero(totals == kth_total)[: results_limit - len(above)]
+            candidates = np.sort(np.concatenate((above, tied)))
+
+        # Stable sort, keeping ties in order of first appearance.
+        ranked = candidates[np.argsort(-totals[candidates], kind="stable")]
+        return (ranked.tolist(), totals)
+
+    def _entry_indices_of(self, page_indices: list[int]) -> list[int]:
+        """Returns the indices of the entries of `page_indices`, in order of aggregation."""
+        if np is not None:
+            entry_page_indices = np.frombuffer(self._entry_page_indices, dtype=np.intc)
+            return np.flatnonzero(np.isin(entry_page_indices, page_indices)).tolist()
+
+        page_indices = set(page_indices)
+        return [
+            entry
+            for entry, page_index in enumerate(self._entry_page_indices)
+            if page_index in page_indices
+        ]
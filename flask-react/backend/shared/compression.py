@@ -0,0 +1,223 @@
+import threading
+import time
+from typing import Callable
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+# Compression codecs
+ZLIB_CODEC = "zlib"
+ZSTD_CODEC = "zstd"
+
+# No dictionary, as recorded by Zstandard frames.
+NO_DICTIONARY_ID = 0
+
+
+class ResponseCompressor:
+    """
+    Compresses response texts with zlib, or Zstandard with an optional dictionary trained
+    from sample responses (see `train_zstd_dictionary`).
+
+    Note:
+        💡 Featured Content responses repeat most of their keys, URLs and structure across days and
+        languages, which a shared dictionary encodes once instead of in every compressed response.
+        Zstandard frames record the ID of their dictionary, so data compressed with previous dictionaries
+        stays readable as long as `dictionary_loader` can load them.
+        🚨 Zstandard contexts are not thread-safe, so they are cached per thread.
+    """
+
+    ZSTD_LEVEL = 3
+
+    def __init__(
+        self,
+        codec: str = ZLIB_CODEC,
+        dictionary_loader: Callable[[int], bytes] = None,
+    ) -> None:
+        """
+        Args:
+            codec: Compression codec, `ZLIB_CODEC` or `ZSTD_CODEC`.
+            dictionary_loader: Optional function returning the data of a Zstandard dictionary by ID
+                (or None if it's unknown), used to decompress data of dictionaries not added yet.
+
+        Raises:
+            ValueError: If `codec` is unknown.
+            ImportError: If `ZSTD_CODEC` is requested but `zstandard` is not installed.
+        """
+        if codec not in (ZLIB_CODEC, ZSTD_CODEC):
+            raise ValueError(f"Unknown compression codec: {codec}.")
+        if codec == ZSTD_CODEC and zstandard is None:
+            raise ImportError("zstandard is not installed.")
+
+        self.codec = codec
+        self.dictionary_loader = dictionary_loader
+        self.active_dictionary_id = NO_DICTIONARY_ID
+        # Structure: {dict_id: ZstdCompressionDict}
+        self._dictionaries: dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._lock = threading.Lock()
+        # Per thread structure: {dict_id: ZstdCompressor or ZstdDecompressor}
+        self._local = threading.local()
+
+    def add_dictionary(self, dictionary: bytes, activate: bool = True) -> int:
+        """Adds a Zstandard dictionary, optionally compressing with it from now on.
+
+        Returns:
+            The dictionary ID.
+
+        Raises:
+            ImportError: If `zstandard` is not installed.
+        """
+        if zstandard is None:
+            raise ImportError("zstandard is not installed.")
+        zstd_dictionary = zstandard.ZstdCompressionDict(dictionary)
+        dict_id = zstd_dictionary.dict_id()
+        with self._lock:
+            self._dictionaries.setdefault(dict_id, zstd_dictionary)
+            if activate:
+                self.active_dictionary_id = dict_id
+        return dict_id
+
+    def compress(self, text: str) -> tuple[str, bytes]:
+        """Compresses `text` with the active codec (and dictionary).
+
+        Returns:
+            Tuple (`codec`, `compressed_data`).
+        """
+        if self.codec == ZLIB_CODEC:
+            return (ZLIB_CODEC, zlib.compress(text.encode()))
+        compressor = self._zstd_context(self.active_dictionary_id, compression=True)
+        return (ZSTD_CODEC, compressor.compress(text.encode()))
+
+    def decompress(self, codec: str, data: bytes) -> str:
+        """Decompresses `data` compressed with `codec`, loading its Zstandard dictionary if needed.
+
+        Raises:
+            ValueError: If `codec` is unknown.
+            KeyError: If the Zstandard dictionary of `data` can't be loaded.
+            ImportError: If `data` is compressed with Zstandard but `zstandard` is not installed.
+        """
+        if codec == ZLIB_CODEC:
+            return zlib.decompress(data).decode()
+        if codec != ZSTD_CODEC:
+            raise ValueError(f"Unknown compression codec: {codec}.")
+        if zstandard is None:
+            raise ImportError("zstandard is not installed.")
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        decompressor = self._zstd_context(dict_id, compression=False)
+        return decompressor.decompress(data).decode()
+
+    def dictionary_id_of(self, codec: str, data: bytes) -> int:
+        """Returns the Zstandard dictionary ID of `data`, `NO_DICTIONARY_ID` if it has none."""
+        if codec != ZSTD_CODEC:
+            return NO_DICTIONARY_ID
+        if zstandard is None:
+            raise ImportError("zstandard is not installed.")
+        return zstandard.get_frame_parameters(data).dict_id
+
+    def _zstd_context(self, dict_id: int, compression: bool):
+        """Returns the calling thread's Zstandard (de)compressor of a dictionary."""
+        contexts_attr = "compressors" if compression else "decompressors"
+        contexts = getattr(self._local, contexts_attr, None)
+        if contexts is None:
+            contexts = {}
+            setattr(self._local, contexts_attr, contexts)
+
+        context = contexts.get(dict_id)
+        if context is None:
+            dictionary = self._zstd_dictionary(dict_id)
+            if compression:
+                context = zstandard.ZstdCompressor(
+                    level=self.ZSTD_LEVEL, dict_data=dictionary
+                )
+            else:
+                context = zstandard.ZstdDecompressor(dict_data=dictionary)
+            contexts[dict_id] = context
+        return context
+
+    def _zstd_dictionary(self, dict_id: int) -> "zstandard.ZstdCompressionDict":
+        if dict_id == NO_DICTIONARY_ID:
+            return None
+        with self._lock:
+            dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            dictionary_data = (
+                self.dictionary_loader(dict_id) if self.dictionary_loader else None
+            )
+            if dictionary_data is None:
+                raise KeyError(f"Unknown Zstandard dictionary: {dict_id}.")
+            self.add_dictionary(dictionary_data, activate=False)
+            with self._lock:
+                dictionary = self._dictionaries[dict_id]
+        return dictionary
+
+
+def create_response_compressor(
+    codec: str = None, dictionary_loader: Callable[[int], bytes] = None
+) -> ResponseCompressor:
+    """Creates a response compressor by codec ("zstd" or "zlib"),
+    defaults to "zstd" if it's installed, otherwise "zlib".
+
+    Raises:
+        ValueError: If `codec` is unknown.
+        ImportError: If "zstd" is requested but not installed.
+    """
+    if codec is None:
+        codec = ZSTD_CODEC if zstandard else ZLIB_CODEC
+    return ResponseCompressor(codec, dictionary_loader)
+
+
+def train_zstd_dictionary(samples: list[str], dictionary_size: int) -> bytes:
+    """Trains a Zstandard dictionary of up to `dictionary_size` bytes from sample texts.
+
+    Raises:
+        ImportError: If `zstandard` is not installed.
+        zstandard.ZstdError: If there are not enough samples to train the dictionary.
+    """
+    if zstandard is None:
+        raise ImportError("zstandard is not installed.")
+    return zstandard.train_dictionary(
+        dictionary_size, [sample.encode() for sample in samples]
+    ).as_bytes()
+
+
+def compare_compression(
+    samples: list[str], dictionary: bytes = None
+) -> list[dict[str, any]]:
+    """Compares the compression ratio and speed of each codec on sample texts.
+
+    Returns:
+        List of stats by codec, e.g. `[{codec: 'zlib', size: 1024, ratio: 5.2, compress_mbps: 40.1, decompress_mbps: 300.5}, ...]`
+    """
+    compressors = {ZLIB_CODEC: ResponseCompressor(ZLIB_CODEC)}
+    if zstandard:
+        compressors[ZSTD_CODEC] = ResponseCompressor(ZSTD_CODEC)
+        if dictionary:
+            zstd_dictionary_compressor = ResponseCompressor(ZSTD_CODEC)
+            zstd_dictionary_compressor.add_dictionary(dictionary)
+            compressors[f"{ZSTD_CODEC}+dictionary"] = zstd_dictionary_compressor
+
+    total_mb = sum(len(sample.encode()) for sample in samples) / 1024 / 1024
+    stats = []
+    for name, compressor in compressors.items():
+        start = time.perf_counter()
+        compressed = [compressor.compress(sample) for sample in samples]
+        compress_secs = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for codec, data in compressed:
+            compressor.decompress(codec, data)
+        decompress_secs = time.perf_counter() - start
+
+        size = sum(len(data) for _, data in compressed)
+        stats.append(
+            {
+                "codec": name,
+                "size": size,
+                "ratio": total_mb * 1024 * 1024 / size if size else 0,
+                "compress_mbps": total_mb / compress_secs if compress_secs else 0,
+                "decompress_mbps": total_mb / decompress_secs if decompress_secs else 0,
+            }
+        )
+    return stats
@@ -0,0 +1,64 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+# HTTP content codings
+BROTLI_ENCODING = "br"
+GZIP_ENCODING = "gzip"
+IDENTITY_ENCODING = "identity"
+
+# Levels fast enough to compress multi-megabyte responses on the fly, most of the ratio of the highest ones.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def available_content_encodings() -> list[str]:
+    """Returns the supported content codings by server preference,
+    "br" (smaller and faster to decompress) first if `brotli` is installed, then "gzip".
+    """
+    if brotli:
+        return [BROTLI_ENCODING, GZIP_ENCODING]
+    return [GZIP_ENCODING]
+
+
+def encode_content(data: bytes, encoding: str) -> bytes:
+    """Compresses a response body with a content coding.
+
+    Note:
+        Outputs are deterministic (e.g. no gzip timestamp), so that encoded bodies can be memoized
+        and served with the same ETag.
+
+    Raises:
+        ValueError: If `encoding` is unknown.
+        ImportError: If "br" is requested but `brotli` is not installed.
+    """
+    if encoding == GZIP_ENCODING:
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == BROTLI_ENCODING:
+        if brotli is None:
+            raise ImportError("brotli is not installed.")
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == IDENTITY_ENCODING:
+        return data
+    raise ValueError(f"Unknown content encoding: {encoding}.")
+
+
+def decode_content(data: bytes, encoding: str) -> bytes:
+    """Decompresses a response body encoded with `encode_content`.
+
+    Raises:
+        ValueError: If `encoding` is unknown.
+        ImportError: If "br" is requested but `brotli` is not installed.
+    """
+    if encoding == GZIP_ENCODING:
+        return gzip.decompress(data)
+    if encoding == BROTLI_ENCODING:
+        if brotli is None:
+            raise ImportError("brotli is not installed.")
+        return brotli.decompress(data)
+    if encoding == IDENTITY_ENCODING:
+        return data
+    raise ValueError(f"Unknown content encoding: {encoding}.")
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from threading import Event, Lock, Thread
+from typing import Awaitable, Callable, Coroutine
+
+
+class EventLoopThread:
+    """
+    A thread-safe class that owns a long-lived asyncio event loop running in a background
+    daemon thread, so synchronous callers (e.g. Flask worker threads) can submit coroutines
+    to it instead of creating a new event loop per request.
+
+    Note:
+        Long-lived asyncio resources (e.g. pooled `httpx.AsyncClient` connections) are bound
+        to the event loop that created them, so they should only be used from this loop.
+    """
+
+    def __init__(self, name: str = "EventLoopThread") -> None:
+        self._name = name
+        self._lock = Lock()
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread: Thread = None
+        self._shutdown_callbacks: list[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Running event loop, the background thread is started on first access."""
+        self.start()
+        return self._loop
+
+    def start(self):
+        """Starts the background event loop thread if it's not running yet."""
+        with self._lock:
+            if self.is_running:
+                return
+
+            loop_ready = Event()
+            self._loop = asyncio.new_event_loop()
+
+            def run_loop_forever():
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(loop_ready.set)
+                self._loop.run_forever()
+
+            self._thread = Thread(target=run_loop_forever, name=self._name, daemon=True)
+            self._thread.start()
+            loop_ready.wait()
+            logging.debug("%s: Started event loop.", self._name)
+
+    def add_shutdown_callback(self, callback: Callable[[], Awaitable[None]]):
+        """Registers an async callback awaited on the event loop before it stops,
+        e.g. to close pooled HTTP clients.
+        """
+        self._shutdown_callbacks.append(callback)
+
+    async def run_shutdown_callbacks(self):
+        """Awaits the shutdown callbacks in order of registration, e.g. from another event loop
+        (like an ASGI server's) that used the resources instead of this one.
+        """
+        for callback in self._shutdown_callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logging.error("%s: Shutdown callback error: %s", self._name, e)
+
+    def run_coroutine(self, coro: Coroutine, timeout: float = None) -> any:
+        """Submits `coro` to the background event loop and blocks the calling thread for its result.
+
+        Args:
+            coro: Coroutine to run on the background event loop.
+            timeout: Optional seconds to wait for the result.
+
+        Returns:
+            The coroutine result.
+
+        Raises:
+            TimeoutError: If the result is not available after `timeout` seconds.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout)
+
+    def stop(self, timeout: float = 10):
+        """Awaits the shutdown callbacks, then stops and closes the background event loop."""
+        with self._lock:
+            if not self.is_running:
+                return
+
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self.run_shutdown_callbacks(), self._loop
+                ).result(timeout)
+            except TimeoutError:
+                logging.error("%s: Shutdown callbacks timed out.", self._name)
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._loop.close()
+            self._thread = None
+            logging.debug("%s: Stopped event loop.", self._name)
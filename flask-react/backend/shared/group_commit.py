@@ -0,0 +1,94 @@
+from threading import Event, Lock
+import time
+from typing import Callable
+
+
+class _CommitGroup:
+    def __init__(self) -> None:
+        self.items: list = []
+        self.committed = Event()
+        self.exception: Exception = None
+
+
+class GroupCommitter:
+    """
+    A thread-safe group commit of writes submitted concurrently, so that they share one transaction
+    instead of serializing a transaction (and its fsync) per write.
+
+    Note:
+        The first thread submitting to an empty group becomes its leader, it waits up to `max_delay_secs`
+        for other threads to join, then commits the whole group once the previous group is committed.
+        Writes submitted while a group is being committed join the next group, so groups grow with
+        contention while a single writer commits right away (with no delay).
+        `submit` returns once its writes are committed, and raises the exception of a failed group commit.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[list], None],
+        max_delay_secs: float = 0,
+        max_group_size: int = 1000,
+    ) -> None:
+        """
+        Args:
+            commit: Function writing a group of items in a single transaction.
+            max_delay_secs: Seconds a leader waits for other writes before committing its group.
+            max_group_size: Items per group, further items start a new group.
+        """
+        self._commit = commit
+        self.max_delay_secs = max_delay_secs
+        self.max_group_size = max_group_size
+        self._lock = Lock()
+        # Serializes group commits, while the next group gathers writes.
+        self._commit_lock = Lock()
+        self._open_group: _CommitGroup = None
+        self._total_commits = 0
+        self._total_items = 0
+
+    def submit(self, items: list):
+        """Commits `items` within a group, blocking until the group is committed.
+
+        Raises:
+            Exception: The exception raised by the group's commit, if any.
+        """
+        with self._lock:
+            group = self._open_group
+            is_leader = group is None or len(group.items) >= self.max_group_size
+            if is_leader:
+                group = self._open_group = _CommitGroup()
+            group.items.extend(items)
+
+        if is_leader:
+            if self.max_delay_secs > 0:
+                time.sleep(self.max_delay_secs)
+            with self._commit_lock:
+                with self._lock:
+                    # Close the group, later writes start the next one.
+                    if self._open_group is group:
+                        self._open_group = None
+                try:
+                    self._commit(group.items)
+                    self._total_commits += 1
+                    self._total_items += len(group.items)
+                except Exception as e:
+                    group.exception = e
+                finally:
+                    group.committed.set()
+        else:
+            group.committed.wait()
+
+        if group.exception:
+            raise group.exception
+
+    def stats(self) -> dict[str, float]:
+        """Returns the total `commits`, committed `items` and the `average_group_size`."""
+        with self._commit_lock:
+            return {
+                "commits": self._total_commits,
+                "items": self._total_items,
+                "average_group_size": (
+                    self._total_items / self._total_commits
+                    if self._total_commits
+                    else 0
+                ),
+            }
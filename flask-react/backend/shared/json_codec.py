@@ -0,0 +1,83 @@
+import json
+from typing import Callable
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+class JSONCodec:
+    """
+    JSON codec backed by the standard library `json` module, producing compact UTF-8 JSON.
+
+    Note:
+        Decoding errors raise `json.JSONDecodeError` (or a subclass) with every codec.
+    """
+
+    name = "json"
+
+    def loads(self, data: str | bytes) -> any:
+        return json.loads(data)
+
+    def dumps(
+        self, obj: any, sort_keys: bool = False, default: Callable = None
+    ) -> bytes:
+        """Serializes `obj` as compact UTF-8 JSON.
+
+        Args:
+            obj: Object to serialize.
+            sort_keys: Whether to sort the keys of dictionaries.
+            default: Optional function returning a serializable version of unsupported objects.
+        """
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            sort_keys=sort_keys,
+            default=default,
+        ).encode()
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by `orjson`, which parses and serializes several times faster than `json`.
+
+    Raises:
+        ImportError: If `orjson` is not installed.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed.")
+
+    def loads(self, data: str | bytes) -> any:
+        return orjson.loads(data)
+
+    def dumps(
+        self, obj: any, sort_keys: bool = False, default: Callable = None
+    ) -> bytes:
+        option = orjson.OPT_SORT_KEYS if sort_keys else None
+        return orjson.dumps(obj, default=default, option=option)
+
+
+def create_json_codec(name: str = None) -> JSONCodec:
+    """Creates a JSON codec by name ("orjson" or "json"),
+    defaults to "orjson" if it's installed, otherwise "json".
+
+    Raises:
+        ValueError: If `name` is unknown.
+        ImportError: If "orjson" is requested but not installed.
+    """
+    if name is None:
+        name = OrjsonCodec.name if orjson else JSONCodec.name
+    if name == OrjsonCodec.name:
+        return OrjsonCodec()
+    if name == JSONCodec.name:
+        return JSONCodec()
+    raise ValueError(f"Unknown JSON codec: {name}.")
+
+
+# Codec shared by the Wiki API client and the app responses.
+default_json_codec = create_json_codec()
@@ -0,0 +1,252 @@
+from collections import OrderedDict
+from datetime import datetime
+import logging
+import math
+import sys
+from threading import Lock
+import time
+from typing import Callable, Hashable
+
+from shared.wiki_api import WikiAPIResponse, WikiCache
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class BoundedLRUCache:
+    """
+    A thread-safe least recently used (LRU) cache bounded by the total size in bytes of its entries,
+    with an optional time to live (TTL) per entry.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_bytes: Maximum total size of the entries, least recently used entries are evicted first.
+            default_ttl: Default seconds to live of an entry, None never expires.
+            clock: Monotonic time function in seconds.
+
+        Raises:
+            ValueError: If `max_bytes` is less than 1.
+        """
+        if max_bytes < 1:
+            raise ValueError(
+                f"max_bytes requires a value of at least 1, {max_bytes} was provided."
+            )
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = Lock()
+        # Structure: {key: (value, size, expires_at)}, ordered from least to most recently used.
+        self._entries: OrderedDict[Hashable, tuple[any, int, float]] = OrderedDict()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> any:
+        """Returns the value cached for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                self._discard(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: any, size: int, ttl: float = None):
+        """Inserts or replaces the value cached for `key`.
+
+        Args:
+            key: Cache key.
+            value: Cached value.
+            size: Size in bytes accounted against `max_bytes`, values larger than `max_bytes` are not cached.
+            ttl: Seconds to live of the entry, defaults to `default_ttl`, `math.inf` never expires.
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = None
+        if ttl is not None and ttl != math.inf:
+            expires_at = self._clock() + ttl
+
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size, expires_at)
+            self._total_bytes += size
+
+            # Evict least recently used entries until the cache fits in `max_bytes`.
+            while self._total_bytes > self.max_bytes:
+                evicted_key = next(iter(self._entries))
+                self._discard(evicted_key)
+                self._evictions += 1
+                logging.debug("LRU EVICTION: %s", evicted_key)
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Returns the cache usage and hit/miss/eviction/expiration counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _discard(self, key: Hashable):
+        """Removes `key` entry, the caller must hold `_lock`."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+
+class TieredWikiCache(WikiCache):
+    """This is a subclass of WikiCache with two tiers, an in-memory `BoundedLRUCache`
+    in front of a slower backing WikiCache (e.g. a SQLite db).
+
+    Note:
+        Puts are written to the backing cache and only invalidate the memory tier, which is
+        populated on reads, so that it stores the responses as returned by the backing cache
+        (e.g. projected by the backing cache on put).
+    """
+
+    def __init__(self, backing_cache: WikiCache, memory_cache: BoundedLRUCache) -> None:
+        super().__init__()
+        self.backing_cache = backing_cache
+        self.memory_cache = memory_cache
+
+    def get(self, url: str) -> WikiAPIResponse:
+        return self.multi_get([url]).get(url)
+
+    def put(self, wiki_resp: WikiAPIResponse):
+        self.put_many([wiki_resp])
+
+    def multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        cached_responses, memory_missed_urls = self._memory_multi_get(urls)
+        if memory_missed_urls:
+            backing_responses = self.backing_cache.multi_get(memory_missed_urls)
+            self._populate_memory_cache(backing_responses)
+            cached_responses.update(backing_responses)
+        return cached_responses
+
+    def put_many(self, wiki_resps: list[WikiAPIResponse]):
+        self.backing_cache.put_many(wiki_resps)
+        self._invalidate_memory_cache(wiki_resps)
+
+    async def aget(self, url: str) -> WikiAPIResponse:
+        return (await self.amulti_get([url])).get(url)
+
+    async def aput(self, wiki_resp: WikiAPIResponse):
+        await self.aput_many([wiki_resp])
+
+    async def amulti_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        """Gets the memory tier hits, and awaits the async variant of the backing cache for misses."""
+        cached_responses, memory_missed_urls = self._memory_multi_get(urls)
+        if memory_missed_urls:
+            backing_responses = await self.backing_cache.amulti_get(memory_missed_urls)
+            self._populate_memory_cache(backing_responses)
+            cached_responses.update(backing_responses)
+        return cached_responses
+
+    async def aput_many(self, wiki_resps: list[WikiAPIResponse]):
+        await self.backing_cache.aput_many(wiki_resps)
+        self._invalidate_memory_cache(wiki_resps)
+
+    def touch_many(self, urls: list[str]):
+        self.backing_cache.touch_many(urls)
+        self._invalidate_memory_cache_urls(urls)
+
+    async def atouch_many(self, urls: list[str]):
+        await self.backing_cache.atouch_many(urls)
+        self._invalidate_memory_cache_urls(urls)
+
+    def acquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        return self.backing_cache.acquire_fetch_leases(urls, owner, ttl)
+
+    def release_fetch_leases(self, urls: list[str], owner: str):
+        self.backing_cache.release_fetch_leases(urls, owner)
+
+    def leased_fetch_urls(self, urls: list[str]) -> list[str]:
+        return self.backing_cache.leased_fetch_urls(urls)
+
+    async def aleased_fetch_urls(self, urls: list[str]) -> list[str]:
+        return await self.backing_cache.aleased_fetch_urls(urls)
+
+    async def aacquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        return await self.backing_cache.aacquire_fetch_leases(urls, owner, ttl)
+
+    async def arelease_fetch_leases(self, urls: list[str], owner: str):
+        await self.backing_cache.arelease_fetch_leases(urls, owner)
+
+    def aggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        return self.backing_cache.aggregate_most_read_articles(
+            lang_code, start_date, end_date, limit
+        )
+
+    async def aaggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        return await self.backing_cache.aaggregate_most_read_articles(
+            lang_code, start_date, end_date, limit
+        )
+
+    def _memory_multi_get(
+        self, urls: list[str]
+    ) -> tuple[dict[str, WikiAPIResponse], list[str]]:
+        """Returns the memory tier hits by URL, and the missed URLs."""
+        cached_responses = {}
+        memory_missed_urls = []
+        for url in urls:
+            cached_response = self.memory_cache.get(url)
+            if cached_response:
+                cached_responses[url] = cached_response
+            else:
+                memory_missed_urls.append(url)
+        return (cached_responses, memory_missed_urls)
+
+    def _populate_memory_cache(self, backing_responses: dict[str, WikiAPIResponse]):
+        for url, cached_response in backing_responses.items():
+            self.memory_cache.put(url, cached_response, self._sizeof(cached_response))
+
+    def _invalidate_memory_cache(self, wiki_resps: list[WikiAPIResponse]):
+        self._invalidate_memory_cache_urls([wiki_resp.url for wiki_resp in wiki_resps])
+
+    def _invalidate_memory_cache_urls(self, urls: list[str]):
+        for url in urls:
+            self.memory_cache.discard(url)
+
+    def _sizeof(self, wiki_resp: WikiAPIResponse) -> int:
+        return sys.getsizeof(wiki_resp.url) + sys.getsizeof(wiki_resp.text or "")
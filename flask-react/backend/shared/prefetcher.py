@@ -0,0 +1,118 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+import logging
+from typing import Callable
+
+from shared.wiki_api import WikiAPI
+
+
+class MostReadPrefetcher:
+    """
+    A background scheduler that fetches and caches the newest completed day (UTC) of most read
+    articles for a list of languages shortly after UTC midnight, so that the first requests of
+    the day don't wait for a cold upstream fetch.
+
+    Note:
+        The Feed API publishes the "mostread" section of a day some time after UTC midnight,
+        so each language is retried every `retry_interval_secs` until it appears, or until the next run.
+        💡 The `wiki_api` is expected to share the caching layer of the app, with a low-priority
+        rate limiter (e.g. `LowPriorityRateLimiter`) so that prefetches don't delay user requests.
+    """
+
+    def __init__(
+        self,
+        wiki_api: WikiAPI,
+        lang_codes: list[str],
+        delay_secs: float = 5 * 60,
+        retry_interval_secs: float = 10 * 60,
+        utc_now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        """
+        Args:
+            wiki_api: Wiki API client used to fetch and cache the most read articles.
+            lang_codes: Wikipedia language codes to prefetch.
+            delay_secs: Seconds after UTC midnight to start prefetching.
+            retry_interval_secs: Seconds between retries while the "mostread" section is missing.
+            utc_now: Current UTC time function.
+        """
+        self.wiki_api = wiki_api
+        self.lang_codes = lang_codes
+        self.delay_secs = delay_secs
+        self.retry_interval_secs = retry_interval_secs
+        self._utc_now = utc_now
+
+    async def run_forever(self):
+        """Prefetches the newest completed day right away, then daily after UTC midnight."""
+        while True:
+            await self.prefetch_newest_day()
+            secs_until_next_run = self.secs_until_next_run()
+            logging.info("PREFETCH: Next run in %d seconds.", secs_until_next_run)
+            await asyncio.sleep(secs_until_next_run)
+
+    async def prefetch_newest_day(self) -> dict[str, bool]:
+        """Prefetches the newest completed day for all languages concurrently.
+
+        Returns:
+            Dictionary of whether the day was prefetched by language code.
+        """
+        views_date = self._utc_now().date() - timedelta(days=1)
+        # Give up on languages still missing the day at the next run, which prefetches the following day.
+        give_up_after = self.secs_until_next_run()
+        results = await asyncio.gather(
+            *[
+                self.prefetch_day(lang_code, views_date, give_up_after)
+                for lang_code in self.lang_codes
+            ]
+        )
+        return dict(zip(self.lang_codes, results))
+
+    async def prefetch_day(
+        self, lang_code: str, views_date: date, give_up_after: float
+    ) -> bool:
+        """Fetches the most read articles of `views_date` into the caching layer,
+        retrying until the "mostread" section is available.
+
+        Args:
+            lang_code: Wikipedia language code.
+            views_date: Day to prefetch.
+            give_up_after: Seconds after which no more retries are started.
+
+        Returns:
+            True if the day was prefetched (or already cached), otherwise False.
+        """
+        formatted_date = views_date.strftime("%Y-%m-%d")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + give_up_after
+        while True:
+            try:
+                result = await self.wiki_api.fetch_most_read_articles(
+                    lang_code, formatted_date, formatted_date, results_limit=1
+                )
+                if result["data"]:
+                    logging.info("PREFETCHED: %s %s", lang_code, formatted_date)
+                    return True
+                # URL errors, other errors are informative (e.g. limited response).
+                for error in result["errors"]:
+                    if error["url"]:
+                        logging.warning(
+                            "PREFETCH ERROR: %s %s", error["url"], error["message"]
+                        )
+            except Exception as e:
+                logging.error("PREFETCH ERROR: %s %s %s", lang_code, formatted_date, e)
+
+            if loop.time() + self.retry_interval_secs >= deadline:
+                logging.warning("PREFETCH GAVE UP: %s %s", lang_code, formatted_date)
+                return False
+            await asyncio.sleep(self.retry_interval_secs)
+
+    def secs_until_next_run(self) -> float:
+        """Returns the seconds until `delay_secs` after the next UTC midnight."""
+        now = self._utc_now()
+        next_midnight = datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc
+        )
+        next_run = next_midnight + timedelta(seconds=self.delay_secs)
+        # Still before today's run time.
+        if next_run - timedelta(days=1) > now:
+            next_run -= timedelta(days=1)
+        return (next_run - now).total_seconds()
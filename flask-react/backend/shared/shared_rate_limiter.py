@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import sqlite3
+from threading import Lock
+import time
+
+from shared.asyncio_rate_limiter import (
+    AsyncIORateLimiter,
+    DEFAULT_MAX_TASKS_PER_SECOND,
+    TOKEN_BUCKET_SCHEDULER,
+)
+
+
+class SharedAsyncIORateLimiter(AsyncIORateLimiter):
+    """
+    A token bucket `AsyncIORateLimiter` whose tokens are shared by every process on the same host
+    using the same state file, e.g. multiple app workers sharing Wikipedia's rate limit.
+
+    Note:
+        The bucket state is stored in a SQLite database (WAL journal), and each token is taken within a
+        `BEGIN IMMEDIATE` transaction, which serializes concurrent processes with a write lock.
+        The SQLite calls run on a worker thread to avoid blocking the event loop.
+        💡 Waiters of a process poll the state file one at a time (per `reserved_tokens`), and a poll
+        finding no token rolls back without writing the state file.
+    """
+
+    # Seconds a process waits for another process' write lock on the state file.
+    LOCK_TIMEOUT = 5
+
+    def __init__(
+        self,
+        state_file: str,
+        max_tasks_per_second: int = DEFAULT_MAX_TASKS_PER_SECOND,
+        burst_size: int = None,
+        bucket_name: str = "default",
+    ):
+        """
+        Args:
+            state_file: SQLite database file path shared by the processes.
+            max_tasks_per_second: Maximum tasks started per second across all processes.
+            burst_size: Token bucket capacity, defaults to `max_tasks_per_second`.
+            bucket_name: Name of the token bucket, allowing multiple budgets in one state file.
+        """
+        super().__init__(
+            max_tasks_per_second=max_tasks_per_second,
+            scheduler=TOKEN_BUCKET_SCHEDULER,
+            burst_size=burst_size,
+        )
+        self.state_file = state_file
+        self.bucket_name = bucket_name
+        self._connection_lock = Lock()
+        self._connection: sqlite3.Connection = None
+        # Structure: {reserved_tokens: asyncio.Lock}, serializing the waiters of each priority.
+        self._waiter_locks: dict[int, asyncio.Lock] = {}
+
+    async def acquire_token(self, reserved_tokens: int = 0):
+        """Waits until a token of the shared bucket is available and takes it.
+
+        Args:
+            reserved_tokens: Tokens left available to other callers (see `AsyncIORateLimiter.acquire_token`).
+        """
+        waiter_lock = self._waiter_locks.setdefault(reserved_tokens, asyncio.Lock())
+        async with waiter_lock:
+            while True:
+                wait_time = await asyncio.to_thread(
+                    self._try_take_shared_token, reserved_tokens
+                )
+                if wait_time <= 0:
+                    return
+                await asyncio.sleep(wait_time)
+
+    def close(self):
+        with self._connection_lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+    def _try_take_shared_token(self, reserved_tokens: int = 0) -> float:
+        """Refills the shared bucket and takes a token if more than `reserved_tokens` are available.
+
+        Returns:
+            0 if a token was taken, otherwise the seconds to wait for the next token.
+        """
+        with self._connection_lock:
+            connection = self._connect()
+            now = time.time()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute(
+                    "SELECT tokens, refilled_at FROM token_bucket WHERE name = ?",
+                    (self.bucket_name,),
+                ).fetchone()
+                tokens, refilled_at = row if row else (float(self.burst_size), now)
+
+                elapsed = max(0.0, now - refilled_at)
+                tokens = min(
+                    float(self.burst_size),
+                    tokens + elapsed * self._max_tasks_per_second,
+                )
+                if tokens < 1 + reserved_tokens:
+                    # Nothing to write, the refill is computed from `refilled_at` on the next poll.
+                    connection.execute("ROLLBACK")
+                    return (1 + reserved_tokens - tokens) / self._max_tasks_per_second
+
+                tokens -= 1
+                connection.execute(
+                    "INSERT OR REPLACE INTO token_bucket (name, tokens, refilled_at) VALUES (?, ?, ?)",
+                    (self.bucket_name, tokens, now),
+                )
+                connection.execute("COMMIT")
+                return 0.0
+            except sqlite3.Error as e:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                logging.error("Shared rate limiter state error: %s", e)
+                # Back off for a token period rather than exceeding the shared budget.
+                return 1 / self._max_tasks_per_second
+
+    def _connect(self) -> sqlite3.Connection:
+        """Returns the state file connection, the caller must hold `_connection_lock`."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(
+                self.state_file,
+                timeout=self.LOCK_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            # Readers don't block the writer, and commits don't fsync the WAL (the state is transient).
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS token_bucket (name TEXT PRIMARY KEY, tokens REAL NOT NULL, refilled_at REAL NOT NULL)"
+            )
+        return self._connection
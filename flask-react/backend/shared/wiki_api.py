@@ -1,26 +1,58 @@
-from collections import namedtuple
-from datetime import datetime, timedelta
+import asyncio
+import heapq
+from collections import Counter, namedtuple
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import httpx
 import json
 import logging
+import random
 import re
-from typing import Callable
+from typing import AsyncIterator, Callable, Iterator
+from urllib.parse import urlsplit
+from uuid import uuid4
 
 from shared.asyncio_rate_limiter import AsyncIORateLimiter
+from shared.columnar_aggregation import ColumnarMostReadArticlesAggregator
+from shared.json_codec import default_json_codec
 
-
+# `etag` and `last_modified` are the upstream validators of the response, and `cached_at`
+# the time it was cached (or last revalidated), if returned by the caching layer.
 WikiAPIResponse = namedtuple(
-    "WikiAPIResponse", ["url", "status_ok", "text", "exception"]
+    "WikiAPIResponse",
+    ["url", "status_ok", "text", "exception", "etag", "last_modified", "cached_at"],
+    defaults=(None, None, None),
+)
+
+MostReadArticle = namedtuple("MostReadArticle", ["pageid", "page", "views"])
+
+# Top ranked most read articles of a date range, out of `total_articles`, and the URL errors if any.
+MostReadArticlesRanking = namedtuple(
+    "MostReadArticlesRanking", ["articles", "total_articles", "errors"]
 )
 
+# Aggregation engines
+DICT_AGGREGATION_ENGINE = "dict"
+COLUMNAR_AGGREGATION_ENGINE = "columnar"
+
+# Event loop time after which no more retries are started for the current `fetch_most_read_articles` call.
+_request_deadline: ContextVar[float] = ContextVar("request_deadline", default=None)
+
 
 class WikiCache:
     """This abstract class acts as an interface to the caching layer,
     which can be implemented in anything like a local dictionary or database.
 
     Note:
-        We could also implement a `multi_get` function to offer a group fetch if the
-        caching layer has this capability.
+        `multi_get` and `put_many` default to one `get` or `put` call per item,
+        caching layers with group fetch or write capabilities should override them.
+
+        `WikiAPI` awaits the async variants (e.g. `aget`, `amulti_get`, `aput_many`, `aacquire_fetch_leases`
+        and `aaggregate_most_read_articles`), which default
+        to the synchronous methods, i.e. run on the event loop. Caching layers with blocking I/O
+        (e.g. db queries) should override them, so that lookups don't stall other requests.
     """
 
     def get(self, url: str) -> WikiAPIResponse:
@@ -29,13 +61,129 @@ class WikiCache:
     def put(self, resp: WikiAPIResponse):
         raise NotImplementedError
 
+    def multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        """Gets the cached responses for a list of URLs.
 
-class WikiAPI:
+        Returns:
+            Dictionary of cache hit responses by URL, missed URLs are not included.
+        """
+        cached_responses = {}
+        for url in urls:
+            cached_response = self.get(url)
+            if cached_response:
+                cached_responses[url] = cached_response
+        return cached_responses
+
+    def put_many(self, resps: list[WikiAPIResponse]):
+        for resp in resps:
+            self.put(resp)
+
+    async def aget(self, url: str) -> WikiAPIResponse:
+        return self.get(url)
+
+    async def aput(self, resp: WikiAPIResponse):
+        self.put(resp)
+
+    async def amulti_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        """Async variant of `multi_get`."""
+        return self.multi_get(urls)
+
+    async def aput_many(self, resps: list[WikiAPIResponse]):
+        """Async variant of `put_many`."""
+        self.put_many(resps)
+
+    def touch_many(self, urls: list[str]):
+        """Optionally bumps the cached time of responses revalidated upstream (304 Not Modified),
+        without rewriting them.
+        """
+        pass
+
+    async def atouch_many(self, urls: list[str]):
+        """Async variant of `touch_many`."""
+        self.touch_many(urls)
+
+    def acquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        """Optionally leases the fetch of `urls` to `owner` for `ttl` seconds, so that other
+        processes sharing the caching layer can wait for the responses to be cached instead of
+        fetching the same URLs.
+
+        Returns:
+            List of URLs leased to `owner`, URLs leased to other owners are not included.
+        """
+        return urls
+
+    def release_fetch_leases(self, urls: list[str], owner: str):
+        pass
 
+    def leased_fetch_urls(self, urls: list[str]) -> list[str]:
+        """Optionally returns the URLs of `urls` whose fetch is leased (see `acquire_fetch_leases`),
+        so that waiters stop waiting for a fetch released without caching its response (e.g. a 404).
+
+        Returns:
+            List of URLs with an unexpired lease, defaults to all `urls`.
+        """
+        return urls
+
+    async def aleased_fetch_urls(self, urls: list[str]) -> list[str]:
+        """Async variant of `leased_fetch_urls`."""
+        return self.leased_fetch_urls(urls)
+
+    async def aacquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        """Async variant of `acquire_fetch_leases`."""
+        return self.acquire_fetch_leases(urls, owner, ttl)
+
+    async def arelease_fetch_leases(self, urls: list[str], owner: str):
+        """Async variant of `release_fetch_leases`."""
+        self.release_fetch_leases(urls, owner)
+
+    def aggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        """Optionally aggregates the most read articles of a date range within the caching layer,
+        e.g. with a SQL query, skipping the parsing of every cached response.
+
+        Args:
+            lang_code: Wikipedia language code.
+            start_date: Start day of range (views date, not the Feed API URL date).
+            end_date: Last day of range (inclusive).
+            limit: Maximum number of ranked articles to return.
+
+        Returns:
+            Tuple (`most_read_articles`, `total_articles`) sorted like `WikiAPI.fetch_most_read_articles` data,
+            or None if the caching layer can't aggregate the whole date range.
+        """
+        return None
+
+    async def aaggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        """Async variant of `aggregate_most_read_articles`."""
+        return self.aggregate_most_read_articles(lang_code, start_date, end_date, limit)
+
+
+class WikiAPI:
     MAX_REQUESTS_PER_SEC = 100  # Wikipedia API Rate Limit
 
     MAX_RESPONSE_RESULTS = 5000
 
+    # Time other processes sharing the caching layer wait for a leased fetch to be cached.
+    FETCH_LEASE_SECS = 30
+    FETCH_LEASE_POLL_INTERVAL_SECS = 0.5
+
+    # Retries of transient failures with jittered exponential backoff.
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY_SECS = 0.5
+    RETRY_MAX_DELAY_SECS = 8
+    # Longer `Retry-After` delays give up instead of holding the request.
+    MAX_RETRY_AFTER_SECS = 30
+    RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    NOT_MODIFIED_STATUS_CODE = 304
+
     DEFAULT_USER_AGENT = "test"
 
     def __init__(
@@ -43,18 +191,69 @@ class WikiAPI:
         optional_cache: WikiCache = None,
         user_agent: str = DEFAULT_USER_AGENT,
         access_token: str = None,
+        http_limits: httpx.Limits = None,
+        aio_rate_limiter: AsyncIORateLimiter = None,
+        max_retries: int = MAX_RETRIES,
+        aggregation_engine: str = DICT_AGGREGATION_ENGINE,
+        revalidate_after_secs: float = None,
     ) -> None:
+        """
+        Args:
+            optional_cache: Caching layer for Feed API responses.
+            user_agent: User agent sent on every API request.
+            access_token: Optional Wikimedia API access token to increase the rate limit.
+            http_limits: Optional connection pool limits. When provided, a long-lived HTTP/2 client
+                is kept per host and reused across calls, which requires all calls to run on the same
+                event loop and `aclose()` to be awaited on shutdown. Otherwise a short-lived client
+                is opened on every call.
+            aio_rate_limiter: Optional rate limiter, defaults to a `MAX_REQUESTS_PER_SEC` cycle scheduler.
+            max_retries: Maximum retries per request of transient failures (429 and 5xx status codes,
+                timeouts and dropped connections), 0 disables retries.
+            aggregation_engine: `DICT_AGGREGATION_ENGINE` or `COLUMNAR_AGGREGATION_ENGINE`, both return
+                identical results (see `ColumnarMostReadArticlesAggregator`).
+            revalidate_after_secs: Optional seconds after which cached responses of days that can still
+                change (see `is_final_views_date`) are revalidated upstream with a conditional request,
+                None never revalidates cached responses.
+
+        Raises:
+            ValueError: If `aggregation_engine` is unknown.
+        """
+        if aggregation_engine not in (
+            DICT_AGGREGATION_ENGINE,
+            COLUMNAR_AGGREGATION_ENGINE,
+        ):
+            raise ValueError(f"Unknown aggregation engine: {aggregation_engine}.")
+
         self.optional_cache = optional_cache
         self.user_agent = user_agent
         self.access_token = access_token
-        self.aio_rate_limiter = AsyncIORateLimiter(
+        self.http_limits = http_limits
+        self.aio_rate_limiter = aio_rate_limiter or AsyncIORateLimiter(
             max_tasks_per_second=self.MAX_REQUESTS_PER_SEC
         )
+        # Structure: {host: AsyncClient}
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
+        # Structure: {url: Future[(wiki_resp, is_valid)]}
+        self._in_flight_fetches: dict[str, asyncio.Future] = {}
+        self._lease_owner = uuid4().hex
+        self.max_retries = max_retries
+        self.aggregation_engine = aggregation_engine
+        # Structure: {"retries": int, "recovered": int, "exhausted": int, "abandoned": int}
+        self._retry_counters: Counter[str] = Counter()
+        self.revalidate_after_secs = revalidate_after_secs
+        # Structure: {"revalidations": int, "not_modified": int, "stale_fallbacks": int}
+        self._revalidation_counters: Counter[str] = Counter()
 
     # MARK: - Public Functions
 
     async def fetch_most_read_articles(
-        self, lang_code: str, start: str, end: str, results_limit=MAX_RESPONSE_RESULTS
+        self,
+        lang_code: str,
+        start: str,
+        end: str,
+        results_limit=MAX_RESPONSE_RESULTS,
+        deadline_secs: float = None,
+        offset: int = 0,
     ) -> list[dict[str, any]]:
         """Fetches the most read articles from Wikipedia by supported language code and date range.
 
@@ -67,6 +266,10 @@ class WikiAPI:
             lang_code: Wikipedia language code
             start: Start day to retrieve from. Format: YYYY-MM-DD
             end: Last day (inclusive interval). Format: YYYY-MM-DD
+            results_limit: Maximum number of articles returned, clamped to the top `MAX_RESPONSE_RESULTS`.
+            deadline_secs: Optional seconds after which failed requests are no longer retried,
+                so that their errors are reported instead of the whole call timing out.
+            offset: Number of top ranked articles skipped, to paginate the results.
 
         Returns:
             Sorted (descending) list of most read articles with total views and views history by date,
@@ -83,64 +286,497 @@ class WikiAPI:
             InvalidEndDateError: If `end` string date is not formatted correctly.
             InvalidDateRangeError: If `end` date is before `start` date.
             InvalidLanguageCodeError: If language code contains invalid characters.
+            InvalidPaginationError: If `results_limit` is less than 1, or `offset` is out of range.
+        """
+        results_limit = self._clamp_results_limit(results_limit, offset)
+        self.validate_pagination(results_limit, offset)
+
+        ranking = await self.fetch_most_read_articles_ranking(
+            lang_code, start, end, offset + results_limit, deadline_secs
+        )
+        return self.paginate_most_read_articles(ranking, results_limit, offset)
+
+    async def fetch_most_read_articles_ranking(
+        self,
+        lang_code: str,
+        start: str,
+        end: str,
+        ranking_depth=MAX_RESPONSE_RESULTS,
+        deadline_secs: float = None,
+    ) -> MostReadArticlesRanking:
+        """Fetches the top `ranking_depth` most read articles of a date range, which can be memoized
+        and paginated with `paginate_most_read_articles` instead of fetched again for every page.
+
+        Note:
+            Only the top `ranking_depth` articles are selected with a heap (partial sort).
+
+        Returns:
+            `MostReadArticlesRanking` of the top articles, the total number of articles and the URL errors.
+
+        Raises:
+            Same exceptions as `fetch_most_read_articles`.
+        """
+        rankings = await self.fetch_most_read_articles_rankings(
+            [lang_code], start, end, ranking_depth, deadline_secs
+        )
+        return rankings[lang_code]
+
+    async def fetch_most_read_articles_multi(
+        self,
+        lang_codes: list[str],
+        start: str,
+        end: str,
+        results_limit=MAX_RESPONSE_RESULTS,
+        deadline_secs: float = None,
+        offset: int = 0,
+    ) -> dict[str, any]:
+        """Fetches the most read articles of several languages for the same date range, e.g. to compare them.
+
+        Note:
+            The days of every language missing from the caching layer are scheduled through a single
+            rate limited pipeline, interleaved by day so that all languages progress evenly, and sent
+            on the HTTP/2 connections of each language's host (pooled if `http_limits` were provided).
+
+        Args:
+            lang_codes: Wikipedia language codes, duplicates are ignored.
+            start: Start day to retrieve from. Format: YYYY-MM-DD
+            end: Last day (inclusive interval). Format: YYYY-MM-DD
+            results_limit: Maximum number of articles returned per language.
+            deadline_secs: Optional seconds after which failed requests are no longer retried.
+            offset: Number of top ranked articles skipped per language, to paginate the results.
+
+        Returns:
+            Most read articles of each language (see `fetch_most_read_articles`) keyed by language code,
+            and the errors of all languages tagged with their language code.
+                ```
+                e.g. {
+                    data: {en: [{page: 'https://en.wikipedia...', total_views: 9000, ...}, ...], es: [...]},
+                    errors: [{lang_code: 'en', url: 'https://en.wikipedia...', message: 'Error connecting...'}, ...]
+                }
+                ```
+
+        Raises:
+            Same exceptions as `fetch_most_read_articles`, `InvalidLanguageCodeError` if any language code
+            is invalid or if there are none.
+        """
+        results_limit = self._clamp_results_limit(results_limit, offset)
+        self.validate_pagination(results_limit, offset)
+
+        rankings = await self.fetch_most_read_articles_rankings(
+            lang_codes, start, end, offset + results_limit, deadline_secs
+        )
+        return self.paginate_most_read_articles_multi(rankings, results_limit, offset)
+
+    async def fetch_most_read_articles_rankings(
+        self,
+        lang_codes: list[str],
+        start: str,
+        end: str,
+        ranking_depth=MAX_RESPONSE_RESULTS,
+        deadline_secs: float = None,
+    ) -> dict[str, MostReadArticlesRanking]:
+        """Fetches the top `ranking_depth` most read articles of a date range for each language,
+        see `fetch_most_read_articles_ranking` and `fetch_most_read_articles_multi`.
+
+        Returns:
+            `MostReadArticlesRanking` of each language keyed by language code, in order of `lang_codes`.
+
+        Raises:
+            Same exceptions as `fetch_most_read_articles_multi`.
         """
         start_date, end_date = self._parse_formatted_date_range(start, end)
 
-        # 🚨 Counterintuitively the Feed API Featured Content needs to be queried one day in the future.
-        #    to return the wanted date's most read articles.
-        shifted_start_date = start_date + timedelta(days=1)
-        shifted_end_date = end_date + timedelta(days=1)
+        # Structure: {lang_code: None}, ordered set of the language codes.
+        lang_codes = dict.fromkeys(lang_codes)
+        if not lang_codes or not all(
+            self._validate_language_code(lang_code) for lang_code in lang_codes
+        ):
+            raise InvalidLanguageCodeError
 
-        wiki_api_responses = await self._fetch_feed_api_featured_content_responses(
-            lang_code, shifted_start_date, shifted_end_date
+        # Fast path: Aggregate the whole date range of each language within the caching layer
+        # if it's able to, unless recent days are due for revalidation.
+        stale_lang_codes = await self._stale_cached_lang_codes(
+            list(lang_codes), start_date, end_date
         )
+        aggregated_lang_codes = [
+            lang_code for lang_code in lang_codes if lang_code not in stale_lang_codes
+        ]
+        cache_aggregations = await asyncio.gather(
+            *[
+                self._try_cache_aggregate_most_read_articles(
+                    lang_code, start_date, end_date, ranking_depth
+                )
+                for lang_code in aggregated_lang_codes
+            ]
+        )
+        rankings: dict[str, MostReadArticlesRanking] = {}
+        for lang_code, cache_aggregation in zip(
+            aggregated_lang_codes, cache_aggregations
+        ):
+            if cache_aggregation:
+                most_read_articles, total_articles = cache_aggregation
+                logging.info("CACHE AGGREGATION HIT: %s %s %s", lang_code, start, end)
+                rankings[lang_code] = MostReadArticlesRanking(
+                    most_read_articles, total_articles, []
+                )
 
-        successful_featured_content_responses = []
-        error_responses = []
-        for wiki_resp in wiki_api_responses:
-            if wiki_resp.exception:
-                # Unexpected expection
-                error_responses.append(
-                    self._format_wiki_api_error(wiki_resp.url, str(wiki_resp.exception))
+        uncached_lang_codes = [
+            lang_code for lang_code in lang_codes if lang_code not in rankings
+        ]
+        if uncached_lang_codes:
+            responses_by_lang_code = (
+                await self._fetch_featured_content_responses_by_language(
+                    uncached_lang_codes, start_date, end_date, deadline_secs
                 )
-            elif not wiki_resp.status_ok:
-                # Unexpected status code on API response
-                error_responses.append(
-                    self._format_wiki_api_error(
-                        wiki_resp.url, str(WikipediaResponseError())
-                    )
+            )
+            for lang_code in uncached_lang_codes:
+                rankings[lang_code] = self._rank_featured_content_responses(
+                    responses_by_lang_code[lang_code], ranking_depth
+                )
+
+        return {lang_code: rankings[lang_code] for lang_code in lang_codes}
+
+    async def get_cached_response_validators(
+        self, lang_codes: list[str], start: str, end: str
+    ) -> dict[str, tuple[str, ...]]:
+        """Looks up the validators of the cached Featured Content responses of a date range for each language
+        with a single `multi_get`, e.g. to derive the ETag of a result without aggregating it again.
+
+        Returns:
+            Validators of each language whose days are all cached, in date order: the upstream `etag`
+            or `last_modified` of each day, or its `cached_at` time. Languages with uncached days are not included.
+
+        Raises:
+            Same exceptions as `fetch_most_read_articles_multi`.
+        """
+        start_date, end_date = self._parse_formatted_date_range(start, end)
+        # 🚨 Feed API URLs are one day in the future of their views date.
+        urls_by_lang_code = {
+            lang_code: self._build_feed_api_featured_content_urls(
+                lang_code, start_date + timedelta(days=1), end_date + timedelta(days=1)
+            )
+            for lang_code in dict.fromkeys(lang_codes)
+        }
+        cached_responses = await self._try_cache_multi_get(
+            [url for urls in urls_by_lang_code.values() for url in urls]
+        )
+
+        # Structure: {lang_code: (validator, ...)}
+        validators: dict[str, tuple[str, ...]] = {}
+        for lang_code, urls in urls_by_lang_code.items():
+            lang_validators = []
+            for url in urls:
+                cached_resp = cached_responses.get(url)
+                validator = cached_resp and (
+                    cached_resp.etag
+                    or cached_resp.last_modified
+                    or (cached_resp.cached_at and cached_resp.cached_at.isoformat())
                 )
+                if not validator:
+                    break
+                lang_validators.append(validator)
             else:
-                # Successful API response
-                successful_featured_content_responses.append(wiki_resp.text)
+                validators[lang_code] = tuple(lang_validators)
+        return validators
+
+    @classmethod
+    def validate_pagination(cls, results_limit: int, offset: int):
+        """Validates a page is within the top `MAX_RESPONSE_RESULTS` articles.
+
+        Raises:
+            InvalidPaginationError: If `results_limit` is less than 1, `offset` is negative,
+                or `offset + results_limit` exceeds `MAX_RESPONSE_RESULTS`.
+        """
+        if (
+            results_limit < 1
+            or offset < 0
+            or offset + results_limit > cls.MAX_RESPONSE_RESULTS
+        ):
+            raise InvalidPaginationError
+
+    @classmethod
+    def _clamp_results_limit(cls, results_limit: int, offset: int) -> int:
+        """Clamps `results_limit` to the articles from `offset` up to the top `MAX_RESPONSE_RESULTS`,
+        e.g. so that library callers passing larger limits get the maximum instead of an error.
+        """
+        return min(results_limit, cls.MAX_RESPONSE_RESULTS - max(offset, 0))
 
-        most_read_articles = self._reduce_and_sort_featured_content_most_read_articles(
-            successful_featured_content_responses
+    def paginate_most_read_articles(
+        self, ranking: MostReadArticlesRanking, results_limit: int, offset: int = 0
+    ) -> dict[str, list]:
+        """Formats a page of `ranking` as a `fetch_most_read_articles` result.
+
+        Note:
+            🚨 Pages beyond the ranking depth are returned empty, the ranking should be fetched
+               with a depth of at least `offset + results_limit`.
+
+        Raises:
+            InvalidPaginationError: If `results_limit` is less than 1, or `offset` is out of range.
+        """
+        results_limit = self._clamp_results_limit(results_limit, offset)
+        self.validate_pagination(results_limit, offset)
+
+        return self._format_most_read_articles_result(
+            ranking.articles[offset : offset + results_limit],
+            ranking.total_articles,
+            results_limit,
+            # Copied as the ranking could be memoized.
+            list(ranking.errors),
+            offset,
         )
 
-        if len(most_read_articles) > results_limit:
-            url = ""
-            message = f"Limited response to {results_limit} out of {len(most_read_articles) } results."
-            error_responses.insert(0, self._format_wiki_api_error(url, message))
+    def paginate_most_read_articles_multi(
+        self,
+        rankings: dict[str, MostReadArticlesRanking],
+        results_limit: int,
+        offset: int = 0,
+    ) -> dict[str, any]:
+        """Formats a page of each language's ranking as a `fetch_most_read_articles_multi` result.
+
+        Raises:
+            InvalidPaginationError: If `results_limit` and `offset` are out of range.
+        """
+        data: dict[str, list[dict[str, any]]] = {}
+        errors: list[dict[str, str]] = []
+        for lang_code, ranking in rankings.items():
+            result = self.paginate_most_read_articles(ranking, results_limit, offset)
+            data[lang_code] = result["data"]
+            errors += [{"lang_code": lang_code, **error} for error in result["errors"]]
+        return {"data": data, "errors": errors}
+
+    async def stream_most_read_articles(
+        self,
+        lang_code: str,
+        start: str,
+        end: str,
+        results_limit=MAX_RESPONSE_RESULTS,
+        deadline_secs: float = None,
+        offset: int = 0,
+    ) -> AsyncIterator[dict[str, any]]:
+        """Streams the `fetch_most_read_articles` result one record at a time,
+        e.g. to serialize large results incrementally (NDJSON) instead of as a whole.
+
+        Yields:
+            Each most read article in descending order, followed by a trailer record with the errors.
+                ```
+                e.g. {page: 'https://en.wikipedia...', total_views: 9000, view_history: [...], ...}
+                     ...
+                     {errors: [{url: 'https://en.wikipedia...', message: 'Error connecting...'}, ...]}
+                ```
+
+        Raises:
+            Same exceptions as `fetch_most_read_articles`.
+        """
+        result = await self.fetch_most_read_articles(
+            lang_code, start, end, results_limit, deadline_secs, offset
+        )
+        for record in iter_most_read_articles_records(result):
+            yield record
+
+    async def fetch_featured_content_responses(
+        self,
+        lang_code: str,
+        start_date: datetime,
+        end_date: datetime,
+        deadline_secs: float = None,
+    ) -> list[WikiAPIResponse]:
+        """Fetches the Feed API Featured Content responses of a date range through the caching layer,
+        e.g. to backfill the cache without aggregating the most read articles.
+
+        Note:
+            Responses missing from the caching layer are fetched concurrently (rate limited)
+            and stored in chunks with `put_many` as they complete.
+
+        Args:
+            lang_code: Wikipedia language code.
+            start_date: Start day of views to retrieve.
+            end_date: Last day of views (inclusive).
+            deadline_secs: Optional seconds after which failed requests are no longer retried.
+
+        Returns:
+            List of Feed API Featured Content responses, not necessarily in date order.
+
+        Raises:
+            InvalidLanguageCodeError: If language code contains invalid characters.
+        """
+        if not self._validate_language_code(lang_code):
+            raise InvalidLanguageCodeError
+
+        responses_by_lang_code = (
+            await self._fetch_featured_content_responses_by_language(
+                [lang_code], start_date, end_date, deadline_secs
+            )
+        )
+        return responses_by_lang_code[lang_code]
 
+    def retry_stats(self) -> dict[str, int]:
+        """Returns the retry counters:
+        `retries` sent, `recovered` requests succeeding after a retry, `exhausted` requests failing
+        after `max_retries`, and `abandoned` requests not retried due to their deadline or `Retry-After`.
+        """
         return {
-            "data": most_read_articles[:results_limit],
-            "errors": error_responses,
+            key: self._retry_counters[key]
+            for key in ("retries", "recovered", "exhausted", "abandoned")
         }
 
+    def revalidation_stats(self) -> dict[str, int]:
+        """Returns the revalidation counters:
+        conditional `revalidations` sent, `not_modified` responses, and `stale_fallbacks` returning
+        the cached response after a failed revalidation.
+        """
+        return {
+            key: self._revalidation_counters[key]
+            for key in ("revalidations", "not_modified", "stale_fallbacks")
+        }
+
+    async def aclose(self):
+        """Closes the long-lived HTTP clients, if any."""
+        http_clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for client in http_clients:
+            await client.aclose()
+
     # MARK: - Private Functions
 
+    @asynccontextmanager
+    async def _open_http_client(self, host: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Yields the pooled HTTP/2 client for `host` if `http_limits` were provided,
+        otherwise a short-lived client closed on exit.
+        """
+        headers = self._build_api_request_headers()
+        if self.http_limits is None:
+            async with httpx.AsyncClient(http2=True, headers=headers) as client:
+                yield client
+            return
+
+        client = self._http_clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=True, headers=headers, limits=self.http_limits
+            )
+            self._http_clients[host] = client
+        yield client
+
     def _format_wiki_api_error(self, url: str, message: str) -> dict[str, str]:
         return {"url": url, "message": message}
 
-    def _try_cache_get(self, url: str) -> WikiAPIResponse:
+    def _format_most_read_articles_result(
+        self,
+        most_read_articles: list[dict[str, any]],
+        total_articles: int,
+        results_limit: int,
+        error_responses: list[dict[str, str]],
+        offset: int = 0,
+    ) -> dict[str, list]:
+        message = None
+        if offset:
+            message = f"Limited response to {len(most_read_articles)} results from offset {offset} out of {total_articles} results."
+        elif total_articles > results_limit:
+            message = (
+                f"Limited response to {results_limit} out of {total_articles} results."
+            )
+        if message:
+            url = ""
+            error_responses.insert(0, self._format_wiki_api_error(url, message))
+
+        return {
+            "data": most_read_articles,
+            "errors": error_responses,
+        }
+
+    async def _try_cache_aggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
         if isinstance(self.optional_cache, WikiCache):
-            return self.optional_cache.get(url)
+            return await self.optional_cache.aaggregate_most_read_articles(
+                lang_code, start_date, end_date, limit
+            )
         return None
 
-    def _try_cache_put(self, wiki_resp: WikiAPIResponse):
+    async def _try_cache_multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
         if isinstance(self.optional_cache, WikiCache):
-            self.optional_cache.put(wiki_resp)
+            return await self.optional_cache.amulti_get(urls)
+        return {}
+
+    async def _try_cache_put(self, wiki_resp: WikiAPIResponse):
+        if isinstance(self.optional_cache, WikiCache):
+            await self.optional_cache.aput(wiki_resp)
+
+    async def _try_cache_put_many(self, wiki_resps: list[WikiAPIResponse]):
+        if isinstance(self.optional_cache, WikiCache) and wiki_resps:
+            await self.optional_cache.aput_many(wiki_resps)
+
+    async def _try_cache_touch_many(self, urls: list[str]):
+        if isinstance(self.optional_cache, WikiCache) and urls:
+            await self.optional_cache.atouch_many(urls)
+
+    def _is_stale_cached_response(
+        self, cached_resp: WikiAPIResponse, views_date: datetime
+    ) -> bool:
+        """Checks whether a cached response of `views_date` is due for revalidation."""
+        if self.revalidate_after_secs is None or cached_resp.cached_at is None:
+            return False
+        if is_final_views_date(views_date):
+            return False
+        cached_secs = (datetime.now() - cached_resp.cached_at).total_seconds()
+        return cached_secs >= self.revalidate_after_secs
+
+    async def _stale_cached_lang_codes(
+        self, lang_codes: list[str], start_date: datetime, end_date: datetime
+    ) -> set[str]:
+        """Returns the languages whose cached responses of the days of a date range that can still change
+        are due for revalidation, looking up only those days of every language with a single `multi_get`.
+        """
+        if self.revalidate_after_secs is None:
+            return set()
+
+        recent_start_date = end_date
+        while recent_start_date > start_date and not is_final_views_date(
+            recent_start_date - timedelta(days=1)
+        ):
+            recent_start_date -= timedelta(days=1)
+        if is_final_views_date(recent_start_date):
+            return set()
+
+        # 🚨 Feed API URLs are one day in the future of their views date.
+        api_urls_by_lang_code = {
+            lang_code: self._build_feed_api_featured_content_urls(
+                lang_code,
+                recent_start_date + timedelta(days=1),
+                end_date + timedelta(days=1),
+            )
+            for lang_code in lang_codes
+        }
+        cached_responses = await self._try_cache_multi_get(
+            [url for api_urls in api_urls_by_lang_code.values() for url in api_urls]
+        )
+        return {
+            lang_code
+            for lang_code, api_urls in api_urls_by_lang_code.items()
+            if any(
+                self._is_stale_cached_response(
+                    cached_responses[url], recent_start_date + timedelta(days=index)
+                )
+                for index, url in enumerate(api_urls)
+                if url in cached_responses
+            )
+        }
+
+    async def _try_cache_acquire_fetch_leases(self, urls: list[str]) -> list[str]:
+        if isinstance(self.optional_cache, WikiCache):
+            return await self.optional_cache.aacquire_fetch_leases(
+                urls, self._lease_owner, self.FETCH_LEASE_SECS
+            )
+        return urls
+
+    async def _try_cache_leased_fetch_urls(self, urls: list[str]) -> list[str]:
+        if isinstance(self.optional_cache, WikiCache):
+            return await self.optional_cache.aleased_fetch_urls(urls)
+        return []
+
+    async def _try_cache_release_fetch_leases(self, urls: list[str]):
+        if isinstance(self.optional_cache, WikiCache) and urls:
+            await self.optional_cache.arelease_fetch_leases(urls, self._lease_owner)
 
     def _validate_featured_content_mostread_response(
         self, resp: WikiAPIResponse
@@ -150,13 +786,69 @@ class WikiAPI:
         """
         if resp.exception or not resp.status_ok or not resp.url or not resp.text:
             return False
-        featured_content = json.loads(resp.text)
+        featured_content = default_json_codec.loads(resp.text)
         return len(featured_content.get("mostread", {})) > 0
 
+    async def _fetch_featured_content_responses_by_language(
+        self,
+        lang_codes: list[str],
+        start_date: datetime,
+        end_date: datetime,
+        deadline_secs: float = None,
+    ) -> dict[str, list[WikiAPIResponse]]:
+        """Fetches the Feed API Featured Content responses of a date range for each language,
+        see `fetch_featured_content_responses`.
+
+        Note:
+            The days of all languages are fetched together, interleaved by day, so that a single
+            rate limited pipeline serves every language evenly.
+
+        Returns:
+            Lists of Feed API Featured Content responses keyed by language code.
+
+        Raises:
+            InvalidLanguageCodeError: If a language code contains invalid characters.
+        """
+        # 🚨 Counterintuitively the Feed API Featured Content needs to be queried one day in the future.
+        #    to return the wanted date's most read articles.
+        shifted_start_date = start_date + timedelta(days=1)
+        shifted_end_date = end_date + timedelta(days=1)
+        lang_codes_urls = [
+            self._build_feed_api_featured_content_urls(
+                lang_code, shifted_start_date, shifted_end_date
+            )
+            for lang_code in lang_codes
+        ]
+
+        # Structure: {url: (lang_code, views date)}, in order of day then language.
+        api_urls: dict[str, tuple[str, datetime]] = {}
+        for day_index, day_urls in enumerate(zip(*lang_codes_urls)):
+            views_date = start_date + timedelta(days=day_index)
+            for lang_code, url in zip(lang_codes, day_urls):
+                api_urls[url] = (lang_code, views_date)
+
+        deadline = None
+        if deadline_secs is not None:
+            deadline = asyncio.get_running_loop().time() + deadline_secs
+        # Tasks started by the fetch inherit a copy of the current context, including the deadline.
+        deadline_token = _request_deadline.set(deadline)
+        try:
+            wiki_api_responses = await self._fetch_feed_api_featured_content_responses(
+                {url: views_date for url, (_, views_date) in api_urls.items()}
+            )
+        finally:
+            _request_deadline.reset(deadline_token)
+
+        responses_by_lang_code = {lang_code: [] for lang_code in lang_codes}
+        for wiki_resp in wiki_api_responses:
+            lang_code, _ = api_urls[wiki_resp.url]
+            responses_by_lang_code[lang_code].append(wiki_resp)
+        return responses_by_lang_code
+
     async def _fetch_feed_api_featured_content_responses(
-        self, lang_code: str, start_date: datetime, end_date: datetime
+        self, api_urls: dict[str, datetime]
     ) -> list[WikiAPIResponse]:
-        """Gets a list of responses from Wikipedia's Feed API Featured Content for a date range.
+        """Gets a list of responses from Wikipedia's Feed API Featured Content URLs, of any languages.
 
         This function runs concurrent API requests taking advantage of HTTP/2
         and throttles `MAX_REQUESTS_PER_SEC` active requests per second.
@@ -166,25 +858,30 @@ class WikiAPI:
                 e.g. To get featured content for 2023/12/31, we need to request one day forward (2024/01/01).
 
         Args:
-            lang_code: Wikipedia language code.
-            start_date: Start day of range.
-            end_date: Last day of range (inclusive).
+            api_urls: Feed API Featured Content URLs and the views date of their most read articles,
+                i.e. one day before the URL's date. Structure: {url: views date}
 
         Returns:
             List of Feed API Featured Content responses.
               e.g. `[WikiAPIResponse(url, response, exception), ... ]`
         """
 
-        api_urls = self._build_feed_api_featured_content_urls(
-            lang_code, start_date, end_date
-        )
-
-        # Get cached responses and filter out missing ones for subsequent API fetch calls.
+        # Get cached responses in a single group fetch and filter out missing ones
+        # for subsequent API fetch calls, along with stale ones to revalidate.
+        cached_responses = await self._try_cache_multi_get(list(api_urls))
         cache_hit_responses = []
         cache_missed_urls = []
-        for url in api_urls:
-            cached_response = self._try_cache_get(url)
-            if cached_response:
+        # Structure: {url: WikiAPIResponse}
+        stale_responses: dict[str, WikiAPIResponse] = {}
+        for url, views_date in api_urls.items():
+            cached_response = cached_responses.get(url)
+            if cached_response and self._is_stale_cached_response(
+                cached_response, views_date
+            ):
+                logging.info("CACHE STALE: %s" % url)
+                stale_responses[url] = cached_response
+                cache_missed_urls.append(url)
+            elif cached_response:
                 logging.info("CACHE HIT: %s" % url)
                 cache_hit_responses.append(cached_response)
             else:
@@ -192,143 +889,469 @@ class WikiAPI:
 
         if not cache_missed_urls:
             return cache_hit_responses
-        else:
-            # Request Wikipedia Feed API for Featured Content concurrently
-            # using HTTP/2 and limiting active requests per second.
-            headers = self._build_api_request_headers()
-            async with httpx.AsyncClient(http2=True, headers=headers) as client:
-                fetch_tasks = [
-                    self.fetch_wiki_api_response(
-                        url,
-                        client,
-                        response_validator=self._validate_featured_content_mostread_response,
-                    )
-                    for url in cache_missed_urls
-                ]
-                fetched_responses: list[WikiAPIResponse] = (
-                    await self.aio_rate_limiter.run_rate_limited_tasks(
-                        coros=fetch_tasks
-                    )
+
+        # Lease the missed URLs in the caching layer, so that other processes sharing it wait for
+        # these fetches instead of sending duplicate requests, and vice versa.
+        leased_urls = set(await self._try_cache_acquire_fetch_leases(cache_missed_urls))
+        foreign_leased_urls = [
+            url for url in cache_missed_urls if url not in leased_urls
+        ]
+        try:
+            fetched_results, awaited_responses = await asyncio.gather(
+                self._fetch_rate_limited_featured_content_responses(
+                    [url for url in cache_missed_urls if url in leased_urls],
+                    stale_responses,
+                ),
+                self._wait_for_cached_responses(
+                    foreign_leased_urls, timeout=self.FETCH_LEASE_SECS
+                ),
+            )
+            # Fetch the responses that other processes didn't cache before their leases expired.
+            fetched_results += (
+                await self._fetch_rate_limited_featured_content_responses(
+                    [
+                        url
+                        for url in foreign_leased_urls
+                        if url not in awaited_responses
+                    ],
+                    stale_responses,
                 )
-            return cache_hit_responses + fetched_responses
+            )
+        finally:
+            await self._try_cache_release_fetch_leases(list(leased_urls))
+
+        return (
+            cache_hit_responses
+            + list(awaited_responses.values())
+            + [wiki_resp for wiki_resp, _ in fetched_results]
+        )
+
+    async def _fetch_rate_limited_featured_content_responses(
+        self, urls: list[str], stale_responses: dict[str, WikiAPIResponse] = None
+    ) -> list[tuple[WikiAPIResponse, bool]]:
+        """Requests Wikipedia Feed API for Featured Content concurrently
+        using HTTP/2 and limiting active requests per second.
+
+        Args:
+            urls: Feed API Featured Content URLs.
+            stale_responses: Optional cached responses by URL to revalidate with conditional requests.
+
+        Note:
+            Valid responses are cached as they're fetched, so that the days fetched before
+            the request is cancelled (e.g. `SERVER_TIMEOUT_SECS`) aren't fetched again on retry.
+            They're written in chunks with `put_many`: the responses completed while a chunk is being
+            written are written together by the next one, on a task that outlives a cancelled request.
+
+        Returns:
+            List of tuples (`wiki_resp`, `is_valid`) in the same order as `urls`.
+        """
+        if not urls:
+            return []
+
+        # Valid responses waiting for the next chunk write.
+        pending_resps: list[WikiAPIResponse] = []
+        chunk_writer: asyncio.Task = None
+
+        async def write_pending_chunks():
+            while pending_resps:
+                chunk = pending_resps.copy()
+                pending_resps.clear()
+                await self._try_cache_put_many(chunk)
+
+        async def fetch_and_cache(
+            url: str, client: httpx.AsyncClient
+        ) -> tuple[WikiAPIResponse, bool]:
+            nonlocal chunk_writer
+            wiki_resp, is_valid = await self._fetch_and_validate_wiki_api_response(
+                url,
+                client,
+                response_validator=self._validate_featured_content_mostread_response,
+                cached_resp=(stale_responses or {}).get(url),
+            )
+            if is_valid:
+                pending_resps.append(wiki_resp)
+                if chunk_writer is None or chunk_writer.done():
+                    chunk_writer = asyncio.create_task(write_pending_chunks())
+            return (wiki_resp, is_valid)
+
+        async with AsyncExitStack() as exit_stack:
+            # Structure: {host: AsyncClient}, the URLs of each language are sent on their host's connections.
+            clients: dict[str, httpx.AsyncClient] = {}
+            for url in urls:
+                host = urlsplit(url).netloc
+                if host not in clients:
+                    clients[host] = await exit_stack.enter_async_context(
+                        self._open_http_client(host)
+                    )
+
+            fetch_tasks = [
+                fetch_and_cache(url, clients[urlsplit(url).netloc]) for url in urls
+            ]
+            fetched_results = await self.aio_rate_limiter.run_rate_limited_tasks(
+                coros=fetch_tasks
+            )
+
+        # Return once every valid response is written.
+        if chunk_writer:
+            await chunk_writer
+        return fetched_results
+
+    async def _wait_for_cached_responses(
+        self, urls: list[str], timeout: float
+    ) -> dict[str, WikiAPIResponse]:
+        """Polls the caching layer for `urls` being fetched by other processes, until they're cached
+        or their leases are released (e.g. failed fetches) or expired.
+
+        Returns:
+            Dictionary of responses cached before `timeout` by URL.
+        """
+        cached_responses: dict[str, WikiAPIResponse] = {}
+        if not urls:
+            return cached_responses
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending_urls = urls
+        while True:
+            # Leases are checked first, as their owners release them after caching the responses.
+            leased_urls = set(await self._try_cache_leased_fetch_urls(pending_urls))
+            cached_responses.update(await self._try_cache_multi_get(pending_urls))
+            pending_urls = [
+                url
+                for url in pending_urls
+                if url not in cached_responses and url in leased_urls
+            ]
+            if not pending_urls or loop.time() >= deadline:
+                return cached_responses
+            await asyncio.sleep(self.FETCH_LEASE_POLL_INTERVAL_SECS)
 
     async def fetch_wiki_api_response(
         self,
         url: str,
         client: httpx.AsyncClient,
         response_validator: Callable[[WikiAPIResponse], bool],
+        cached_resp: WikiAPIResponse = None,
     ) -> WikiAPIResponse:
+        """Fetches `url` and caches the response if it's valid.
+
+        Args:
+            url: Wikipedia API URL.
+            client: HTTP client sending the request.
+            response_validator: Checks whether a response should be cached.
+            cached_resp: Optional cached response of `url` to revalidate with a conditional request
+                (`If-None-Match` / `If-Modified-Since`), a 304 response only bumps its cached time.
+
+        Returns:
+            The fetched response, or `cached_resp` if it was not modified or the revalidation failed.
+        """
+        wiki_resp, is_valid = await self._fetch_and_validate_wiki_api_response(
+            url, client, response_validator, cached_resp
+        )
+        if is_valid:
+            await self._try_cache_put(wiki_resp)
+        return wiki_resp
+
+    async def _fetch_and_validate_wiki_api_response(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        response_validator: Callable[[WikiAPIResponse], bool],
+        cached_resp: WikiAPIResponse = None,
+    ) -> tuple[WikiAPIResponse, bool]:
+        """Fetches `url` and validates the response eligibility for caching.
+
+        Concurrent fetches of the same URL are coalesced: later callers await the first caller's
+        response instead of sending their own request.
+
+        A stale `cached_resp` is revalidated with a conditional request, and returned (not valid)
+        if it was not modified or if the revalidation failed, instead of an error.
+
+        Returns:
+            Tuple (`wiki_resp`, `is_valid`), where `is_valid` is True if the response should be cached.
+            `is_valid` is always False for coalesced callers, as the first caller caches the response.
+        """
+        loop = asyncio.get_running_loop()
+        in_flight_fetch = self._in_flight_fetches.get(url)
+        if in_flight_fetch is not None and in_flight_fetch.get_loop() is loop:
+            logging.info("COALESCED FETCH: %s" % url)
+            result = await asyncio.shield(in_flight_fetch)
+            # The first caller was cancelled before completing its fetch.
+            if result is not None:
+                wiki_resp, _ = result
+                return (wiki_resp, False)
+
+        in_flight_fetch = loop.create_future()
+        self._in_flight_fetches[url] = in_flight_fetch
+        result = None
+        try:
+            result = await self._send_wiki_api_request_with_retries(
+                url, client, response_validator, cached_resp
+            )
+            if cached_resp is not None and not result[1]:
+                if result[0] is not cached_resp:
+                    logging.warning("STALE RESPONSE FALLBACK: %s" % url)
+                    self._revalidation_counters["stale_fallbacks"] += 1
+                result = (cached_resp, False)
+            return result
+        finally:
+            in_flight_fetch.set_result(result)
+            if self._in_flight_fetches.get(url) is in_flight_fetch:
+                del self._in_flight_fetches[url]
+
+    async def _send_wiki_api_request_with_retries(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        response_validator: Callable[[WikiAPIResponse], bool],
+        cached_resp: WikiAPIResponse = None,
+    ) -> tuple[WikiAPIResponse, bool]:
+        """Sends a request to `url`, retrying transient failures up to `max_retries` times
+        with jittered exponential backoff.
+
+        Note:
+            Each retry waits at least the `Retry-After` response header delay and takes a token from the
+            rate limiter, so that retries count against the requests per second budget.
+            A retry that can't start before the `fetch_most_read_articles` deadline is abandoned,
+            returning the last failed response.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = _request_deadline.get()
+        retries = 0
+        while True:
+            wiki_resp, is_valid, retry_after = await self._send_wiki_api_request(
+                url, client, response_validator, cached_resp
+            )
+            if retry_after is None:
+                if retries:
+                    self._retry_counters[
+                        "recovered" if wiki_resp.status_ok else "exhausted"
+                    ] += 1
+                return (wiki_resp, is_valid)
+
+            if retries >= self.max_retries:
+                if retries:
+                    self._retry_counters["exhausted"] += 1
+                return (wiki_resp, is_valid)
+
+            delay = max(retry_after, self._retry_backoff_delay(retries))
+            if retry_after > self.MAX_RETRY_AFTER_SECS or (
+                deadline is not None and loop.time() + delay >= deadline
+            ):
+                logging.warning("RETRY ABANDONED: %s" % url)
+                self._retry_counters["abandoned"] += 1
+                return (wiki_resp, is_valid)
+
+            await asyncio.sleep(delay)
+            await self.aio_rate_limiter.acquire_token()
+            retries += 1
+            self._retry_counters["retries"] += 1
+            logging.warning("RETRY #%d: %s", retries, url)
+
+    def _retry_backoff_delay(self, retries: int) -> float:
+        """Returns a random delay between 0 and the exponential backoff of `retries` (full jitter),
+        so that concurrent retries are spread out instead of hitting the API at once.
+        """
+        backoff = min(
+            self.RETRY_MAX_DELAY_SECS, self.RETRY_BASE_DELAY_SECS * 2**retries
+        )
+        return random.uniform(0, backoff)
+
+    async def _send_wiki_api_request(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        response_validator: Callable[[WikiAPIResponse], bool],
+        cached_resp: WikiAPIResponse = None,
+    ) -> tuple[WikiAPIResponse, bool, float]:
+        """Sends a single request to `url`, conditional on the validators of `cached_resp` if any.
+
+        Returns:
+            Tuple (`wiki_resp`, `is_valid`, `retry_after`), where `retry_after` is None if the request
+            shouldn't be retried, otherwise the minimum seconds to wait before retrying.
+            `wiki_resp` is `cached_resp` if it was not modified (304), after bumping its cached time.
+        """
         try:
             logging.info("Fetching: %s" % url)
-            http_response = await client.get(url)
+            headers = self._build_conditional_request_headers(cached_resp)
+            if headers:
+                self._revalidation_counters["revalidations"] += 1
+            http_response = await client.get(url, headers=headers)
+            if (
+                cached_resp is not None
+                and http_response.status_code == self.NOT_MODIFIED_STATUS_CODE
+            ):
+                logging.info("NOT MODIFIED: %s" % url)
+                self._revalidation_counters["not_modified"] += 1
+                await self._try_cache_touch_many([url])
+                return (cached_resp, False, None)
+
             wiki_resp = WikiAPIResponse(
-                url, http_response.status_code == 200, http_response.text, None
+                url,
+                http_response.status_code == 200,
+                http_response.text,
+                None,
+                etag=http_response.headers.get("etag"),
+                last_modified=http_response.headers.get("last-modified"),
             )
             # Validate response eligibility for caching:
             # e.g. Cache Featured Content response only if mostread articles object is present.
-            if response_validator(wiki_resp):
+            is_valid = response_validator(wiki_resp)
+            if is_valid:
                 logging.info("CACHE PUT: %s" % url)
-                self._try_cache_put(wiki_resp)
-            return wiki_resp
+
+            retry_after = None
+            if http_response.status_code in self.RETRYABLE_STATUS_CODES:
+                retry_after = parse_retry_after(
+                    http_response.headers.get("retry-after")
+                )
+            return (wiki_resp, is_valid, retry_after)
         except httpx.HTTPError as e:
             logging.error(
                 "Wikipedia API Connection Error for request: %s. Error: %s",
                 e.request,
                 e,
             )
-            return WikiAPIResponse(url, False, None, WikipediaConnectionError())
+            # Timeouts and dropped connections are transient, unlike e.g. unresolvable hosts.
+            is_transient = isinstance(
+                e, (httpx.TimeoutException, httpx.RemoteProtocolError)
+            )
+            return (
+                WikiAPIResponse(url, False, None, WikipediaConnectionError()),
+                False,
+                0.0 if is_transient else None,
+            )
         except Exception as e:
-            return WikiAPIResponse(url, False, None, e)
+            return (WikiAPIResponse(url, False, None, e), False, None)
+
+    def _rank_featured_content_responses(
+        self, wiki_api_responses: list[WikiAPIResponse], ranking_depth: int
+    ) -> MostReadArticlesRanking:
+        """Ranks the top `ranking_depth` most read articles of the successful Featured Content responses,
+        reporting the URL errors of the other ones.
+        """
+        successful_featured_content_responses = []
+        error_responses = []
+        for wiki_resp in wiki_api_responses:
+            if wiki_resp.exception:
+                # Unexpected expection
+                error_responses.append(
+                    self._format_wiki_api_error(wiki_resp.url, str(wiki_resp.exception))
+                )
+            elif not wiki_resp.status_ok:
+                # Unexpected status code on API response
+                error_responses.append(
+                    self._format_wiki_api_error(
+                        wiki_resp.url, str(WikipediaResponseError())
+                    )
+                )
+            else:
+                # Successful API response
+                successful_featured_content_responses.append(wiki_resp.text)
+
+        most_read_articles, total_articles = (
+            self._reduce_and_sort_featured_content_most_read_articles(
+                successful_featured_content_responses, ranking_depth
+            )
+        )
+        return MostReadArticlesRanking(
+            most_read_articles, total_articles, error_responses
+        )
 
     def _reduce_and_sort_featured_content_most_read_articles(
-        self, featured_content_responses: list[str]
-    ) -> list[list[str, any]]:
+        self, featured_content_responses: list[str], results_limit: int = None
+    ) -> tuple[list[dict[str, any]], int]:
         """Reduces and sorts (DESC) most read articles total views from Wikipedia's Feed API Featured Content responses.
 
         Args:
             featured_content_responses: List of Feed API Featured Content responses.
                 e.g. `['{"tfa": ..., "mostread": ...', ...]`
+            results_limit: Optional number of top articles returned, selected with a heap in O(n log k)
+                instead of sorting all articles.
 
         Returns:
-            Sorted list of most read articles with total views and views history by date.
+            Tuple (`most_read_articles`, `total_articles`):
+            Sorted list of the top most read articles with total views and views history by date.
                 e.g. `[{page: 'https://en.wikipedia...', total_views: 9000, view_history: [{date: '2020-12-30', views: 4500}], ...]`
                 🚨 Note that views_history only contains views for days where the article was featured in the day's top 50.
+            Total number of articles before the limit.
 
         Raises:
             WikipediaContentProcessingError: If there's a JSON decoding or content integrity errors in `featured_content_responses`.
         """
+        if self.aggregation_engine == COLUMNAR_AGGREGATION_ENGINE:
+            return self._reduce_columnar_featured_content_most_read_articles(
+                featured_content_responses, results_limit
+            )
+
         # Structure: {pageid: {page, total_views, view_history: [date, views]}, ...}
         articles_stats: dict[int, dict[str, any]] = {}
 
         for response in featured_content_responses:
-            try:
-                json_content = json.loads(response)
-            except json.decoder.JSONDecodeError:
-                logging.error("Invalid featured content JSON response: %s", response)
-                raise WikipediaContentProcessingError
+            parsed_content = parse_featured_content_most_read_articles(response)
 
             # "mostread.articles" might not be present if the requested date was today (still measuring views).
-            if not "mostread" in json_content:
+            if not parsed_content:
                 continue
 
-            try:
-                # Parse date from response
-                views_date = datetime.strptime(
-                    json_content["mostread"]["date"], "%Y-%m-%dZ"
-                )
-                for article in json_content["mostread"]["articles"]:
-                    page_id = int(article["pageid"])
-                    views = int(article["views"])
-
-                    # Prepare new article stats slot for aggregation.
-                    if page_id not in articles_stats:
-                        articles_stats[page_id] = {
-                            # We could add more article details like "description" or "thumbnail".
-                            "page": article["content_urls"]["desktop"]["page"],
-                            "total_views": 0,
-                            "view_history": [],
-                        }
-
-                    articles_stats[page_id]["total_views"] += views
-
-                    # Aggregate view history using ISO 8601 Date format.
-                    articles_stats[page_id]["view_history"].append(
-                        {
-                            "date": views_date.strftime("%Y-%m-%d"),
-                            "views": views,
-                        }
-                    )
-            except KeyError as e:
-                logging.error(
-                    "Missing key in article object (%s) from Feed API response: %s",
-                    e,
-                    response,
+            views_date, articles = parsed_content
+            # Aggregate view history using ISO 8601 Date format.
+            formatted_views_date = views_date.strftime("%Y-%m-%d")
+            for article in articles:
+                # Prepare new article stats slot for aggregation.
+                if article.pageid not in articles_stats:
+                    articles_stats[article.pageid] = {
+                        # We could add more article details like "description" or "thumbnail".
+                        "page": article.page,
+                        "total_views": 0,
+                        "view_history": [],
+                    }
+
+                articles_stats[article.pageid]["total_views"] += article.views
+                articles_stats[article.pageid]["view_history"].append(
+                    {
+                        "date": formatted_views_date,
+                        "views": article.views,
+                    }
                 )
-                raise WikipediaContentProcessingError
-            except ValueError as e:
-                logging.error(
-                    "Unexpected value in article object (%s) from Feed API response: %s",
-                    e,
-                    response,
-                )
-                raise WikipediaContentProcessingError
 
-        # Extract and sort article URLs by total views in descending order.
+        total_articles = len(articles_stats)
+        if results_limit is None:
+            results_limit = total_articles
+
+        # Extract the top article URLs by total views in descending order.
+        # 💡 `heapq.nlargest` is equivalent to a stable sort sliced to `results_limit`,
+        #    so articles with equal total views keep their order of appearance.
         ranked_pageids = [
             item[0]
-            for item in sorted(
+            for item in heapq.nlargest(
+                results_limit,
                 articles_stats.items(),
                 key=lambda item: item[1]["total_views"],
-                reverse=True,
             )
         ]
 
         # Build a sorted array of article_stats objects:
         # e.g. [{page, total_views, view_history}, ...]
-        return [
-            {**{"pageid": page_id}, **articles_stats[page_id]}
-            for page_id in ranked_pageids
-        ]
+        return (
+            [
+                {**{"pageid": page_id}, **articles_stats[page_id]}
+                for page_id in ranked_pageids
+            ],
+            total_articles,
+        )
+
+    def _reduce_columnar_featured_content_most_read_articles(
+        self, featured_content_responses: list[str], results_limit: int = None
+    ) -> tuple[list[dict[str, any]], int]:
+        """Columnar engine of `_reduce_and_sort_featured_content_most_read_articles`."""
+        aggregator = ColumnarMostReadArticlesAggregator()
+        for response in featured_content_responses:
+            parsed_content = parse_featured_content_most_read_articles(response)
+            # "mostread.articles" might not be present if the requested date was today (still measuring views).
+            if parsed_content:
+                aggregator.add_day(*parsed_content)
+
+        return (aggregator.top_articles(results_limit), aggregator.total_articles)
 
     def _build_feed_api_featured_content_urls(
         self, lang_code: str, start_date: datetime, end_date: datetime
@@ -400,6 +1423,23 @@ class WikiAPI:
 
         return (start_date, end_date)
 
+    def _build_conditional_request_headers(
+        self, cached_resp: WikiAPIResponse
+    ) -> dict[str, str]:
+        """Builds the `If-None-Match` / `If-Modified-Since` headers from the validators of a cached response.
+
+        Returns:
+            Dictionary with the request headers, empty if there's no cached response or validators.
+        """
+        headers = {}
+        if cached_resp is None:
+            return headers
+        if cached_resp.etag:
+            headers["if-none-match"] = cached_resp.etag
+        if cached_resp.last_modified:
+            headers["if-modified-since"] = cached_resp.last_modified
+        return headers
+
     def _build_api_request_headers(self) -> dict[str, str]:
         """Builds the headers for a Wikipedia API request to indicate:
         - User Agent
@@ -415,6 +1455,159 @@ class WikiAPI:
         return headers
 
 
+# MARK: - Result Streaming
+
+
+def iter_most_read_articles_records(
+    result: dict[str, list],
+) -> Iterator[dict[str, any]]:
+    """Iterates a `fetch_most_read_articles` result as streaming records:
+    each article of `data`, followed by a trailer record `{errors: [...]}`.
+
+    Note:
+        Articles of a `fetch_most_read_articles_multi` result are tagged with their language code,
+        e.g. `{lang_code: 'en', page: 'https://en.wikipedia...', ...}`
+    """
+    if isinstance(result["data"], dict):
+        for lang_code, articles in result["data"].items():
+            for article in articles:
+                yield {"lang_code": lang_code, **article}
+    else:
+        yield from result["data"]
+    yield {"errors": result["errors"]}
+
+
+# MARK: - HTTP Headers Parsing
+
+
+def parse_retry_after(retry_after: str) -> float:
+    """Parses a `Retry-After` header value, either delay seconds or an HTTP date.
+
+    Returns:
+        Seconds to wait before retrying, 0 if the header is missing or invalid.
+    """
+    if not retry_after:
+        return 0.0
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return 0.0
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+# MARK: - Featured Content Parsing
+
+
+def is_final_views_date(views_date: datetime) -> bool:
+    """Checks whether the most read articles of `views_date` can no longer change,
+    i.e. `views_date` is before yesterday (UTC).
+    """
+    yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+    return views_date.date() < yesterday
+
+
+def parse_featured_content_most_read_articles(
+    featured_content_response: str,
+) -> tuple[datetime, list[MostReadArticle]]:
+    """Parses the most read articles from a Wikipedia's Feed API Featured Content response.
+
+    Args:
+        featured_content_response: Feed API Featured Content response.
+            e.g. `'{"tfa": ..., "mostread": ...'`
+
+    Returns:
+        Tuple (`views_date`, `articles`) in the same order as the response's "mostread.articles",
+        or None if the response doesn't contain the "mostread" object.
+
+    Raises:
+        WikipediaContentProcessingError: If there's a JSON decoding or content integrity error in `featured_content_response`.
+    """
+    try:
+        json_content = default_json_codec.loads(featured_content_response)
+    except json.JSONDecodeError:
+        logging.error(
+            "Invalid featured content JSON response: %s", featured_content_response
+        )
+        raise WikipediaContentProcessingError
+
+    if not "mostread" in json_content:
+        return None
+
+    try:
+        # Parse date from response
+        views_date = datetime.strptime(json_content["mostread"]["date"], "%Y-%m-%dZ")
+        articles = [
+            MostReadArticle(
+                int(article["pageid"]),
+                article["content_urls"]["desktop"]["page"],
+                int(article["views"]),
+            )
+            for article in json_content["mostread"]["articles"]
+        ]
+    except KeyError as e:
+        logging.error(
+            "Missing key in article object (%s) from Feed API response: %s",
+            e,
+            featured_content_response,
+        )
+        raise WikipediaContentProcessingError
+    except ValueError as e:
+        logging.error(
+            "Unexpected value in article object (%s) from Feed API response: %s",
+            e,
+            featured_content_response,
+        )
+        raise WikipediaContentProcessingError
+
+    return (views_date, articles)
+
+
+def project_featured_content_most_read_articles(
+    featured_content_response: str,
+) -> str:
+    """Projects a Feed API Featured Content response into its "mostread" subset,
+    trimmed to the article fields used by `parse_featured_content_most_read_articles`.
+
+    Note:
+        💡 The "tfa", "image", "news" and "onthisday" objects make up most of the response size,
+        so the projection is a fraction of the response size to store, decompress and parse.
+
+    Returns:
+        Projected JSON response, or None if the response doesn't contain the "mostread" object.
+
+    Raises:
+        WikipediaContentProcessingError: If there's a JSON decoding or content integrity error in `featured_content_response`.
+    """
+    parsed_content = parse_featured_content_most_read_articles(
+        featured_content_response
+    )
+    if not parsed_content:
+        return None
+
+    views_date, articles = parsed_content
+    return default_json_codec.dumps(
+        {
+            "mostread": {
+                "date": views_date.strftime("%Y-%m-%dZ"),
+                "articles": [
+                    {
+                        "pageid": article.pageid,
+                        "views": article.views,
+                        "content_urls": {"desktop": {"page": article.page}},
+                    }
+                    for article in articles
+                ],
+            }
+        }
+    ).decode()
+
+
 # MARK: - Exceptions
 
 
@@ -452,6 +1645,12 @@ class InvalidDateRangeError(WikiAPIError):
         super().__init__(message)
 
 
+class InvalidPaginationError(WikiAPIError):
+    def __init__(self) -> None:
+        message = f"Invalid pagination, limit should be at least 1 and offset should not be negative, within the top {WikiAPI.MAX_RESPONSE_RESULTS} results."
+        super().__init__(message)
+
+
 class WikipediaConnectionError(WikiAPIError):
     def __init__(self) -> None:
         message = "Error connecting to the Wikipedia server."
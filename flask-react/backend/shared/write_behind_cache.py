@@ -0,0 +1,274 @@
+import asyncio
+from datetime import datetime
+import logging
+from threading import Condition, Thread
+import time
+
+from shared.wiki_api import WikiAPIResponse, WikiCache
+
+
+class WriteBehindWikiCache(WikiCache):
+    """
+    This is a subclass of WikiCache that queues puts in memory and writes them to a backing WikiCache
+    (e.g. a SQLite db) in batches on a background thread, so that callers on the event loop don't wait
+    for disk writes.
+
+    Note:
+        Queued responses are readable until they're written, including the batch being written.
+        💡 `max_pending` bounds the queue, puts wait for the background writer while it's full (backpressure).
+        `close` flushes the queue, e.g. on shutdown, later puts are written synchronously.
+        🚨 Queued responses are lost if the process is killed before they're written.
+    """
+
+    def __init__(
+        self,
+        backing_cache: WikiCache,
+        max_pending: int = 1000,
+        flush_interval_secs: float = 0.05,
+        max_batch_size: int = 500,
+    ) -> None:
+        """
+        Args:
+            backing_cache: Cache the queued responses are written to.
+            max_pending: Maximum queued responses, puts wait while the queue is full.
+            flush_interval_secs: Seconds the background writer waits for more puts before writing a batch.
+            max_batch_size: Maximum responses written per `put_many` call to the backing cache.
+
+        Raises:
+            ValueError: If `max_pending` or `max_batch_size` is less than 1.
+        """
+        super().__init__()
+        if max_pending < 1 or max_batch_size < 1:
+            raise ValueError("max_pending and max_batch_size should be at least 1.")
+
+        self.backing_cache = backing_cache
+        self.max_pending = max_pending
+        self.flush_interval_secs = flush_interval_secs
+        self.max_batch_size = max_batch_size
+        self._condition = Condition()
+        # Structure: {url: WikiAPIResponse}, in order of put.
+        self._pending: dict[str, WikiAPIResponse] = {}
+        # Batch being written by the background writer, still readable.
+        self._writing: dict[str, WikiAPIResponse] = {}
+        self._writer_thread: Thread = None
+        self._closed = False
+        self._written = 0
+        self._failed = 0
+        self._backpressure_waits = 0
+
+    def get(self, url: str) -> WikiAPIResponse:
+        return self.multi_get([url]).get(url)
+
+    def put(self, wiki_resp: WikiAPIResponse):
+        self.put_many([wiki_resp])
+
+    def multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        """Gets the queued responses, and the other ones from the backing cache."""
+        cached_responses = self._queued_multi_get(urls)
+        # Responses written after the snapshot above are read from the backing cache.
+        missed_urls = [url for url in urls if url not in cached_responses]
+        if missed_urls:
+            cached_responses.update(self.backing_cache.multi_get(missed_urls))
+        return cached_responses
+
+    def put_many(self, wiki_resps: list[WikiAPIResponse]):
+        """Queues the responses to be written by the background writer."""
+        wiki_resps = self._cacheable_responses(wiki_resps)
+        if not wiki_resps:
+            return
+
+        with self._condition:
+            while len(self._pending) >= self.max_pending and not self._closed:
+                self._backpressure_waits += 1
+                self._condition.wait()
+            if not self._closed:
+                self._queue_responses(wiki_resps)
+                return
+
+        # Written synchronously once closed.
+        self.backing_cache.put_many(wiki_resps)
+
+    async def aget(self, url: str) -> WikiAPIResponse:
+        return (await self.amulti_get([url])).get(url)
+
+    async def aput(self, wiki_resp: WikiAPIResponse):
+        await self.aput_many([wiki_resp])
+
+    async def amulti_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        """Gets the queued responses, and awaits the async variant of the backing cache for the other ones."""
+        cached_responses = self._queued_multi_get(urls)
+        missed_urls = [url for url in urls if url not in cached_responses]
+        if missed_urls:
+            cached_responses.update(await self.backing_cache.amulti_get(missed_urls))
+        return cached_responses
+
+    async def aput_many(self, wiki_resps: list[WikiAPIResponse]):
+        """Queues the responses without blocking the event loop, a full queue is waited on in a thread."""
+        wiki_resps = self._cacheable_responses(wiki_resps)
+        if not wiki_resps:
+            return
+
+        with self._condition:
+            closed = self._closed
+            if not closed and len(self._pending) < self.max_pending:
+                self._queue_responses(wiki_resps)
+                return
+
+        if closed:
+            await self.backing_cache.aput_many(wiki_resps)
+        else:
+            await asyncio.to_thread(self.put_many, wiki_resps)
+
+    def touch_many(self, urls: list[str]):
+        # Queued puts of these URLs are written with a new cached time anyway.
+        self.backing_cache.touch_many(urls)
+
+    async def atouch_many(self, urls: list[str]):
+        await self.backing_cache.atouch_many(urls)
+
+    def acquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        return self.backing_cache.acquire_fetch_leases(urls, owner, ttl)
+
+    def release_fetch_leases(self, urls: list[str], owner: str):
+        self.backing_cache.release_fetch_leases(urls, owner)
+
+    def leased_fetch_urls(self, urls: list[str]) -> list[str]:
+        return self.backing_cache.leased_fetch_urls(urls)
+
+    async def aleased_fetch_urls(self, urls: list[str]) -> list[str]:
+        return await self.backing_cache.aleased_fetch_urls(urls)
+
+    async def aacquire_fetch_leases(
+        self, urls: list[str], owner: str, ttl: float
+    ) -> list[str]:
+        return await self.backing_cache.aacquire_fetch_leases(urls, owner, ttl)
+
+    async def arelease_fetch_leases(self, urls: list[str], owner: str):
+        await self.backing_cache.arelease_fetch_leases(urls, owner)
+
+    def aggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        # Days still queued are not aggregated by the backing cache, which falls back to `multi_get`.
+        return self.backing_cache.aggregate_most_read_articles(
+            lang_code, start_date, end_date, limit
+        )
+
+    async def aaggregate_most_read_articles(
+        self, lang_code: str, start_date: datetime, end_date: datetime, limit: int
+    ) -> tuple[list[dict[str, any]], int]:
+        # Days still queued are not aggregated by the backing cache, which falls back to `amulti_get`.
+        return await self.backing_cache.aaggregate_most_read_articles(
+            lang_code, start_date, end_date, limit
+        )
+
+    def flush(self, timeout: float = None) -> bool:
+        """Waits until every queued response is written.
+
+        Returns:
+            True if the queue was flushed before `timeout`, otherwise False.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def close(self, timeout: float = None) -> bool:
+        """Flushes the queue and stops the background writer, e.g. on shutdown.
+
+        Returns:
+            True if the queue was flushed before `timeout`, otherwise False.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        flushed = self.flush(timeout)
+        if self._writer_thread:
+            self._writer_thread.join(timeout)
+        return flushed
+
+    def stats(self) -> dict[str, int]:
+        """Returns the `pending` responses, total `written` and `failed` writes, and `backpressure_waits`."""
+        with self._condition:
+            return {
+                "pending": len(self._pending) + len(self._writing),
+                "written": self._written,
+                "failed": self._failed,
+                "backpressure_waits": self._backpressure_waits,
+            }
+
+    def _cacheable_responses(
+        self, wiki_resps: list[WikiAPIResponse]
+    ) -> list[WikiAPIResponse]:
+        # No point in queueing erroneous or empty responses, which are not readable once written.
+        return [
+            wiki_resp
+            for wiki_resp in wiki_resps
+            if not wiki_resp.exception and wiki_resp.status_ok and wiki_resp.text
+        ]
+
+    def _queued_multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        """Returns the queued responses of `urls`, including the batch being written."""
+        queued_responses = {}
+        with self._condition:
+            for url in urls:
+                wiki_resp = self._pending.get(url) or self._writing.get(url)
+                if wiki_resp:
+                    queued_responses[url] = wiki_resp
+        return queued_responses
+
+    def _queue_responses(self, wiki_resps: list[WikiAPIResponse]):
+        """Queues the responses for the background writer, requires holding `_condition`."""
+        for wiki_resp in wiki_resps:
+            # Requeued as the latest put.
+            self._pending.pop(wiki_resp.url, None)
+            self._pending[wiki_resp.url] = wiki_resp
+        self._start_writer_thread()
+        self._condition.notify_all()
+
+    def _start_writer_thread(self):
+        """Starts the background writer on first put, requires holding `_condition`."""
+        if self._writer_thread is None:
+            self._writer_thread = Thread(
+                target=self._write_pending_responses,
+                name="WriteBehindWikiCache",
+                daemon=True,
+            )
+            self._writer_thread.start()
+
+    def _write_pending_responses(self):
+        """Background writer loop, writing the queued responses in batches until closed."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                closed = self._closed
+
+            # Gather the puts of concurrent fetches in the same batch.
+            if self.flush_interval_secs > 0 and not closed:
+                time.sleep(self.flush_interval_secs)
+
+            with self._condition:
+                batch_urls = list(self._pending)[: self.max_batch_size]
+                self._writing = {url: self._pending.pop(url) for url in batch_urls}
+                batch = list(self._writing.values())
+                # Room for waiting puts.
+                self._condition.notify_all()
+
+            try:
+                self.backing_cache.put_many(batch)
+                written = len(batch)
+            except Exception as e:
+                logging.error(
+                    "WRITE BEHIND ERROR: Dropped %d responses: %s", len(batch), e
+                )
+                written = 0
+
+            with self._condition:
+                self._writing = {}
+                self._written += written
+                self._failed += len(batch) - written
+                self._condition.notify_all()
@@ -0,0 +1,22 @@
+import logging
+
+from app.asgi import create_asgi_app
+from app.config import config_from_env
+
+try:
+    import uvicorn
+except ImportError:  # Optional dependency
+    uvicorn = None
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        format="%(levelname)s [%(asctime)s] %(name)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        level=logging.INFO,
+    )
+    if uvicorn is None:
+        raise SystemExit(
+            "start_asgi_server.py requires uvicorn: pip install -r requirements-asgi.txt"
+        )
+    asgi_app = create_asgi_app(config=config_from_env())
+    uvicorn.run(asgi_app, host="127.0.0.1", port=8080, lifespan="on")
@@ -0,0 +1,14 @@
+import logging
+
+from app import create_app, create_prefetcher
+from app.config import config_from_env
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        format="%(levelname)s [%(asctime)s] %(name)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        level=logging.INFO,
+    )
+    app = create_app(config=config_from_env())
+    prefetcher = create_prefetcher(app)
+    app.extensions["event_loop_thread"].run_coroutine(prefetcher.run_forever())
@@ -1,7 +1,7 @@
 import logging
 
 from app import create_app
-from app.config import Config
+from app.config import config_from_env
 
 if __name__ == "__main__":
     logging.basicConfig(
@@ -9,5 +9,5 @@ if __name__ == "__main__":
         datefmt="%Y-%m-%d %H:%M:%S",
         level=logging.INFO,
     )
-    app = create_app(config=Config())
+    app = create_app(config=config_from_env())
     app.run(host="127.0.0.1", port=8080, debug=True, threaded=True)
@@ -8,7 +8,11 @@ from unittest import IsolatedAsyncioTestCase, main
 # Add the project root directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from shared.asyncio_rate_limiter import AsyncIORateLimiter
+from shared.asyncio_rate_limiter import (
+    AsyncIORateLimiter,
+    LowPriorityRateLimiter,
+    TOKEN_BUCKET_SCHEDULER,
+)
 
 
 class AsyncIORateLimiterTests(IsolatedAsyncioTestCase):
@@ -115,6 +119,136 @@ class AsyncIORateLimiterTests(IsolatedAsyncioTestCase):
                 )
                 await self.aio_rate_limiter.run_rate_limited_tasks(coros=c.coros)
 
+    async def test_run_rate_limited_tasks_token_bucket(self):
+        """Test `run_rate_limited_tasks` token bucket scheduler results and start times.
+
+        Note:
+            Case Example:
+            ```
+                max_tasks_per_second=4, burst_size=2
+                run_rate_limited_tasks(coros=[start_time() x 6])
+
+                expected_start_times=[0, 0, 0.25, 0.5, 0.75, 1]
+                (2 burst tokens, then 1 token refilled every 0.25 seconds)
+            ```
+        """
+        assertion_time_delta = 0.1  # seconds
+        token_bucket_rate_limiter = AsyncIORateLimiter(
+            max_tasks_per_second=4, scheduler=TOKEN_BUCKET_SCHEDULER, burst_size=2
+        )
+        loop = asyncio.get_running_loop()
+
+        async def start_time(i: int) -> tuple[int, float]:
+            return (i, loop.time())
+
+        start = loop.time()
+        results = await token_bucket_rate_limiter.run_rate_limited_tasks(
+            coros=[start_time(i) for i in range(6)]
+        )
+
+        self.assertEqual([i for i, _ in results], list(range(6)))
+        expected_start_times = [0, 0, 0.25, 0.5, 0.75, 1]
+        for (_, start_time), expected_start_time in zip(results, expected_start_times):
+            self.assertAlmostEqual(
+                start_time - start, expected_start_time, delta=assertion_time_delta
+            )
+
+    async def test_acquire_token_cycle_scheduler(self):
+        """Test `acquire_token` holds a cycle slot for a whole window under the cycle scheduler,
+        so that requests started within running tasks (e.g. retries) count against its budget.
+
+        Note:
+            Case Example:
+            ```
+                max_tasks_per_second=2
+                run_rate_limited_tasks(coros=[retry(), start_time() x 3])
+
+                retry() takes a slot at 0.5 (until 1.5), so the cycle at 1 starts only 1 task.
+                expected_start_times=[0, 1, 2]
+            ```
+        """
+        assertion_time_delta = 0.2  # seconds
+        self.aio_rate_limiter.overwrite_max_tasks_per_second(2)
+        loop = asyncio.get_running_loop()
+
+        async def retry() -> float:
+            await asyncio.sleep(0.5)
+            await self.aio_rate_limiter.acquire_token()
+            return loop.time()
+
+        async def start_time() -> float:
+            return loop.time()
+
+        start = loop.time()
+        retry_time, *start_times = await self.aio_rate_limiter.run_rate_limited_tasks(
+            coros=[retry()] + [start_time() for _ in range(3)]
+        )
+
+        self.assertAlmostEqual(retry_time - start, 0.5, delta=assertion_time_delta)
+        for start_time, expected_start_time in zip(start_times, [0, 1, 2]):
+            self.assertAlmostEqual(
+                start_time - start, expected_start_time, delta=assertion_time_delta
+            )
+
+    async def test_token_bucket_invalid_arguments(self):
+        """Test invalid scheduler arguments."""
+        with self.assertRaises(ValueError):
+            AsyncIORateLimiter(scheduler="unknown")
+        with self.assertRaises(ValueError):
+            AsyncIORateLimiter(scheduler=TOKEN_BUCKET_SCHEDULER, burst_size=0)
+
+    async def test_low_priority_rate_limiter(self):
+        """Test a low-priority rate limiter only takes the parent's tokens above its reserve.
+
+        Note:
+            Case Example:
+            ```
+                parent: max_tasks_per_second=4, burst_size=3
+                low-priority: reserved_tokens=1
+                run_rate_limited_tasks(coros=[start_time() x 4])
+
+                expected_start_times=[0, 0, 0.25, 0.5]
+                (2 tokens above the reserve, then 1 token refilled every 0.25 seconds)
+            ```
+        """
+        assertion_time_delta = 0.1  # seconds
+        parent_rate_limiter = AsyncIORateLimiter(
+            max_tasks_per_second=4, scheduler=TOKEN_BUCKET_SCHEDULER, burst_size=3
+        )
+        low_priority_rate_limiter = LowPriorityRateLimiter(
+            parent_rate_limiter, reserved_tokens=1
+        )
+        loop = asyncio.get_running_loop()
+
+        async def start_time() -> float:
+            return loop.time()
+
+        start = loop.time()
+        start_times = await low_priority_rate_limiter.run_rate_limited_tasks(
+            coros=[start_time() for _ in range(4)]
+        )
+
+        expected_start_times = [0, 0, 0.25, 0.5]
+        for start_time, expected_start_time in zip(start_times, expected_start_times):
+            self.assertAlmostEqual(
+                start_time - start, expected_start_time, delta=assertion_time_delta
+            )
+
+        # The reserved token remains available to the parent.
+        await asyncio.wait_for(parent_rate_limiter.acquire_token(), timeout=0.1)
+
+    async def test_low_priority_rate_limiter_invalid_arguments(self):
+        """Test invalid low-priority rate limiter arguments."""
+        token_bucket_rate_limiter = AsyncIORateLimiter(
+            max_tasks_per_second=4, scheduler=TOKEN_BUCKET_SCHEDULER, burst_size=3
+        )
+        with self.assertRaises(ValueError):
+            LowPriorityRateLimiter(AsyncIORateLimiter(), reserved_tokens=0)
+        with self.assertRaises(ValueError):
+            LowPriorityRateLimiter(token_bucket_rate_limiter, reserved_tokens=3)
+        with self.assertRaises(ValueError):
+            LowPriorityRateLimiter(token_bucket_rate_limiter, reserved_tokens=-1)
+
     async def _delay(self, secs: int, raise_exception=False) -> int:
         """Delays `secs` seconds in returning the same argument."""
 
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+from unittest import TestCase, main
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import shared.columnar_aggregation as columnar_aggregation
+import shared.wiki_api as wiki_api
+from tests.shared.test_wiki_api import featured_content
+
+
+class ColumnarAggregationTests(TestCase):
+
+    def setUp(self):
+        rnd = random.Random(0)
+        start_date = datetime(2024, 1, 1)
+        # Small views and pageid ranges to produce total views ties and duplicated pageids within a day.
+        self.featured_content_responses = [
+            featured_content(
+                (start_date + timedelta(days=day)).strftime("%Y-%m-%d"),
+                [(rnd.randint(1, 80), rnd.randint(1, 5) * 100) for _ in range(50)],
+            )
+            for day in range(30)
+        ]
+        self.featured_content_responses.append('{"tfa": {}}')
+        self.dict_wiki_api = wiki_api.WikiAPI(
+            aggregation_engine=wiki_api.DICT_AGGREGATION_ENGINE
+        )
+        self.columnar_wiki_api = wiki_api.WikiAPI(
+            aggregation_engine=wiki_api.COLUMNAR_AGGREGATION_ENGINE
+        )
+
+    def assert_identical_engine_results(self):
+        for results_limit in (None, 0, 1, 7, 50, 80, 1000):
+            self.assertEqual(
+                self.columnar_wiki_api._reduce_and_sort_featured_content_most_read_articles(
+                    self.featured_content_responses, results_limit
+                ),
+                self.dict_wiki_api._reduce_and_sort_featured_content_most_read_articles(
+                    self.featured_content_responses, results_limit
+                ),
+                f"results_limit={results_limit}",
+            )
+
+    def test_identical_engine_results(self):
+        self.assert_identical_engine_results()
+
+    def test_identical_engine_results_without_numpy(self):
+        with patch.object(columnar_aggregation, "np", None):
+            self.assert_identical_engine_results()
+
+    def test_empty_aggregation(self):
+        aggregator = columnar_aggregation.ColumnarMostReadArticlesAggregator()
+        self.assertEqual(aggregator.top_articles(), [])
+        self.assertEqual(aggregator.total_articles, 0)
+
+    def test_unknown_aggregation_engine(self):
+        with self.assertRaises(ValueError):
+            wiki_api.WikiAPI(aggregation_engine="spreadsheet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+from unittest import TestCase, main, skipUnless
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import shared.compression as compression
+
+
+def featured_content(day: int) -> str:
+    return json.dumps(
+        {
+            "mostread": {
+                "date": f"2024-02-{day:02d}Z",
+                "articles": [
+                    {
+                        "pageid": pageid,
+                        "views": pageid * day * 31,
+                        "content_urls": {
+                            "desktop": {
+                                "page": f"https://es.wikipedia.org/wiki/Article_{pageid}"
+                            }
+                        },
+                    }
+                    for pageid in range(day, day + 50)
+                ],
+            }
+        }
+    )
+
+
+class ResponseCompressorTests(TestCase):
+
+    def test_zlib_compressor(self):
+        compressor = compression.ResponseCompressor()
+        text = featured_content(1)
+
+        codec, data = compressor.compress(text)
+
+        self.assertEqual(codec, compression.ZLIB_CODEC)
+        self.assertEqual(compressor.decompress(codec, data), text)
+        with self.assertRaises(ValueError):
+            compressor.decompress("unknown", data)
+        with self.assertRaises(ValueError):
+            compression.ResponseCompressor("unknown")
+
+    @skipUnless(compression.zstandard, "zstandard is not installed")
+    def test_zstd_dictionary_compressor(self):
+        samples = [featured_content(day) for day in range(1, 29)] * 4
+        dictionary = compression.train_zstd_dictionary(samples, 8 * 1024)
+        dictionaries = {}
+
+        def dictionary_loader(dict_id: int) -> bytes:
+            return dictionaries.get(dict_id)
+
+        compressor = compression.ResponseCompressor(
+            compression.ZSTD_CODEC, dictionary_loader
+        )
+        text = featured_content(29)
+
+        # Test compression without dictionary
+        codec, data = compressor.compress(text)
+        self.assertEqual(codec, compression.ZSTD_CODEC)
+        self.assertEqual(compressor.decompress(codec, data), text)
+        self.assertEqual(
+            compressor.dictionary_id_of(codec, data), compression.NO_DICTIONARY_ID
+        )
+
+        # Test compression with dictionary is smaller
+        dict_id = compressor.add_dictionary(dictionary)
+        dictionaries[dict_id] = dictionary
+        codec, dictionary_data = compressor.compress(text)
+        self.assertEqual(compressor.dictionary_id_of(codec, dictionary_data), dict_id)
+        self.assertLess(len(dictionary_data), len(data))
+        self.assertEqual(compressor.decompress(codec, dictionary_data), text)
+
+        # Test another compressor loads the dictionary to decompress
+        other_compressor = compression.ResponseCompressor(
+            dictionary_loader=dictionary_loader
+        )
+        self.assertEqual(other_compressor.decompress(codec, dictionary_data), text)
+
+        # Test unknown dictionary
+        with self.assertRaises(KeyError):
+            compression.ResponseCompressor().decompress(codec, dictionary_data)
+
+    @skipUnless(compression.zstandard, "zstandard is not installed")
+    def test_compare_compression(self):
+        samples = [featured_content(day) for day in range(1, 29)] * 4
+        dictionary = compression.train_zstd_dictionary(samples, 8 * 1024)
+
+        stats = compression.compare_compression(samples[:10], dictionary)
+
+        self.assertEqual(
+            [codec_stats["codec"] for codec_stats in stats],
+            ["zlib", "zstd", "zstd+dictionary"],
+        )
+        self.assertLess(stats[2]["size"], stats[0]["size"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+from unittest import TestCase, main, skipUnless
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import shared.content_encoding as content_encoding
+
+
+class ContentEncodingTests(TestCase):
+
+    def test_encode_decode_content(self):
+        data = b'{"data":[{"page":"https://es.wikipedia.org/wiki/1"}]}' * 100
+
+        for encoding in content_encoding.available_content_encodings() + [
+            content_encoding.IDENTITY_ENCODING
+        ]:
+            encoded_data = content_encoding.encode_content(data, encoding)
+            self.assertEqual(
+                content_encoding.decode_content(encoded_data, encoding), data
+            )
+            # Deterministic output, e.g. to be memoized with a stable ETag.
+            self.assertEqual(
+                content_encoding.encode_content(data, encoding), encoded_data
+            )
+            if encoding != content_encoding.IDENTITY_ENCODING:
+                self.assertLess(len(encoded_data), len(data))
+
+    @skipUnless(content_encoding.brotli, "brotli is not installed")
+    def test_available_content_encodings_prefer_brotli(self):
+        self.assertEqual(
+            content_encoding.available_content_encodings(),
+            [content_encoding.BROTLI_ENCODING, content_encoding.GZIP_ENCODING],
+        )
+
+    def test_unknown_content_encoding(self):
+        with self.assertRaises(ValueError):
+            content_encoding.encode_content(b"", "compress")
+        with self.assertRaises(ValueError):
+            content_encoding.decode_content(b"", "compress")
+
+
+if __name__ == "__main__":
+    main()
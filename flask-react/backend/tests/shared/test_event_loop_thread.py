@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+from threading import get_ident
+from unittest import TestCase, main
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from shared.event_loop_thread import EventLoopThread
+
+
+class EventLoopThreadTests(TestCase):
+
+    def setUp(self):
+        self.event_loop_thread = EventLoopThread()
+
+    def tearDown(self):
+        self.event_loop_thread.stop()
+
+    def test_run_coroutine_same_loop(self):
+        """Test coroutines submitted from the caller thread run on the same background loop."""
+
+        async def running_loop_and_thread():
+            return asyncio.get_running_loop(), get_ident()
+
+        first_loop, first_thread = self.event_loop_thread.run_coroutine(
+            running_loop_and_thread()
+        )
+        second_loop, second_thread = self.event_loop_thread.run_coroutine(
+            running_loop_and_thread()
+        )
+
+        self.assertIs(first_loop, second_loop)
+        self.assertEqual(first_thread, second_thread)
+        self.assertNotEqual(first_thread, get_ident())
+
+    def test_run_coroutine_timeout(self):
+        """Test `run_coroutine` raises `TimeoutError` when the result is not ready in time."""
+        with self.assertRaises(TimeoutError):
+            self.event_loop_thread.run_coroutine(asyncio.sleep(1), timeout=0.1)
+
+    def test_stop_runs_shutdown_callbacks(self):
+        """Test `stop` awaits the shutdown callbacks before closing the event loop."""
+        closed = []
+
+        async def close_resource():
+            closed.append(True)
+
+        self.event_loop_thread.add_shutdown_callback(close_resource)
+        self.event_loop_thread.start()
+        self.event_loop_thread.stop()
+
+        self.assertEqual(closed, [True])
+        self.assertFalse(self.event_loop_thread.is_running)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import sys
+from threading import Barrier, Thread
+import time
+from unittest import TestCase, main
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from shared.group_commit import GroupCommitter
+
+
+class GroupCommitterTests(TestCase):
+
+    def test_concurrent_submits_share_commits(self):
+        total_threads = 20
+        committed_groups: list[list[int]] = []
+
+        def commit(items: list[int]):
+            time.sleep(0.01)  # Simulated transaction
+            committed_groups.append(list(items))
+
+        committer = GroupCommitter(commit, max_delay_secs=0.01)
+        barrier = Barrier(total_threads)
+
+        def submit(item: int):
+            barrier.wait()
+            committer.submit([item])
+
+        threads = [Thread(target=submit, args=(i,)) for i in range(total_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every item is committed once, in fewer transactions than submits.
+        committed_items = [item for group in committed_groups for item in group]
+        self.assertEqual(sorted(committed_items), list(range(total_threads)))
+        self.assertLess(len(committed_groups), total_threads)
+        stats = committer.stats()
+        self.assertEqual(stats["commits"], len(committed_groups))
+        self.assertEqual(stats["items"], total_threads)
+
+    def test_single_writer_commits_right_away(self):
+        committed_groups = []
+        committer = GroupCommitter(committed_groups.append)
+
+        committer.submit([1, 2])
+        committer.submit([3])
+
+        self.assertEqual(committed_groups, [[1, 2], [3]])
+
+    def test_max_group_size(self):
+        committed_groups = []
+        committer = GroupCommitter(committed_groups.append, max_group_size=2)
+
+        committer.submit([1, 2, 3])
+        committer.submit([4])
+
+        self.assertEqual(committed_groups, [[1, 2, 3], [4]])
+
+    def test_commit_exception(self):
+        def commit(items: list):
+            raise RuntimeError("Database is locked")
+
+        committer = GroupCommitter(commit)
+
+        with self.assertRaises(RuntimeError):
+            committer.submit([1])
+        self.assertEqual(committer.stats()["commits"], 0)
+
+
+if __name__ == "__main__":
+    main()
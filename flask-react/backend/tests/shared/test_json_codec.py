@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+from unittest import TestCase, main, skipUnless
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import shared.json_codec as json_codec
+
+
+class JSONCodecTests(TestCase):
+
+    def codecs(self) -> list[json_codec.JSONCodec]:
+        codecs = [json_codec.JSONCodec()]
+        if json_codec.orjson:
+            codecs.append(json_codec.OrjsonCodec())
+        return codecs
+
+    def test_dumps_loads(self):
+        obj = {"page": "https://es.wikipedia.org/wiki/Cañón", "views": 9000, "a": [1]}
+        expected_sorted_json = (
+            '{"a":[1],"page":"https://es.wikipedia.org/wiki/Cañón","views":9000}'
+        )
+
+        for codec in self.codecs():
+            self.assertEqual(
+                codec.dumps(obj, sort_keys=True).decode(), expected_sorted_json
+            )
+            self.assertEqual(codec.loads(codec.dumps(obj)), obj)
+            self.assertEqual(codec.loads(codec.dumps(obj).decode()), obj)
+            self.assertEqual(codec.dumps({1}, default=list), b"[1]")
+
+    def test_loads_decode_error(self):
+        for codec in self.codecs():
+            with self.assertRaises(json.JSONDecodeError):
+                codec.loads("{invalid")
+
+    @skipUnless(json_codec.orjson, "orjson is not installed")
+    def test_create_json_codec_default(self):
+        self.assertIsInstance(json_codec.create_json_codec(), json_codec.OrjsonCodec)
+
+    def test_create_json_codec_unknown(self):
+        self.assertIsInstance(
+            json_codec.create_json_codec("json"), json_codec.JSONCodec
+        )
+        with self.assertRaises(ValueError):
+            json_codec.create_json_codec("yaml")
+
+
+if __name__ == "__main__":
+    main()
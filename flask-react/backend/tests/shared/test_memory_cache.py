@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sys
+from unittest import TestCase, main
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from shared.memory_cache import BoundedLRUCache, TieredWikiCache
+from shared.wiki_api import WikiAPIResponse
+from tests.shared.test_wiki_api import TestCache
+
+
+class BoundedLRUCacheTests(TestCase):
+
+    def setUp(self):
+        self.now = 0
+        self.lru_cache = BoundedLRUCache(max_bytes=10, clock=lambda: self.now)
+
+    def test_get_put(self):
+        """Test cache hits, misses and replaced entries."""
+        self.assertIsNone(self.lru_cache.get("a"))
+
+        self.lru_cache.put("a", "A", 4)
+        self.assertEqual(self.lru_cache.get("a"), "A")
+
+        self.lru_cache.put("a", "AA", 6)
+        self.assertEqual(self.lru_cache.get("a"), "AA")
+
+        stats = self.lru_cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["total_bytes"], 6)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test least recently used entries are evicted once `max_bytes` is exceeded."""
+        self.lru_cache.put("a", "A", 4)
+        self.lru_cache.put("b", "B", 4)
+        # Mark "a" as recently used.
+        self.lru_cache.get("a")
+        self.lru_cache.put("c", "C", 4)
+
+        self.assertIsNone(self.lru_cache.get("b"))
+        self.assertEqual(self.lru_cache.get("a"), "A")
+        self.assertEqual(self.lru_cache.get("c"), "C")
+        self.assertEqual(self.lru_cache.stats()["evictions"], 1)
+
+        # Values larger than `max_bytes` are not cached.
+        self.lru_cache.put("d", "D", 11)
+        self.assertIsNone(self.lru_cache.get("d"))
+        self.assertEqual(self.lru_cache.stats()["total_bytes"], 8)
+
+    def test_ttl(self):
+        """Test entries expire after their TTL."""
+        self.lru_cache.default_ttl = 5
+        self.lru_cache.put("a", "A", 1)
+        self.lru_cache.put("b", "B", 1, ttl=10)
+        self.lru_cache.put("c", "C", 1, ttl=float("inf"))
+
+        self.now = 5
+        self.assertIsNone(self.lru_cache.get("a"))
+        self.assertEqual(self.lru_cache.get("b"), "B")
+
+        self.now = 1000
+        self.assertIsNone(self.lru_cache.get("b"))
+        self.assertEqual(self.lru_cache.get("c"), "C")
+        self.assertEqual(self.lru_cache.stats()["expirations"], 2)
+
+    def test_invalid_max_bytes(self):
+        with self.assertRaises(ValueError):
+            BoundedLRUCache(max_bytes=0)
+
+
+class AsyncTestCache(TestCache):
+    """This is a TestCache recording the URLs of its async variant calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.async_calls: list[tuple[str, list[str]]] = []
+
+    async def amulti_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+        self.async_calls.append(("amulti_get", urls))
+        return self.multi_get(urls)
+
+    async def aput_many(self, wiki_resps: list[WikiAPIResponse]):
+        self.async_calls.append(
+            ("aput_many", [wiki_resp.url for wiki_resp in wiki_resps])
+        )
+        self.put_many(wiki_resps)
+
+
+class TieredWikiCacheTests(TestCase):
+
+    def setUp(self):
+        self.backing_cache = TestCache()
+        self.memory_cache = BoundedLRUCache()
+        self.tiered_cache = TieredWikiCache(self.backing_cache, self.memory_cache)
+
+    def test_read_through_memory_tier(self):
+        """Test reads are served by the memory tier after the first backing cache hit."""
+        self.tiered_cache.put(WikiAPIResponse("test_url", True, "Test", None))
+        self.assertEqual(self.backing_cache._cache, {"test_url": "Test"})
+        self.assertIsNone(self.memory_cache.get("test_url"))
+
+        self.assertEqual(self.tiered_cache.get("test_url").text, "Test")
+        # Remove the backing cache entry to validate the memory tier hit.
+        self.backing_cache._cache.clear()
+        self.assertEqual(
+            self.tiered_cache.multi_get(["test_url"])["test_url"].text, "Test"
+        )
+        self.assertEqual(self.tiered_cache.multi_get(["missing_url"]), {})
+
+    def test_put_invalidates_memory_tier(self):
+        """Test puts replace stale memory tier entries."""
+        self.tiered_cache.put(WikiAPIResponse("test_url", True, "Test", None))
+        self.tiered_cache.get("test_url")
+
+        self.tiered_cache.put(WikiAPIResponse("test_url", True, "Updated", None))
+        self.assertEqual(self.tiered_cache.get("test_url").text, "Updated")
+
+    def test_async_variants_await_backing_cache(self):
+        """Test the async variants await the backing cache's async variants for memory tier misses."""
+        backing_cache = AsyncTestCache()
+        tiered_cache = TieredWikiCache(backing_cache, self.memory_cache)
+
+        async def put_and_get_twice():
+            await tiered_cache.aput(WikiAPIResponse("test_url", True, "Test", None))
+            await tiered_cache.aget("test_url")
+            return await tiered_cache.amulti_get(["test_url", "missing_url"])
+
+        cached_responses = asyncio.run(put_and_get_twice())
+        self.assertEqual(list(cached_responses), ["test_url"])
+        self.assertEqual(
+            backing_cache.async_calls,
+            [
+                ("aput_many", ["test_url"]),
+                ("amulti_get", ["test_url"]),
+                # Memory tier hit
+                ("amulti_get", ["missing_url"]),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
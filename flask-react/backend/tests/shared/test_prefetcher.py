@@ -0,0 +1,76 @@
+from datetime import date, datetime, timezone
+import os
+import sys
+from unittest import IsolatedAsyncioTestCase, main
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from shared.prefetcher import MostReadPrefetcher
+
+
+class TestWikiAPI:
+    """This is a stand-in of WikiAPI returning the most read articles
+    only after `missing_fetches` fetches, like a day not published yet.
+    """
+
+    def __init__(self, missing_fetches: int) -> None:
+        self.missing_fetches = missing_fetches
+        self.fetches: list[tuple[str, str, str]] = []
+
+    async def fetch_most_read_articles(
+        self, lang_code: str, start: str, end: str, results_limit: int
+    ) -> dict[str, list]:
+        self.fetches.append((lang_code, start, end))
+        if len(self.fetches) <= self.missing_fetches:
+            return {"data": [], "errors": []}
+        return {"data": [{"pageid": 1}], "errors": []}
+
+
+class MostReadPrefetcherTests(IsolatedAsyncioTestCase):
+
+    def create_prefetcher(self, wiki_api: TestWikiAPI) -> MostReadPrefetcher:
+        return MostReadPrefetcher(
+            wiki_api,
+            lang_codes=["en"],
+            delay_secs=5 * 60,
+            retry_interval_secs=0.01,
+            utc_now=lambda: datetime(2024, 2, 20, 0, 1, tzinfo=timezone.utc),
+        )
+
+    async def test_prefetch_newest_day_retries(self):
+        """Test the newest completed day is fetched again until its most read articles are available."""
+        wiki_api = TestWikiAPI(missing_fetches=2)
+        prefetcher = self.create_prefetcher(wiki_api)
+
+        self.assertEqual(await prefetcher.prefetch_newest_day(), {"en": True})
+        self.assertEqual(wiki_api.fetches, [("en", "2024-02-19", "2024-02-19")] * 3)
+
+    async def test_prefetch_day_gives_up(self):
+        """Test retries stop after `give_up_after` seconds."""
+        wiki_api = TestWikiAPI(missing_fetches=100)
+        prefetcher = self.create_prefetcher(wiki_api)
+
+        prefetched = await prefetcher.prefetch_day(
+            "en", date(2024, 2, 19), give_up_after=0.05
+        )
+
+        self.assertFalse(prefetched)
+        self.assertLess(len(wiki_api.fetches), 100)
+
+    def test_secs_until_next_run(self):
+        """Test runs are scheduled `delay_secs` after UTC midnight."""
+        prefetcher = self.create_prefetcher(TestWikiAPI(missing_fetches=0))
+
+        # 00:01, before today's 00:05 run.
+        self.assertEqual(prefetcher.secs_until_next_run(), 4 * 60)
+        # 00:05, at today's run, the next one is tomorrow.
+        prefetcher._utc_now = lambda: datetime(2024, 2, 20, 0, 5, tzinfo=timezone.utc)
+        self.assertEqual(prefetcher.secs_until_next_run(), 24 * 60 * 60)
+        # 12:00
+        prefetcher._utc_now = lambda: datetime(2024, 2, 20, 12, tzinfo=timezone.utc)
+        self.assertEqual(prefetcher.secs_until_next_run(), 12 * 60 * 60 + 5 * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import sys
+from tempfile import TemporaryDirectory
+import time
+from unittest import IsolatedAsyncioTestCase, main
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from shared.shared_rate_limiter import SharedAsyncIORateLimiter
+
+
+class SharedAsyncIORateLimiterTests(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.state_file = os.path.join(self.temp_dir.name, "rate_limit.db")
+        # Each instance uses its own db connection, like separate worker processes.
+        self.rate_limiters = [
+            SharedAsyncIORateLimiter(
+                self.state_file, max_tasks_per_second=4, burst_size=2
+            )
+            for _ in range(2)
+        ]
+
+    def tearDown(self):
+        for rate_limiter in self.rate_limiters:
+            rate_limiter.close()
+        self.temp_dir.cleanup()
+
+    async def test_run_rate_limited_tasks_shared_budget(self):
+        """Test concurrent rate limiters sharing a state file split a single token bucket.
+
+        Note:
+            max_tasks_per_second=4, burst_size=2 shared by 2 rate limiters running 3 tasks each:
+            expected_start_times=[0, 0, 0.25, 0.5, 0.75, 1]
+        """
+        assertion_time_delta = 0.15  # seconds
+        loop = asyncio.get_running_loop()
+
+        async def start_time() -> float:
+            return loop.time()
+
+        start = loop.time()
+        results = await asyncio.gather(
+            *[
+                rate_limiter.run_rate_limited_tasks(
+                    coros=[start_time() for _ in range(3)]
+                )
+                for rate_limiter in self.rate_limiters
+            ]
+        )
+
+        start_times = sorted(
+            t - start for rate_limiter_results in results for t in rate_limiter_results
+        )
+        expected_start_times = [0, 0, 0.25, 0.5, 0.75, 1]
+        for start_time, expected_start_time in zip(start_times, expected_start_times):
+            self.assertAlmostEqual(
+                start_time, expected_start_time, delta=assertion_time_delta
+            )
+
+    async def test_waiters_poll_state_file_one_at_a_time(self):
+        """Test concurrent waiters of a process poll the state file one at a time,
+        and polls finding no token don't write it.
+        """
+        rate_limiter = self.rate_limiters[0]
+        polls = []
+        # Structure: [active polls, max active polls]
+        active_polls = [0, 0]
+        try_take_shared_token = rate_limiter._try_take_shared_token
+
+        def count_polls(reserved_tokens: int = 0) -> float:
+            active_polls[0] += 1
+            active_polls[1] = max(active_polls)
+            time.sleep(0.01)
+            total_changes = rate_limiter._connect().total_changes
+            wait_time = try_take_shared_token(reserved_tokens)
+            polls.append(
+                (wait_time, rate_limiter._connect().total_changes - total_changes)
+            )
+            active_polls[0] -= 1
+            return wait_time
+
+        rate_limiter._try_take_shared_token = count_polls
+        await asyncio.gather(*[rate_limiter.acquire_token() for _ in range(5)])
+
+        self.assertEqual(
+            rate_limiter._connect().execute("PRAGMA journal_mode").fetchone()[0], "wal"
+        )
+        self.assertEqual(active_polls[1], 1)
+        self.assertEqual(sum(1 for wait_time, _ in polls if wait_time <= 0), 5)
+        for wait_time, changes in polls:
+            self.assertEqual(changes, 0 if wait_time > 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import asyncio
 from collections import namedtuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import httpx
 import json
 import logging
 import os
@@ -38,6 +41,29 @@ class TestCache(wiki_api.WikiCache):
         self._cache[wiki_resp.url] = wiki_resp.text
 
 
+def featured_content(views_date: str, articles: list[tuple[int, int]]) -> str:
+    """Builds a Featured Content response of the (pageid, views) `articles` of `views_date`."""
+    return json.dumps(
+        {
+            "mostread": {
+                "date": f"{views_date}Z",
+                "articles": [
+                    {
+                        "pageid": pageid,
+                        "views": views,
+                        "content_urls": {
+                            "desktop": {
+                                "page": f"https://es.wikipedia.org/wiki/{pageid}"
+                            }
+                        },
+                    }
+                    for pageid, views in articles
+                ],
+            }
+        }
+    )
+
+
 class WikiAPITests(IsolatedAsyncioTestCase):
 
     def setUp(self):
@@ -210,6 +236,399 @@ class WikiAPITests(IsolatedAsyncioTestCase):
         # Validate cache remained empty
         self.assertFalse(len(self.test_cache._cache))
 
+    async def test_fetch_wiki_api_response_coalesced(self):
+        """Test concurrent `fetch_wiki_api_response` calls for the same URL send a single request."""
+        test_url = "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        requested_urls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, text="Test")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            results = await asyncio.gather(
+                *[
+                    self.wiki_api.fetch_wiki_api_response(
+                        test_url, client, response_validator=lambda _: True
+                    )
+                    for _ in range(3)
+                ]
+            )
+
+        self.assertEqual(requested_urls, [test_url])
+        self.assertEqual([wiki_resp.text for wiki_resp in results], ["Test"] * 3)
+        self.assertEqual(self.test_cache._cache, {test_url: "Test"})
+        self.assertFalse(self.wiki_api._in_flight_fetches)
+
+    async def test_fetch_wiki_api_response_retries(self):
+        """Test transient failures are retried, honouring `Retry-After`, up to `max_retries`."""
+        test_url = "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        self.wiki_api.RETRY_BASE_DELAY_SECS = 0.01
+
+        Case = namedtuple(
+            "Case",
+            (
+                "status_codes",
+                "expected_requests",
+                "expected_status_ok",
+                "expected_stats",
+            ),
+        )
+        cases = [
+            # Recovered after a 429 and a 503.
+            Case(
+                [429, 503, 200],
+                3,
+                True,
+                {"retries": 2, "recovered": 1, "exhausted": 0, "abandoned": 0},
+            ),
+            # Failed after 1 request and 3 retries.
+            Case(
+                [500] * 5,
+                4,
+                False,
+                {"retries": 5, "recovered": 1, "exhausted": 1, "abandoned": 0},
+            ),
+            # Not retryable.
+            Case(
+                [404],
+                1,
+                False,
+                {"retries": 5, "recovered": 1, "exhausted": 1, "abandoned": 0},
+            ),
+        ]
+
+        for c in cases:
+            status_codes = list(c.status_codes)
+            requested_urls = []
+
+            def handler(request: httpx.Request) -> httpx.Response:
+                requested_urls.append(str(request.url))
+                return httpx.Response(
+                    status_codes.pop(0), headers={"retry-after": "0"}, text="Test"
+                )
+
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            ) as client:
+                wiki_resp = await self.wiki_api.fetch_wiki_api_response(
+                    test_url, client, response_validator=lambda _: False
+                )
+
+            self.assertEqual(len(requested_urls), c.expected_requests)
+            self.assertEqual(wiki_resp.status_ok, c.expected_status_ok)
+            self.assertEqual(self.wiki_api.retry_stats(), c.expected_stats)
+
+    async def test_fetch_wiki_api_response_revalidation(self):
+        """Test stale cached responses are revalidated with conditional requests."""
+        test_url = "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        cached_resp = wiki_api.WikiAPIResponse(
+            test_url,
+            True,
+            "Cached",
+            None,
+            etag='"v1"',
+            last_modified="Tue, 20 Feb 2024 00:00:00 GMT",
+            cached_at=datetime.now() - timedelta(hours=1),
+        )
+        touched_urls = []
+        self.test_cache.touch_many = touched_urls.extend
+
+        Case = namedtuple(
+            "Case", ("status_code", "expected_text", "expected_touched_urls")
+        )
+        cases = [
+            # Not modified: Only the cached time is bumped.
+            Case(304, "Cached", [test_url]),
+            # Modified: The new response and its validators are cached.
+            Case(200, "Updated", []),
+            # Failed revalidation: The stale response is returned instead of an error.
+            Case(404, "Cached", []),
+        ]
+
+        for c in cases:
+            touched_urls.clear()
+            self.test_cache._cache.clear()
+            request_headers = []
+
+            def handler(request: httpx.Request) -> httpx.Response:
+                request_headers.append(request.headers)
+                return httpx.Response(
+                    c.status_code, headers={"etag": '"v2"'}, text="Updated"
+                )
+
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            ) as client:
+                wiki_resp = await self.wiki_api.fetch_wiki_api_response(
+                    test_url,
+                    client,
+                    response_validator=lambda resp: resp.status_ok,
+                    cached_resp=cached_resp,
+                )
+
+            self.assertEqual(request_headers[0]["if-none-match"], '"v1"')
+            self.assertEqual(
+                request_headers[0]["if-modified-since"], cached_resp.last_modified
+            )
+            self.assertEqual(wiki_resp.text, c.expected_text)
+            self.assertEqual(touched_urls, c.expected_touched_urls)
+            if c.status_code == 200:
+                self.assertEqual(wiki_resp.etag, '"v2"')
+                self.assertEqual(self.test_cache._cache, {test_url: "Updated"})
+            else:
+                self.assertEqual(self.test_cache._cache, {})
+
+        self.assertEqual(
+            self.wiki_api.revalidation_stats(),
+            {"revalidations": 3, "not_modified": 1, "stale_fallbacks": 1},
+        )
+
+    async def test_fetch_wiki_api_response_retry_deadline(self):
+        """Test retries are abandoned when `Retry-After` exceeds the request deadline."""
+        test_url = "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        requested_urls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            return httpx.Response(503, headers={"retry-after": "10"}, text="Test")
+
+        deadline_token = wiki_api._request_deadline.set(
+            asyncio.get_running_loop().time() + 5
+        )
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            ) as client:
+                wiki_resp = await self.wiki_api.fetch_wiki_api_response(
+                    test_url, client, response_validator=lambda _: False
+                )
+        finally:
+            wiki_api._request_deadline.reset(deadline_token)
+
+        self.assertEqual(requested_urls, [test_url])
+        self.assertFalse(wiki_resp.status_ok)
+        self.assertEqual(self.wiki_api.retry_stats()["abandoned"], 1)
+
+    async def test_stream_most_read_articles(self):
+        """Test `stream_most_read_articles` yields ranked articles followed by an errors trailer."""
+        self.test_cache._cache[
+            "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        ] = featured_content("2024-02-19", [(1, 300), (2, 200), (3, 100)])
+        expected_records = [
+            {
+                "pageid": 1,
+                "page": "https://es.wikipedia.org/wiki/1",
+                "total_views": 300,
+                "view_history": [{"date": "2024-02-19", "views": 300}],
+            },
+            {
+                "pageid": 2,
+                "page": "https://es.wikipedia.org/wiki/2",
+                "total_views": 200,
+                "view_history": [{"date": "2024-02-19", "views": 200}],
+            },
+            {
+                "errors": [
+                    {"url": "", "message": "Limited response to 2 out of 3 results."}
+                ]
+            },
+        ]
+
+        records = [
+            record
+            async for record in self.wiki_api.stream_most_read_articles(
+                lang_code="es", start="2024-02-19", end="2024-02-19", results_limit=2
+            )
+        ]
+
+        self.assertEqual(records, expected_records)
+
+    async def test_fetch_most_read_articles_pagination(self):
+        """Test `fetch_most_read_articles` pages match the fully sorted ranking."""
+        self.test_cache._cache[
+            "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        ] = featured_content("2024-02-19", [(1, 300), (2, 100), (3, 200), (4, 100)])
+        self.test_cache._cache[
+            "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/21"
+        ] = featured_content("2024-02-20", [(5, 200), (4, 100), (6, 100)])
+
+        full_result = await self.wiki_api.fetch_most_read_articles(
+            lang_code="es", start="2024-02-19", end="2024-02-20"
+        )
+        ranked_pageids = [article["pageid"] for article in full_result["data"]]
+        # Articles with equal total views keep their order of appearance.
+        self.assertEqual(ranked_pageids, [1, 3, 4, 5, 2, 6])
+
+        for offset in range(0, 7, 2):
+            result = await self.wiki_api.fetch_most_read_articles(
+                lang_code="es",
+                start="2024-02-19",
+                end="2024-02-20",
+                results_limit=2,
+                offset=offset,
+            )
+            self.assertEqual(result["data"], full_result["data"][offset : offset + 2])
+
+        # Test limits beyond the top `MAX_RESPONSE_RESULTS` articles are clamped
+        result = await self.wiki_api.fetch_most_read_articles(
+            lang_code="es",
+            start="2024-02-19",
+            end="2024-02-20",
+            results_limit=wiki_api.WikiAPI.MAX_RESPONSE_RESULTS + 1000,
+            offset=1,
+        )
+        self.assertEqual(result["data"], full_result["data"][1:])
+
+        with self.assertRaises(wiki_api.InvalidPaginationError):
+            await self.wiki_api.fetch_most_read_articles(
+                lang_code="es", start="2024-02-19", end="2024-02-20", offset=-1
+            )
+
+    async def test_fetch_most_read_articles_multi(self):
+        """Test `fetch_most_read_articles_multi` fetches the uncached days of every language
+        in a single rate limited pipeline, on each host's pooled client.
+        """
+        api = wiki_api.WikiAPI(
+            optional_cache=self.test_cache, http_limits=httpx.Limits(), max_retries=0
+        )
+        # Cached language
+        for views_date, feed_date in (("2024-02-19", "20"), ("2024-02-20", "21")):
+            self.test_cache._cache[
+                f"https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/{feed_date}"
+            ] = featured_content(views_date, [(1, 300)])
+        requested_urls_by_host = {"en.wikipedia.org": [], "de.wikipedia.org": []}
+        failed_url = "https://de.wikipedia.org/api/rest_v1/feed/featured/2024/02/21"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls_by_host[request.url.host].append(str(request.url))
+            if str(request.url) == failed_url:
+                return httpx.Response(404, text="Not Found")
+            return httpx.Response(200, text=featured_content("2024-02-19", [(2, 100)]))
+
+        for host in requested_urls_by_host:
+            api._http_clients[host] = httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            )
+        rate_limited_batches = []
+        run_rate_limited_tasks = api.aio_rate_limiter.run_rate_limited_tasks
+
+        async def count_rate_limited_tasks(coros):
+            rate_limited_batches.append(len(coros))
+            return await run_rate_limited_tasks(coros)
+
+        api.aio_rate_limiter.run_rate_limited_tasks = count_rate_limited_tasks
+
+        result = await api.fetch_most_read_articles_multi(
+            ["en", "es", "de", "en"], start="2024-02-19", end="2024-02-20"
+        )
+        await api.aclose()
+
+        self.assertEqual(list(result["data"]), ["en", "es", "de"])
+        self.assertEqual(result["data"]["en"][0]["total_views"], 200)
+        self.assertEqual(result["data"]["es"][0]["total_views"], 600)
+        self.assertEqual(result["data"]["de"][0]["total_views"], 100)
+        self.assertEqual(
+            result["errors"],
+            [
+                {
+                    "lang_code": "de",
+                    "url": failed_url,
+                    "message": str(wiki_api.WikipediaResponseError()),
+                }
+            ],
+        )
+        # The 4 uncached days of both languages are scheduled together.
+        self.assertEqual(rate_limited_batches, [4])
+        for host, requested_urls in requested_urls_by_host.items():
+            self.assertEqual(len(requested_urls), 2)
+            self.assertTrue(all(host in url for url in requested_urls))
+
+        with self.assertRaises(wiki_api.InvalidLanguageCodeError):
+            await api.fetch_most_read_articles_multi(
+                ["en", "e$"], start="2024-02-19", end="2024-02-20"
+            )
+        with self.assertRaises(wiki_api.InvalidLanguageCodeError):
+            await api.fetch_most_read_articles_multi(
+                [], start="2024-02-19", end="2024-02-20"
+            )
+
+    async def test_fetch_writes_responses_in_chunks(self):
+        """Test fetched responses are written with `aput_many` in chunks, the ones completed
+        while a chunk is written joining the next one.
+        """
+        api = wiki_api.WikiAPI(
+            optional_cache=self.test_cache, http_limits=httpx.Limits(), max_retries=0
+        )
+        api._http_clients["en.wikipedia.org"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, text=featured_content("2024-02-19", [(1, 100)])
+                )
+            )
+        )
+        chunk_sizes = []
+        aput_many = self.test_cache.aput_many
+
+        async def slow_aput_many(wiki_resps: list[wiki_api.WikiAPIResponse]):
+            chunk_sizes.append(len(wiki_resps))
+            await asyncio.sleep(0.05)
+            await aput_many(wiki_resps)
+
+        self.test_cache.aput_many = slow_aput_many
+        self.test_cache.aput = None
+
+        await api.fetch_most_read_articles("en", start="2024-02-01", end="2024-02-10")
+        await api.aclose()
+
+        self.assertEqual(len(self.test_cache._cache), 10)
+        self.assertEqual(sum(chunk_sizes), 10)
+        self.assertLess(len(chunk_sizes), 10)
+
+    async def test_fetch_timeout_keeps_completed_days_cached(self):
+        """Test the days fetched before a fan-out times out are cached, so a retry doesn't fetch them again."""
+        api = wiki_api.WikiAPI(
+            optional_cache=self.test_cache, http_limits=httpx.Limits(), max_retries=0
+        )
+        hanging_url = "https://en.wikipedia.org/api/rest_v1/feed/featured/2024/02/23"
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if str(request.url) == hanging_url:
+                await asyncio.sleep(60)
+            return httpx.Response(200, text=featured_content("2024-02-19", [(1, 100)]))
+
+        api._http_clients["en.wikipedia.org"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+        with self.assertRaises(TimeoutError):
+            async with asyncio.timeout(0.5):
+                await api.fetch_most_read_articles(
+                    "en", start="2024-02-19", end="2024-02-22"
+                )
+        await api.aclose()
+
+        self.assertEqual(
+            sorted(self.test_cache._cache),
+            [
+                f"https://en.wikipedia.org/api/rest_v1/feed/featured/2024/02/{day}"
+                for day in (20, 21, 22)
+            ],
+        )
+
+    def test_parse_retry_after(self):
+        """Test `parse_retry_after` delay seconds and HTTP date values."""
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+        self.assertEqual(wiki_api.parse_retry_after("3"), 3)
+        self.assertEqual(wiki_api.parse_retry_after(None), 0)
+        self.assertEqual(wiki_api.parse_retry_after("soon"), 0)
+        self.assertAlmostEqual(
+            wiki_api.parse_retry_after(format_datetime(retry_at, usegmt=True)),
+            120,
+            delta=2,
+        )
+
 
 if __name__ == "__main__":
     # Leaving this to facilitate debugging.
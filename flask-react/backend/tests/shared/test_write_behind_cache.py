@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sys
+from threading import Event, Thread
+from unittest import TestCase, main
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from shared.wiki_api import WikiAPIResponse
+from shared.write_behind_cache import WriteBehindWikiCache
+from tests.shared.test_wiki_api import TestCache
+
+
+class GatedTestCache(TestCache):
+    """This is a TestCache whose writes wait for `write_gate`, recording the written batches."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.write_started = Event()
+        self.write_gate = Event()
+        self.batches: list[list[str]] = []
+
+    def put_many(self, wiki_resps: list[WikiAPIResponse]):
+        self.write_started.set()
+        self.write_gate.wait()
+        self.batches.append([wiki_resp.url for wiki_resp in wiki_resps])
+        super().put_many(wiki_resps)
+
+
+class WriteBehindWikiCacheTests(TestCase):
+
+    def setUp(self):
+        self.backing_cache = GatedTestCache()
+        self.write_behind_cache = WriteBehindWikiCache(
+            self.backing_cache, max_pending=3, flush_interval_secs=0
+        )
+
+    def tearDown(self):
+        self.backing_cache.write_gate.set()
+        self.write_behind_cache.close(timeout=1)
+
+    def test_async_put_many_queues_responses(self):
+        """Test async puts are queued without waiting for the write, and readable meanwhile."""
+
+        async def put_and_get():
+            await self.write_behind_cache.aput(
+                WikiAPIResponse("test_url", True, "Test", None)
+            )
+            return await self.write_behind_cache.amulti_get(["test_url", "missing_url"])
+
+        cached_responses = asyncio.run(put_and_get())
+        self.assertEqual(list(cached_responses), ["test_url"])
+        self.assertEqual(cached_responses["test_url"].text, "Test")
+
+        self.backing_cache.write_gate.set()
+        self.assertTrue(self.write_behind_cache.flush(timeout=1))
+        self.assertEqual(self.backing_cache._cache, {"test_url": "Test"})
+
+    def test_queued_responses_are_readable(self):
+        """Test puts return before they're written, and are readable meanwhile."""
+        self.write_behind_cache.put(WikiAPIResponse("test_url", True, "Test", None))
+        self.write_behind_cache.put(WikiAPIResponse("error_url", False, "", None))
+
+        self.assertEqual(self.backing_cache._cache, {})
+        self.assertEqual(self.write_behind_cache.get("test_url").text, "Test")
+        self.assertIsNone(self.write_behind_cache.get("error_url"))
+
+        # Test later puts replace queued responses.
+        self.write_behind_cache.put(WikiAPIResponse("test_url", True, "Updated", None))
+        self.assertEqual(self.write_behind_cache.get("test_url").text, "Updated")
+
+        self.backing_cache.write_gate.set()
+        self.assertTrue(self.write_behind_cache.flush(timeout=1))
+        self.assertEqual(self.backing_cache._cache, {"test_url": "Updated"})
+        self.assertEqual(self.write_behind_cache.get("test_url").text, "Updated")
+        self.assertEqual(self.write_behind_cache.stats()["pending"], 0)
+
+    def test_max_pending_backpressure(self):
+        """Test puts wait for the background writer while the queue is full."""
+        # The first response is taken by the (blocked) writer, the next 3 fill the queue.
+        self.write_behind_cache.put(WikiAPIResponse("test_url_0", True, "Test", None))
+        self.assertTrue(self.backing_cache.write_started.wait(timeout=1))
+        for i in range(1, 4):
+            self.write_behind_cache.put(
+                WikiAPIResponse(f"test_url_{i}", True, "Test", None)
+            )
+        self.assertFalse(self.write_behind_cache.flush(timeout=0.05))
+
+        blocked_put = Thread(
+            target=self.write_behind_cache.put,
+            args=(WikiAPIResponse("test_url_4", True, "Test", None),),
+        )
+        blocked_put.start()
+        blocked_put.join(timeout=0.1)
+        self.assertTrue(blocked_put.is_alive())
+
+        self.backing_cache.write_gate.set()
+        blocked_put.join(timeout=1)
+        self.assertFalse(blocked_put.is_alive())
+        self.assertTrue(self.write_behind_cache.flush(timeout=1))
+        self.assertEqual(len(self.backing_cache._cache), 5)
+        self.assertGreater(self.write_behind_cache.stats()["backpressure_waits"], 0)
+        # Queued responses are written in batches.
+        self.assertLess(len(self.backing_cache.batches), 5)
+
+    def test_close_flushes_queue(self):
+        """Test closing writes the queued responses, and later puts are written synchronously."""
+        self.write_behind_cache.put(WikiAPIResponse("test_url", True, "Test", None))
+        self.backing_cache.write_gate.set()
+
+        self.assertTrue(self.write_behind_cache.close(timeout=1))
+        self.assertEqual(self.backing_cache._cache, {"test_url": "Test"})
+
+        self.write_behind_cache.put(WikiAPIResponse("late_url", True, "Late", None))
+        self.assertEqual(self.backing_cache._cache["late_url"], "Late")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            WriteBehindWikiCache(self.backing_cache, max_pending=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,46 @@
 import asyncio
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import httpx
 import json
+import math
 import os
 import sys
 from tempfile import TemporaryDirectory
-from unittest import TestCase, main
+from threading import Thread, current_thread
+from unittest import TestCase, main, skipUnless
+from unittest.mock import patch
 
 # Add the project root directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app import create_app, run_timed_task, ResponseCache
-from app.config import Config
+from app import (
+    create_app,
+    AsyncResponseCache,
+    ResponseCache,
+)
+from app.backfill import BatchWriteWikiCache, MostReadBackfill
+from app.config import Config, ProductionConfig
 from app.extensions import db
-from app.models import CachedResponse
-from shared.wiki_api import WikiAPIResponse
+from app.models import (
+    FULL_RESPONSE_FORMAT,
+    MOSTREAD_PROJECTION_FORMAT,
+    BackfillCheckpoint,
+    CachedResponse,
+    CompressionDictionary,
+)
+from app.most_read_articles import run_timed_task, _result_cache_ttl
+import shared.compression as compression
+import shared.content_encoding as content_encoding
+from shared.wiki_api import (
+    InvalidPaginationError,
+    WikiAPI,
+    WikiAPIResponse,
+    WikiCache,
+)
 from tests.shared.expected_results_wiki_api import (
     EXPECTED_MOST_READ_ES_20240219,
 )
+from tests.shared.test_wiki_api import featured_content
 
 
 class TestApp(TestCase):
@@ -40,6 +64,7 @@ class TestApp(TestCase):
         self.client = app.test_client()
 
     def tearDown(self):
+        self.app.extensions["event_loop_thread"].stop()
         os.remove(self.temp_db_file)
         os.rmdir(os.path.dirname(self.temp_db_file))
         print(f"==> tearDown removed temp_db_file={self.temp_db_file}")
@@ -72,6 +97,7 @@ class TestApp(TestCase):
         self.assertEqual(response.json, expected_data)
 
         # Test CachedResponse Stored
+        self.app.extensions["write_behind_cache"].flush()
         with self.app.app_context():
             cached_response = db.session.get(CachedResponse, test_cached_url)
             self.assertEqual(
@@ -79,6 +105,279 @@ class TestApp(TestCase):
                 "2024-02-19Z",
             )
 
+    def test_most_read_articles_http_caching(self):
+        ResponseCache(self.app).put(
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                True,
+                featured_content("2024-02-19", [(1, 300), (2, 200)]),
+                None,
+            )
+        )
+        params = {"lang_code": "es", "start": "2024-02-19", "end": "2024-02-19"}
+
+        response = self.client.get("/most_read_articles", query_string=params)
+        self.assertEqual(response.status_code, 200)
+        etag, _ = response.get_etag()
+        self.assertTrue(etag)
+        self.assertEqual(
+            response.headers["Cache-Control"],
+            f"public, max-age={self.app.config['HTTP_CACHE_FINAL_MAX_AGE_SECS']}",
+        )
+
+        # Test Not Modified, from the memoized response
+        response = self.client.get(
+            "/most_read_articles",
+            query_string=params,
+            headers={"If-None-Match": f'"{etag}"'},
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.get_etag(), (etag, False))
+
+        # Test Not Modified without memoized results (e.g. after a restart), from the cached days' validators
+        self.app.extensions["result_cache"].clear()
+        self.app.extensions["memory_cache"].clear()
+        wiki_api = self.app.extensions["wiki_api"]
+        with patch.object(
+            wiki_api, "fetch_most_read_articles_rankings"
+        ) as fetch_rankings:
+            response = self.client.get(
+                "/most_read_articles",
+                query_string=params,
+                headers={"If-None-Match": f'"{etag}"'},
+            )
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.get_etag(), (etag, False))
+            fetch_rankings.assert_not_called()
+
+        # Test a changed day changes the ETag
+        ResponseCache(self.app).put(
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                True,
+                featured_content("2024-02-19", [(1, 300), (2, 400)]),
+                None,
+                etag='"upstream-v2"',
+            )
+        )
+        self.app.extensions["result_cache"].clear()
+        self.app.extensions["memory_cache"].clear()
+        response = self.client.get(
+            "/most_read_articles",
+            query_string=params,
+            headers={"If-None-Match": f'"{etag}"'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["data"][0]["pageid"], 2)
+        self.assertNotEqual(response.get_etag()[0], etag)
+
+        # Test other pages have other ETags
+        response = self.client.get(
+            "/most_read_articles",
+            query_string={**params, "limit": 1},
+            headers={"If-None-Match": f'"{etag}"'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_etag()[0], etag)
+
+        # Test request errors are not cached
+        response = self.client.get(
+            "/most_read_articles",
+            query_string={**params, "start": "2024-02-20"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNone(response.get_etag()[0])
+        self.assertEqual(response.headers["Cache-Control"], "no-store")
+
+    def test_most_read_articles_compression(self):
+        ResponseCache(self.app).put(
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                True,
+                featured_content(
+                    "2024-02-19", [(pageid, 1000 - pageid) for pageid in range(50)]
+                ),
+                None,
+            )
+        )
+        params = {"lang_code": "es", "start": "2024-02-19", "end": "2024-02-19"}
+        gzip_headers = {"Accept-Encoding": "gzip"}
+
+        response = self.client.get("/most_read_articles", query_string=params)
+        self.assertIsNone(response.content_encoding)
+        self.assertIn("Accept-Encoding", response.vary)
+        json_response = response.data
+        etag, _ = response.get_etag()
+
+        # Test the compressed bytes of the memoized response are memoized too.
+        with patch(
+            "app.most_read_articles.encode_content",
+            wraps=content_encoding.encode_content,
+        ) as encode_content:
+            for _ in range(2):
+                response = self.client.get(
+                    "/most_read_articles", query_string=params, headers=gzip_headers
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content_encoding, "gzip")
+                self.assertEqual(
+                    content_encoding.decode_content(response.data, "gzip"),
+                    json_response,
+                )
+                self.assertLess(len(response.data), len(json_response))
+            self.assertEqual(encode_content.call_count, 1)
+
+        # Test each content coding has its own ETag.
+        gzip_etag, _ = response.get_etag()
+        self.assertEqual(gzip_etag, f"{etag}-gzip")
+        response = self.client.get(
+            "/most_read_articles",
+            query_string=params,
+            headers={**gzip_headers, "If-None-Match": f'"{etag}"'},
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            "/most_read_articles",
+            query_string=params,
+            headers={**gzip_headers, "If-None-Match": f'"{gzip_etag}"'},
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # Test rejected content codings
+        response = self.client.get(
+            "/most_read_articles",
+            query_string=params,
+            headers={"Accept-Encoding": "gzip;q=0, compress"},
+        )
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(response.data, json_response)
+
+    def test_most_read_articles_ranking_depth(self):
+        ResponseCache(self.app).put(
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                True,
+                featured_content(
+                    "2024-02-19", [(pageid, 1000 - pageid) for pageid in range(50)]
+                ),
+                None,
+            )
+        )
+        params = {"lang_code": "es", "start": "2024-02-19", "end": "2024-02-19"}
+        result_cache = self.app.extensions["result_cache"]
+        wiki_api = self.app.extensions["wiki_api"]
+
+        with patch.object(
+            wiki_api,
+            "fetch_most_read_articles_rankings",
+            wraps=wiki_api.fetch_most_read_articles_rankings,
+        ) as fetch_rankings:
+            # Test the first page only ranks its articles
+            response = self.client.get(
+                "/most_read_articles", query_string={**params, "limit": 5}
+            )
+            self.assertEqual(len(response.json["data"]), 5)
+            ranking, _ = result_cache.get(("es", params["start"], params["end"]))
+            self.assertEqual(len(ranking.articles), 5)
+            self.assertEqual(ranking.total_articles, 50)
+
+            # Test pages within the memoized depth are served from it
+            response = self.client.get(
+                "/most_read_articles", query_string={**params, "limit": 3, "offset": 2}
+            )
+            self.assertEqual(
+                [article["pageid"] for article in response.json["data"]], [2, 3, 4]
+            )
+            self.assertEqual(fetch_rankings.call_count, 1)
+
+            # Test deeper pages replace the memoized ranking
+            response = self.client.get(
+                "/most_read_articles", query_string={**params, "limit": 5, "offset": 5}
+            )
+            self.assertEqual(
+                [article["pageid"] for article in response.json["data"]],
+                [5, 6, 7, 8, 9],
+            )
+            self.assertEqual(fetch_rankings.call_count, 2)
+            ranking, _ = result_cache.get(("es", params["start"], params["end"]))
+            self.assertEqual(len(ranking.articles), 10)
+
+    def test_most_read_articles_multi_language(self):
+        for lang_code, articles in (("es", [(1, 300), (2, 200)]), ("de", [(3, 100)])):
+            ResponseCache(self.app).put(
+                WikiAPIResponse(
+                    f"https://{lang_code}.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                    True,
+                    featured_content("2024-02-19", articles),
+                    None,
+                )
+            )
+        params = {"start": "2024-02-19", "end": "2024-02-19"}
+
+        response = self.client.get(
+            "/most_read_articles", query_string={**params, "lang_code": "es,de"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json["data"]), {"es", "de"})
+        self.assertEqual(
+            [article["pageid"] for article in response.json["data"]["es"]], [1, 2]
+        )
+        self.assertEqual(response.json["errors"], [])
+        multi_language_data = response.json["data"]
+
+        # Test each language's ranking is memoized for other requests
+        result_cache = self.app.extensions["result_cache"]
+        for lang_code in ("es", "de"):
+            self.assertIsNotNone(
+                result_cache.get((lang_code, params["start"], params["end"]))
+            )
+
+        # Test a single language keeps the single language response
+        response = self.client.get(
+            "/most_read_articles", query_string={**params, "lang_code": "de"}
+        )
+        self.assertEqual(response.json["data"], multi_language_data["de"])
+
+        # Test a repeated language keeps the single language response
+        response = self.client.get(
+            "/most_read_articles", query_string={**params, "lang_code": "de,de"}
+        )
+        self.assertEqual(response.json["data"], multi_language_data["de"])
+
+        # Test repeated parameters, merged errors and NDJSON records tagged with their language
+        response = self.client.get(
+            "/most_read_articles",
+            query_string={
+                **params,
+                "lang_code": ["de", "es"],
+                "limit": 1,
+                "format": "ndjson",
+            },
+        )
+        records = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(
+            [(record["lang_code"], record["pageid"]) for record in records[:-1]],
+            [("de", 3), ("es", 1)],
+        )
+        self.assertEqual(
+            [error["lang_code"] for error in records[-1]["errors"]], ["es"]
+        )
+
+        response = self.client.get(
+            "/most_read_articles", query_string={**params, "lang_code": "es,e$"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("request_error", response.json)
+
+        # Test the number of languages is capped
+        lang_codes = ",".join(["es"] * (self.app.config["MAX_LANG_CODES"] + 1))
+        response = self.client.get(
+            "/most_read_articles", query_string={**params, "lang_code": lang_codes}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("request_error", response.json)
+
     def test_most_read_articles_error(self):
         params = {"lang_code": "en", "start": "2024-01-14", "end": "2024-01-13"}
         expected_status_code = 400
@@ -91,6 +390,85 @@ class TestApp(TestCase):
         self.assertEqual(response.status_code, expected_status_code)
         self.assertEqual(response.json, expected_data)
 
+    def test_most_read_articles_ndjson_error(self):
+        params = {
+            "lang_code": "en",
+            "start": "2024-01-14",
+            "end": "2024-01-13",
+            "format": "ndjson",
+        }
+        expected_status_code = 400
+        expected_lines = [
+            {
+                "request_error": "Invalid date range, start date should be before the end date."
+            }
+        ]
+
+        response = self.client.get("/most_read_articles", query_string=params)
+
+        self.assertEqual(response.status_code, expected_status_code)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertEqual(
+            [json.loads(line) for line in response.text.splitlines()], expected_lines
+        )
+
+    def test_most_read_articles_invalid_pagination(self):
+        params = {"lang_code": "en", "start": "2024-01-13", "end": "2024-01-14"}
+        invalid_paginations = [
+            {"limit": "ten"},
+            {"limit": 0},
+            {"offset": -1},
+            {"limit": 10, "offset": 4995},
+        ]
+
+        for pagination in invalid_paginations:
+            response = self.client.get(
+                "/most_read_articles", query_string={**params, **pagination}
+            )
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(
+                response.json, {"request_error": str(InvalidPaginationError())}
+            )
+
+    def test_most_read_articles_offset_default_limit(self):
+        ResponseCache(self.app).put(
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                True,
+                featured_content("2024-02-19", [(1, 300), (2, 200), (3, 100)]),
+                None,
+            )
+        )
+
+        # The limit defaults to the articles from the offset up to the top `MAX_RESPONSE_RESULTS`.
+        response = self.client.get(
+            "/most_read_articles",
+            query_string={
+                "lang_code": "es",
+                "start": "2024-02-19",
+                "end": "2024-02-19",
+                "offset": 1,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [article["pageid"] for article in response.json["data"]], [2, 3]
+        )
+
+    def test_most_read_articles_unsupported_format(self):
+        params = {
+            "lang_code": "en",
+            "start": "2024-01-13",
+            "end": "2024-01-14",
+            "format": "xml",
+        }
+
+        response = self.client.get("/most_read_articles", query_string=params)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("request_error", response.json)
+
     # MARK: - run_timed_task Tests
 
     def test_run_timed_task_timeout(self):
@@ -109,6 +487,34 @@ class TestApp(TestCase):
         )
         self.assertEqual(result, expected_result)
 
+    # MARK: - _result_cache_ttl Tests
+
+    def test_result_cache_ttl(self):
+        recent_ttl = 300
+        today = datetime.today().strftime("%Y-%m-%d")
+        last_week = (datetime.today() - timedelta(days=7)).strftime("%Y-%m-%d")
+        limited_result = {
+            "data": [],
+            "errors": [
+                {"url": "", "message": "Limited response to 1 out of 2 results."}
+            ],
+        }
+        url_error_result = {
+            "data": [],
+            "errors": [{"url": "https://es.wikipedia.org/...", "message": "Error"}],
+        }
+
+        self.assertEqual(
+            _result_cache_ttl(limited_result, last_week, recent_ttl), math.inf
+        )
+        self.assertEqual(
+            _result_cache_ttl(limited_result, today, recent_ttl), recent_ttl
+        )
+        self.assertIsNone(_result_cache_ttl(url_error_result, last_week, recent_ttl))
+        self.assertIsNone(
+            _result_cache_ttl({"request_error": "Error"}, last_week, recent_ttl)
+        )
+
     # MARK: - ResponseCache Tests
 
     def test_response_cache(self):
@@ -145,6 +551,570 @@ class TestApp(TestCase):
             second_put_time = db.session.get(CachedResponse, test_url).created_at
             self.assertGreater(second_put_time, first_put_time)
 
+    def test_response_cache_multi_get_put_many(self):
+        with self.app.app_context():
+            cache = ResponseCache()
+
+            test_urls = ["test_url_1", "test_url_2", "test_url_3"]
+
+            # Test Cache Miss
+            self.assertEqual(cache.multi_get(test_urls), {})
+
+            # Test Cache Put Many (erroneous responses are skipped)
+            cache.put_many(
+                [
+                    WikiAPIResponse(test_urls[0], True, "Test 1", None),
+                    WikiAPIResponse(test_urls[1], True, "Test 2", None),
+                    WikiAPIResponse(test_urls[2], False, "Error", None),
+                ]
+            )
+
+            # Test Cache Hits
+            cached_responses = cache.multi_get(test_urls)
+            self.assertEqual(set(cached_responses.keys()), set(test_urls[:2]))
+            self.assertEqual(cached_responses[test_urls[0]].text, "Test 1")
+            self.assertEqual(cached_responses[test_urls[1]].text, "Test 2")
+
+            # Test Cache Update
+            cache.put_many([WikiAPIResponse(test_urls[0], True, "Updated", None)])
+            self.assertEqual(
+                cache.multi_get(test_urls[:1])[test_urls[0]].text, "Updated"
+            )
+
+    def test_response_cache_aggregate_most_read_articles(self):
+        def featured_content(views_date: str, articles: list[tuple[int, int]]) -> str:
+            return json.dumps(
+                {
+                    "tfa": {},
+                    "mostread": {
+                        "date": f"{views_date}Z",
+                        "articles": [
+                            {
+                                "pageid": pageid,
+                                "views": views,
+                                "content_urls": {
+                                    "desktop": {
+                                        "page": f"https://es.wikipedia.org/wiki/{pageid}"
+                                    }
+                                },
+                            }
+                            for pageid, views in articles
+                        ],
+                    },
+                }
+            )
+
+        test_responses = [
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                True,
+                featured_content("2024-02-19", [(1, 300), (2, 200), (3, 100)]),
+                None,
+            ),
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/21",
+                True,
+                featured_content("2024-02-20", [(3, 400), (4, 300), (1, 100)]),
+                None,
+            ),
+        ]
+        start_date = datetime(2024, 2, 19)
+        end_date = datetime(2024, 2, 20)
+
+        with self.app.app_context():
+            cache = ResponseCache()
+
+            # Test date range not fully ingested
+            cache.put_many(test_responses[:1])
+            self.assertIsNone(
+                cache.aggregate_most_read_articles("es", start_date, end_date, 10)
+            )
+
+            # Test SQL aggregation matches the WikiAPI reducer results.
+            cache.put_many(test_responses[1:])
+            (
+                expected_articles,
+                _,
+            ) = WikiAPI()._reduce_and_sort_featured_content_most_read_articles(
+                [wiki_resp.text for wiki_resp in test_responses]
+            )
+            self.assertEqual(
+                cache.aggregate_most_read_articles("es", start_date, end_date, 10),
+                (expected_articles, 4),
+            )
+            self.assertEqual(
+                cache.aggregate_most_read_articles("es", start_date, end_date, 2),
+                (expected_articles[:2], 4),
+            )
+
+            # Test other languages are not aggregated.
+            self.assertIsNone(
+                cache.aggregate_most_read_articles("en", start_date, end_date, 10)
+            )
+
+    def test_response_cache_mostread_projection(self):
+        test_url = "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        test_response = json.dumps(
+            {
+                "tfa": {"title": "Test"},
+                "news": [{"story": "Test"}],
+                "mostread": {
+                    "date": "2024-02-19Z",
+                    "articles": [
+                        {
+                            "pageid": 1,
+                            "views": 100,
+                            "title": "Test",
+                            "extract": "Test",
+                            "content_urls": {
+                                "desktop": {"page": "https://es.wikipedia.org/wiki/1"},
+                                "mobile": {"page": "https://es.m.wikipedia.org/wiki/1"},
+                            },
+                        }
+                    ],
+                },
+            }
+        )
+        expected_projection = {
+            "mostread": {
+                "date": "2024-02-19Z",
+                "articles": [
+                    {
+                        "pageid": 1,
+                        "views": 100,
+                        "content_urls": {
+                            "desktop": {"page": "https://es.wikipedia.org/wiki/1"}
+                        },
+                    }
+                ],
+            }
+        }
+
+        with self.app.app_context():
+            # Test full response stored by the default mode.
+            ResponseCache().put(WikiAPIResponse(test_url, True, test_response, None))
+            cached_resp = db.session.get(CachedResponse, test_url)
+            self.assertEqual(cached_resp.format_version, FULL_RESPONSE_FORMAT)
+            self.assertEqual(cached_resp.text_response, test_response)
+            db.session.remove()
+
+            # Test full response lazily rewritten when read in projection mode.
+            cache = ResponseCache(mostread_projection=True)
+            self.assertEqual(json.loads(cache.get(test_url).text), expected_projection)
+            db.session.remove()
+
+            cached_resp = db.session.get(CachedResponse, test_url)
+            self.assertEqual(cached_resp.format_version, MOSTREAD_PROJECTION_FORMAT)
+            self.assertEqual(json.loads(cached_resp.text_response), expected_projection)
+
+            # Test projection stored on put.
+            cache.put(WikiAPIResponse(test_url, True, test_response, None))
+            self.assertEqual(json.loads(cache.get(test_url).text), expected_projection)
+
+            # Test non Featured Content responses are stored as is.
+            cache.put(WikiAPIResponse("test_url", True, "Test", None))
+            self.assertEqual(cache.get("test_url").text, "Test")
+
+    def test_response_cache_touch_many(self):
+        with self.app.app_context():
+            cache = ResponseCache()
+            test_url = "test_url"
+
+            cache.put(
+                WikiAPIResponse(
+                    test_url, True, "Test", None, etag='"v1"', last_modified="Mon"
+                )
+            )
+            wiki_resp = cache.get(test_url)
+            self.assertEqual(wiki_resp.etag, '"v1"')
+            self.assertEqual(wiki_resp.last_modified, "Mon")
+            put_time = wiki_resp.cached_at
+            compressed_response = db.session.get(
+                CachedResponse, test_url
+            ).compressed_response
+
+            # Only `created_at` is bumped, the response is not rewritten.
+            cache.touch_many([test_url, "missing_url"])
+            db.session.expire_all()
+            cached_resp = db.session.get(CachedResponse, test_url)
+            self.assertGreater(cached_resp.created_at, put_time)
+            self.assertEqual(cached_resp.compressed_response, compressed_response)
+            self.assertEqual(cache.get(test_url).cached_at, cached_resp.created_at)
+            self.assertIsNone(cache.get("missing_url"))
+
+    def test_response_cache_fetch_leases(self):
+        with self.app.app_context():
+            cache = ResponseCache()
+
+            test_urls = ["test_url_1", "test_url_2"]
+
+            # Test leases are exclusive to their owner.
+            self.assertEqual(
+                cache.acquire_fetch_leases(test_urls[:1], "A", 30), test_urls[:1]
+            )
+            self.assertEqual(
+                cache.acquire_fetch_leases(test_urls, "B", 30), test_urls[1:]
+            )
+
+            self.assertEqual(cache.leased_fetch_urls(test_urls + ["x"]), test_urls)
+
+            # Test released leases can be acquired by other owners.
+            cache.release_fetch_leases(test_urls, "A")
+            self.assertEqual(cache.leased_fetch_urls(test_urls), test_urls[1:])
+            self.assertEqual(
+                cache.acquire_fetch_leases(test_urls[:1], "C", 30), test_urls[:1]
+            )
+
+            # Test expired leases can be acquired by other owners.
+            cache.acquire_fetch_leases(["test_url_3"], "A", -1)
+            self.assertEqual(cache.leased_fetch_urls(["test_url_3"]), [])
+            self.assertEqual(
+                cache.acquire_fetch_leases(["test_url_3"], "B", 30), ["test_url_3"]
+            )
+
+    def test_fetch_lease_released_without_response(self):
+        # A process waiting for another process' fetch stops waiting once its lease is released,
+        # even though its response wasn't cached (e.g. a 404).
+        cache = ResponseCache(self.app)
+        url = "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        requested_urls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            await asyncio.sleep(0.2)
+            return httpx.Response(404, text="Not Found")
+
+        async def fetch_concurrently() -> float:
+            apis = [
+                WikiAPI(optional_cache=cache, http_limits=httpx.Limits(), max_retries=0)
+                for _ in range(2)
+            ]
+            for api in apis:
+                api._http_clients["es.wikipedia.org"] = httpx.AsyncClient(
+                    transport=httpx.MockTransport(handler)
+                )
+            owner_task = asyncio.create_task(
+                apis[0].fetch_featured_content_responses(
+                    "es", datetime(2024, 2, 19), datetime(2024, 2, 19)
+                )
+            )
+            await asyncio.sleep(0.05)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await apis[1].fetch_featured_content_responses(
+                "es", datetime(2024, 2, 19), datetime(2024, 2, 19)
+            )
+            waiter_secs = loop.time() - start
+            await owner_task
+            for api in apis:
+                await api.aclose()
+            return waiter_secs
+
+        waiter_secs = asyncio.run(fetch_concurrently())
+
+        self.assertLess(waiter_secs, WikiAPI.FETCH_LEASE_SECS / 10)
+        # The waiter fetched the URL itself after the owner's lease was released.
+        self.assertEqual(requested_urls, [url, url])
+
+    def test_response_cache_outside_app_context(self):
+        # Pushes its own app context, e.g. when called from the background event loop thread.
+        cache = ResponseCache(self.app)
+
+        test_url = "test_url"
+        test_response = "Test"
+
+        self.assertIsNone(cache.get(test_url))
+        cache.put(WikiAPIResponse(test_url, True, test_response, None))
+        self.assertEqual(cache.get(test_url).text, test_response)
+
+    def test_async_response_cache_executor(self):
+        # The SQLite work of the async variants runs on the executor threads, not on the event loop.
+        cache = AsyncResponseCache(self.app, max_workers=1)
+        # Structure: [(method name, thread name)]
+        query_threads = []
+
+        def record_thread(name: str):
+            method = getattr(cache, name)
+
+            def recorded_method(*args):
+                query_threads.append((name, current_thread().name))
+                return method(*args)
+
+            setattr(cache, name, recorded_method)
+
+        for name in (
+            "multi_get",
+            "acquire_fetch_leases",
+            "release_fetch_leases",
+            "aggregate_most_read_articles",
+        ):
+            record_thread(name)
+
+        async def put_and_get():
+            await cache.aput(WikiAPIResponse("test_url", True, "Test", None))
+            leased_urls = await cache.aacquire_fetch_leases(["lease_url"], "owner", 10)
+            await cache.arelease_fetch_leases(leased_urls, "owner")
+            await cache.aaggregate_most_read_articles(
+                "en", datetime(2024, 2, 19), datetime(2024, 2, 19), 10
+            )
+            return await cache.amulti_get(["test_url", "missing_url"])
+
+        cached_responses = asyncio.run(put_and_get())
+        self.assertEqual(list(cached_responses), ["test_url"])
+        self.assertEqual(cached_responses["test_url"].text, "Test")
+        self.assertEqual(
+            [name for name, _ in query_threads],
+            [
+                "acquire_fetch_leases",
+                "release_fetch_leases",
+                "aggregate_most_read_articles",
+                "multi_get",
+            ],
+        )
+        self.assertTrue(
+            all(thread.startswith("ResponseCache") for _, thread in query_threads)
+        )
+
+        cache.close()
+        with self.assertRaises(RuntimeError):
+            asyncio.run(cache.aget("test_url"))
+
+    @skipUnless(compression.zstandard, "zstandard is not installed")
+    def test_response_cache_zstd_dictionary(self):
+        test_text = json.dumps({"mostread": {"articles": [{"pageid": 1}] * 20}})
+        dictionary = compression.train_zstd_dictionary(
+            [
+                json.dumps({"mostread": {"articles": [{"pageid": i}] * (i % 20)}})
+                for i in range(200)
+            ],
+            1024,
+        )
+
+        with self.app.app_context():
+            # Rows compressed before switching codecs.
+            ResponseCache().put(WikiAPIResponse("zlib_url", True, test_text, None))
+
+            dict_id = compression.ResponseCompressor().add_dictionary(dictionary)
+            db.session.add(
+                CompressionDictionary(
+                    dict_id=dict_id, dictionary=dictionary, created_at=datetime.now()
+                )
+            )
+            db.session.commit()
+
+            # Test new rows are compressed with the newest dictionary.
+            cache = ResponseCache(
+                compressor=compression.ResponseCompressor(compression.ZSTD_CODEC)
+            )
+            cache.put(WikiAPIResponse("zstd_url", True, test_text, None))
+            cached_resp = db.session.get(CachedResponse, "zstd_url")
+            self.assertEqual(cached_resp.codec, compression.ZSTD_CODEC)
+            self.assertEqual(
+                cache.compressor.dictionary_id_of(
+                    cached_resp.codec, cached_resp.compressed_response
+                ),
+                dict_id,
+            )
+
+            # Test rows of both codecs are readable.
+            cached_responses = cache.multi_get(["zlib_url", "zstd_url"])
+            self.assertEqual(cached_responses["zlib_url"].text, test_text)
+            self.assertEqual(cached_responses["zstd_url"].text, test_text)
+            self.assertEqual(
+                db.session.get(CachedResponse, "zlib_url").codec,
+                compression.ZLIB_CODEC,
+            )
+
+    def test_production_config_group_commit(self):
+        config = ProductionConfig()
+        config.SQLALCHEMY_DATABASE_URI = self.app.config["SQLALCHEMY_DATABASE_URI"]
+        app = create_app(config)
+        cache = app.extensions["response_cache"]
+
+        try:
+            with app.app_context():
+                # Test the pragmas are set on new connections.
+                self.assertEqual(
+                    db.session.execute(db.text("PRAGMA journal_mode")).scalar(), "wal"
+                )
+                self.assertEqual(
+                    db.session.execute(db.text("PRAGMA synchronous")).scalar(), 1
+                )
+
+            # Test puts of concurrent threads are all committed.
+            test_urls = [f"test_url_{i}" for i in range(10)]
+            threads = [
+                Thread(
+                    target=cache.put,
+                    args=(WikiAPIResponse(url, True, "Test", None),),
+                )
+                for url in test_urls
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(len(cache.multi_get(test_urls)), len(test_urls))
+            self.assertEqual(cache.group_committer.stats()["items"], len(test_urls))
+        finally:
+            app.extensions["event_loop_thread"].stop()
+            with app.app_context():
+                db.engine.dispose()
+
+    # MARK: - MostReadBackfill Tests
+
+    def test_backfill_resumes_from_checkpoint(self):
+        class TestWikiAPI:
+            """Stand-in of WikiAPI failing the 2024-02-05 day, and interrupted on `interrupted_call`."""
+
+            def __init__(self, interrupted_call: int = None) -> None:
+                self.interrupted_call = interrupted_call
+                self.calls: list[tuple[date, date]] = []
+
+            async def fetch_featured_content_responses(
+                self, lang_code: str, start_date: datetime, end_date: datetime
+            ) -> list[WikiAPIResponse]:
+                self.calls.append((start_date.date(), end_date.date()))
+                if len(self.calls) == self.interrupted_call:
+                    raise KeyboardInterrupt
+                wiki_resps = []
+                views_date = start_date
+                while views_date <= end_date:
+                    url = f"https://{lang_code}.wikipedia.org/{views_date:%Y/%m/%d}"
+                    text = json.dumps(
+                        {
+                            "mostread": {
+                                "date": f"{views_date:%Y-%m-%d}Z",
+                                "articles": [],
+                            }
+                        }
+                    )
+                    status_ok = views_date != datetime(2024, 2, 5)
+                    wiki_resps.append(WikiAPIResponse(url, status_ok, text, None))
+                    views_date += timedelta(days=1)
+                return wiki_resps
+
+        start_date = date(2024, 2, 1)
+        end_date = date(2024, 2, 10)
+        reports = []
+
+        # Test an interrupted backfill keeps the checkpoint of its completed batches.
+        wiki_api = TestWikiAPI(interrupted_call=2)
+        backfill = MostReadBackfill(
+            self.app, wiki_api, batch_days=3, report=reports.append
+        )
+        with self.assertRaises(KeyboardInterrupt):
+            asyncio.run(backfill.run(["es"], start_date, end_date))
+
+        # Test the backfill resumes from the next batch.
+        wiki_api = TestWikiAPI()
+        backfill = MostReadBackfill(
+            self.app, wiki_api, batch_days=3, report=reports.append
+        )
+        stats = asyncio.run(backfill.run(["es"], start_date, end_date))
+        self.assertEqual(
+            wiki_api.calls,
+            [
+                (date(2024, 2, 4), date(2024, 2, 6)),
+                (date(2024, 2, 7), date(2024, 2, 9)),
+                (date(2024, 2, 10), date(2024, 2, 10)),
+            ],
+        )
+        self.assertEqual(stats, {"days": 7, "failed_days": 1})
+        self.assertIn("7/7 days (100.0%)", reports[-1])
+
+        with self.app.app_context():
+            checkpoint = db.session.get(
+                BackfillCheckpoint, ("es", start_date, end_date)
+            )
+            self.assertEqual(checkpoint.next_date, date(2024, 2, 11))
+            self.assertEqual(checkpoint.failed_days, 1)
+
+        # Test a completed backfill has nothing pending, unless restarted.
+        stats = asyncio.run(backfill.run(["es"], start_date, end_date))
+        self.assertEqual(stats, {"days": 0, "failed_days": 0})
+        stats = asyncio.run(backfill.run(["es"], start_date, end_date, restart=True))
+        self.assertEqual(stats, {"days": 10, "failed_days": 1})
+
+    def test_backfill_writes_batch_per_transaction(self):
+        test_case = self
+
+        class TestWikiCache(WikiCache):
+            def __init__(self) -> None:
+                self.put_many_calls: list[list[str]] = []
+                # Checkpointed `next_date` when each batch is written.
+                self.checkpoint_dates: list[date] = []
+
+            def multi_get(self, urls: list[str]) -> dict[str, WikiAPIResponse]:
+                return {}
+
+            def put_many(self, wiki_resps: list[WikiAPIResponse]):
+                self.put_many_calls.append([wiki_resp.url for wiki_resp in wiki_resps])
+                with test_case.app.app_context():
+                    checkpoint = db.session.query(BackfillCheckpoint).first()
+                    self.checkpoint_dates.append(
+                        checkpoint.next_date if checkpoint else None
+                    )
+
+        class TestWikiAPI:
+            """Stand-in of WikiAPI putting each day in its caching layer as it's fetched."""
+
+            def __init__(self, cache: WikiCache) -> None:
+                self.cache = cache
+
+            async def fetch_featured_content_responses(
+                self, lang_code: str, start_date: datetime, end_date: datetime
+            ) -> list[WikiAPIResponse]:
+                wiki_resps = []
+                views_date = start_date
+                while views_date <= end_date:
+                    url = f"https://{lang_code}.wikipedia.org/{views_date:%Y/%m/%d}"
+                    text = json.dumps(
+                        {
+                            "mostread": {
+                                "date": f"{views_date:%Y-%m-%d}Z",
+                                "articles": [],
+                            }
+                        }
+                    )
+                    wiki_resp = WikiAPIResponse(url, True, text, None)
+                    await self.cache.aput(wiki_resp)
+                    # Test the held responses are readable until they're written.
+                    test_case.assertEqual(await self.cache.aget(url), wiki_resp)
+                    wiki_resps.append(wiki_resp)
+                    views_date += timedelta(days=1)
+                return wiki_resps
+
+        backing_cache = TestWikiCache()
+        batch_cache = BatchWriteWikiCache(backing_cache)
+        backfill = MostReadBackfill(
+            self.app,
+            TestWikiAPI(batch_cache),
+            batch_days=3,
+            batch_cache=batch_cache,
+            report=lambda _: None,
+        )
+        asyncio.run(backfill.run(["es"], date(2024, 2, 1), date(2024, 2, 4)))
+
+        # Test each batch of days is written with a single `put_many`.
+        self.assertEqual(
+            backing_cache.put_many_calls,
+            [
+                [
+                    "https://es.wikipedia.org/2024/02/01",
+                    "https://es.wikipedia.org/2024/02/02",
+                    "https://es.wikipedia.org/2024/02/03",
+                ],
+                ["https://es.wikipedia.org/2024/02/04"],
+            ],
+        )
+        # Test each batch is written before its checkpoint.
+        self.assertEqual(backing_cache.checkpoint_dates, [None, date(2024, 2, 4)])
+        self.assertEqual(
+            batch_cache.multi_get(["https://es.wikipedia.org/2024/02/01"]), {}
+        )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import os
+import sys
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from werkzeug.datastructures import Headers
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import ResponseCache
+from app.asgi import create_asgi_app
+from app.config import Config
+from app.extensions import db
+from shared.wiki_api import WikiAPIResponse
+from tests.shared.test_wiki_api import featured_content
+
+# Headers of the JSON contract, compared between the Flask app and the ASGI app.
+CONTRACT_HEADERS = [
+    "Content-Type",
+    "Content-Encoding",
+    "ETag",
+    "Cache-Control",
+    "Vary",
+    "Access-Control-Allow-Origin",
+]
+
+
+class TestASGIApp(TestCase):
+
+    def setUp(self):
+        self.temp_db_file = os.path.join(
+            TemporaryDirectory(delete=False).name, "app.db"
+        )
+
+        config = Config()
+        config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + self.temp_db_file
+        config.SQLALCHEMY_ECHO = False
+        print(f"==> setUp created temp_db_file={self.temp_db_file}")
+
+        self.asgi_app = create_asgi_app(config)
+        self.app = self.asgi_app.flask_app
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        # The Flask test client may have started the event loop thread.
+        self.app.extensions["event_loop_thread"].stop()
+        asyncio.run(self.asgi_app.shutdown())
+        os.remove(self.temp_db_file)
+        os.rmdir(os.path.dirname(self.temp_db_file))
+        print(f"==> tearDown removed temp_db_file={self.temp_db_file}")
+
+    def request(
+        self,
+        path: str,
+        query_string: bytes = b"",
+        headers: dict[str, str] = None,
+        method: str = "GET",
+    ) -> tuple[int, Headers, list[bytes]]:
+        """Sends a request to the ASGI app.
+
+        Returns:
+            Tuple (`status_code`, `headers`, `body_chunks`).
+        """
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": query_string,
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(self.asgi_app(scope, receive, send))
+        start_message, *body_messages = messages
+        self.assertEqual(start_message["type"], "http.response.start")
+        self.assertFalse(body_messages[-1].get("more_body", False))
+        response_headers = Headers(
+            [
+                (name.decode(), value.decode())
+                for name, value in start_message["headers"]
+            ]
+        )
+        body_chunks = [message["body"] for message in body_messages]
+        return (start_message["status"], response_headers, body_chunks)
+
+    def put_cached_response(self, articles: list[tuple[int, int]]):
+        ResponseCache(self.app).put(
+            WikiAPIResponse(
+                "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20",
+                True,
+                featured_content("2024-02-19", articles),
+                None,
+            )
+        )
+
+    # MARK: - Route Tests
+
+    def test_home(self):
+        status_code, headers, body_chunks = self.request("/")
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(headers["Content-Type"], "text/html; charset=utf-8")
+        self.assertEqual(b"".join(body_chunks), self.client.get("/").data)
+
+    def test_cache_stats(self):
+        status_code, _, body_chunks = self.request("/cache_stats")
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(
+            json.loads(b"".join(body_chunks)).keys(),
+            self.client.get("/cache_stats").json.keys(),
+        )
+
+    def test_most_read_articles_same_contract_as_flask(self):
+        self.put_cached_response([(pageid, 1000 - pageid) for pageid in range(50)])
+        params = "lang_code=es&start=2024-02-19&end=2024-02-19"
+        etag = self.client.get(f"/most_read_articles?{params}").get_etag()[0]
+        requests = [
+            (params, {}),
+            (f"{params}&limit=5&offset=10", {}),
+            (params, {"Accept-Encoding": "gzip"}),
+            (params, {"If-None-Match": f'"{etag}"'}),
+            (f"{params}&format=ndjson&limit=3", {}),
+            ("lang_code=es&start=2024-02-20&end=2024-02-19", {}),
+            (f"{params}&limit=ten", {}),
+            (f"{params}&format=xml", {}),
+        ]
+
+        for query_string, headers in requests:
+            # Responses of the Flask app are memoized, then served to the ASGI app.
+            flask_response = self.client.get(
+                f"/most_read_articles?{query_string}", headers=headers
+            )
+            status_code, asgi_headers, body_chunks = self.request(
+                "/most_read_articles", query_string.encode(), headers
+            )
+
+            self.assertEqual(status_code, flask_response.status_code)
+            self.assertEqual(b"".join(body_chunks), flask_response.data)
+            for name in CONTRACT_HEADERS:
+                if status_code == 304 and name == "Content-Type":
+                    continue
+                self.assertEqual(
+                    asgi_headers.get(name), flask_response.headers.get(name), name
+                )
+
+    def test_most_read_articles_ndjson_streamed(self):
+        self.put_cached_response([(1, 300), (2, 200), (3, 100)])
+
+        status_code, headers, body_chunks = self.request(
+            "/most_read_articles",
+            b"lang_code=es&start=2024-02-19&end=2024-02-19&format=ndjson",
+        )
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(headers["Content-Type"], "application/x-ndjson")
+        self.assertNotIn("Content-Length", headers)
+        # One message per record, then the end of the body.
+        records = [json.loads(chunk) for chunk in body_chunks[:-1]]
+        self.assertEqual([record["pageid"] for record in records[:-1]], [1, 2, 3])
+        self.assertEqual(records[-1], {"errors": []})
+        self.assertEqual(body_chunks[-1], b"")
+
+    def test_most_read_articles_serialized_off_event_loop(self):
+        self.put_cached_response([(pageid, 1000 - pageid) for pageid in range(50)])
+        dumps_bytes = self.app.json.dumps_bytes
+        # Structure: [whether an event loop runs on the serializing thread]
+        on_event_loop = []
+
+        def recorded_dumps_bytes(obj, **kwargs) -> bytes:
+            on_event_loop.append(asyncio._get_running_loop() is not None)
+            return dumps_bytes(obj, **kwargs)
+
+        self.app.json.dumps_bytes = recorded_dumps_bytes
+        params = b"lang_code=es&start=2024-02-19&end=2024-02-19"
+        for query_string in (params, params + b"&limit=5"):
+            status_code, _, _ = self.request(
+                "/most_read_articles", query_string, {"Accept-Encoding": "gzip"}
+            )
+            self.assertEqual(status_code, 200)
+
+        # Fetched, then memoized rankings
+        self.assertEqual(on_event_loop, [False, False])
+
+    def test_methods(self):
+        query_string = b"lang_code=es&start=2024-02-20&end=2024-02-19"
+        _, get_headers, _ = self.request("/most_read_articles", query_string)
+
+        # Test HEAD responses have the GET headers without a body
+        status_code, headers, body_chunks = self.request(
+            "/most_read_articles", query_string, method="HEAD"
+        )
+        self.assertEqual(status_code, 400)
+        self.assertEqual(headers.to_wsgi_list(), get_headers.to_wsgi_list())
+        self.assertEqual(b"".join(body_chunks), b"")
+
+        # Test CORS preflight
+        status_code, headers, _ = self.request(
+            "/most_read_articles",
+            headers={
+                "Origin": "http://localhost:5173",
+                "Access-Control-Request-Method": "GET",
+                "Access-Control-Request-Headers": "if-none-match",
+            },
+            method="OPTIONS",
+        )
+        self.assertEqual(status_code, 200)
+        self.assertEqual(headers["Access-Control-Allow-Origin"], "*")
+        self.assertEqual(headers["Access-Control-Allow-Headers"], "if-none-match")
+
+        status_code, headers, _ = self.request("/most_read_articles", method="POST")
+        self.assertEqual(status_code, 405)
+        self.assertIn("GET", headers["Allow"])
+
+        status_code, _, _ = self.request("/unknown")
+        self.assertEqual(status_code, 404)
+
+    # MARK: - Lifespan Tests
+
+    def test_lifespan_shutdown_flushes_write_behind_cache(self):
+        url = "https://es.wikipedia.org/api/rest_v1/feed/featured/2024/02/20"
+        self.app.extensions["write_behind_cache"].put(
+            WikiAPIResponse(url, True, featured_content("2024-02-19", [(1, 1)]), None)
+        )
+
+        async def run_lifespan() -> list[str]:
+            messages = asyncio.Queue()
+            for message_type in ("lifespan.startup", "lifespan.shutdown"):
+                messages.put_nowait({"type": message_type})
+            sent_types = []
+
+            async def send(message):
+                sent_types.append(message["type"])
+
+            await self.asgi_app({"type": "lifespan"}, messages.get, send)
+            return sent_types
+
+        self.assertEqual(
+            asyncio.run(run_lifespan()),
+            ["lifespan.startup.complete", "lifespan.shutdown.complete"],
+        )
+        self.assertIsNotNone(ResponseCache(self.app).get(url))
+
+
+if __name__ == "__main__":
+    main()